@@ -0,0 +1,96 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, Hashable, Optional, Protocol
+
+
+@dataclass
+class CacheStats:
+    """
+    Counters for a cache instance.
+
+    hits and misses are recorded by the cache's callers, which know whether a stored value
+    was usable; evictions and expirations are recorded by the backend itself.
+    """
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {**asdict(self), "hit_ratio": round(self.hit_ratio, 4)}
+
+
+class CacheBackend(Protocol):
+    """Key/value store used by caching repositories; implement it to plug in a shared cache."""
+
+    stats: CacheStats
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        ...
+
+    def set(self, key: Hashable, value: Any) -> None:
+        ...
+
+    def delete(self, key: Hashable) -> None:
+        ...
+
+    def clear(self) -> None:
+        ...
+
+
+class TTLLRUCache(CacheBackend):
+    """Bounded in-process cache, least recently used entries are evicted first."""
+
+    def __init__(
+        self,
+        max_size: int,
+        ttl_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.stats = CacheStats()
+        self._clock = clock
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        # sync repositories may share the cache across threadpool workers
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= self._clock():
+                del self._entries[key]
+                self.stats.expirations += 1
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (self._clock() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.stats.evictions += 1
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
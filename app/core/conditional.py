@@ -0,0 +1,37 @@
+from typing import Optional
+
+from fastapi import Response
+
+# Conditional GET (RFC 9110 section 13): a representation's ETag is derived from the
+# aggregate's identity and optimistic-lock version, so a client holding the current version
+# can be answered with a bodiless 304 after a version-only lookup.
+# Tags are weak: equal versions are semantically equivalent, but the bytes depend on the
+# configured JSON encoder.
+# "no-cache" lets clients store responses but makes them revalidate on every use.
+CACHE_CONTROL = "no-cache"
+
+
+def version_etag(kind: str, key: int, version: int) -> str:
+    return f'W/"{kind}-{key}-{version}"'
+
+
+def _opaque_tag(etag: str) -> str:
+    # If-None-Match uses the weak comparison: the W/ prefix is ignored on both sides
+    etag = etag.strip()
+    return etag[2:] if etag.startswith("W/") else etag
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header value matches etag."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    wanted = _opaque_tag(etag)
+    return any(_opaque_tag(candidate) == wanted for candidate in if_none_match.split(","))
+
+
+def not_modified(etag: str) -> Response:
+    return Response(
+        status_code=304, headers={"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    )
@@ -1,8 +1,8 @@
-from typing import Annotated, Generator, AsyncGenerator
+from typing import Annotated, Any, Dict, Generator, AsyncGenerator, Tuple
 
 from fastapi import Depends
 from loguru import logger
-from sqlalchemy.engine import Engine
+from sqlalchemy.engine import Connection, Engine
 from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
 from sqlmodel.ext.asyncio.session import AsyncSession
 from sqlalchemy.orm import sessionmaker
@@ -10,6 +10,13 @@ from sqlalchemy.pool import StaticPool
 from sqlmodel import Session, SQLModel, create_engine, MetaData
 from sqlalchemy import text, schema
 
+from app.core.metrics import install_query_metrics
+from app.core.query_log import install_query_logging
+from app.core.pool import (
+    InstrumentedAsyncAdaptedQueuePool,
+    InstrumentedQueuePool,
+    pool_status,
+)
 from config import Settings, get_settings
 
 _engine: Engine | None = None
@@ -57,6 +64,19 @@ def get_session(
 SessionDep = Annotated[Session, Depends(get_session)]
 
 
+def _pool_args(settings: Settings, poolclass: type) -> dict:
+    """Queue pool arguments for server databases; SQLite keeps its StaticPool."""
+    return {
+        "poolclass": poolclass,
+        "pool_size": settings.database_pool_size,
+        "max_overflow": settings.database_max_overflow,
+        "pool_timeout": settings.database_pool_timeout,
+        "pool_recycle": settings.database_pool_recycle,
+        "pool_pre_ping": settings.database_pool_pre_ping,
+        "pool_use_lifo": settings.database_pool_use_lifo,
+    }
+
+
 def get_engine(_settings: Settings | None = None) -> Engine:
     """Get or create SQLModel engine instance."""
     global _engine
@@ -78,44 +98,97 @@ def get_engine(_settings: Settings | None = None) -> Engine:
     except ImportError:
         logger.warning("Could not import sqlalchemy.engine.make_url")
 
-    engine_args: dict = {"echo": True}
+    engine_args: dict = {"echo": _settings.database_echo}
     if url.startswith("sqlite"):
         engine_args.update(
             {"connect_args": {"check_same_thread": False}, "poolclass": StaticPool}
         )
+    else:
+        engine_args.update(_pool_args(_settings, InstrumentedQueuePool))
 
     _engine = create_engine(url, **engine_args)
+    install_query_logging(_engine, _settings)
+    if _settings.metrics_enabled:
+        install_query_metrics(_engine, "sync")
 
     if _settings.sqlite_wal_mode and url.startswith("sqlite"):
         with _engine.connect() as conn:
             conn.execute(text("PRAGMA journal_mode=WAL"))
             logger.info("SQLite WAL mode enabled")
 
-    # Set schema for SQLModel metadata
-    SQLModel.metadata.schema = _settings.get_table_schema
-    with _engine.connect() as conn:
-        if not url.startswith("sqlite") and not conn.dialect.has_schema(
-            conn,
-            _settings.get_table_schema,  # type: ignore[arg-type]
-        ):
-            logger.warning(
-                f"Schema '{_settings.get_table_schema}' not found in database. Creating..."
-            )
-            conn.execute(schema.CreateSchema(_settings.get_table_schema))
-            conn.commit()
-
-        if _settings.create_tables:
-            SQLModel.metadata.create_all(conn)
-            conn.commit()
-            logger.info("Database tables created successfully")
-        else:
-            logger.info(
-                "Database tables already exist or migration is configured, skipping creation"
-            )
+    with _engine.begin() as conn:
+        _init_database(conn, _settings)
 
     return _engine
 
 
+def _init_database(conn: Connection, settings: Settings) -> None:
+    """Create the schema if it is missing and, with create_tables, every table."""
+    # Set schema for SQLModel metadata
+    SQLModel.metadata.schema = settings.get_table_schema
+    if conn.dialect.name != "sqlite" and not conn.dialect.has_schema(
+        conn,
+        settings.get_table_schema,  # type: ignore[arg-type]
+    ):
+        logger.warning(
+            f"Schema '{settings.get_table_schema}' not found in database. Creating..."
+        )
+        conn.execute(schema.CreateSchema(settings.get_table_schema))
+
+    if settings.create_tables:
+        SQLModel.metadata.create_all(conn)
+        logger.info("Database tables created successfully")
+    else:
+        logger.info(
+            "Database tables already exist or migration is configured, skipping creation"
+        )
+
+
+def async_database_url(url: str) -> Tuple[str, Dict[str, Any]]:
+    """The database URL with an async driver, and the connect_args that driver needs."""
+    # SQLite: use the aiosqlite driver for async support
+    if url.startswith("sqlite"):
+        if "+aiosqlite" not in url:
+            url = url.replace("sqlite://", "sqlite+aiosqlite://", 1)
+        return url, {"check_same_thread": False}
+
+    # PostgreSQL: ensure an asyncpg driver if scheme is postgres/postgresql without a +driver suffix
+    try:
+        scheme, rest = url.split("://", 1)
+    except ValueError:
+        scheme = url
+        rest = ""
+
+    # Handle SSL mode for asyncpg
+    connect_args: Dict[str, Any] = {}
+    if "?" in rest:
+        base_url, query_string = rest.split("?", 1)
+        params = {}
+        for param in query_string.split("&"):
+            if "=" in param:
+                key, value = param.split("=", 1)
+                params[key] = value
+
+        # Remove sslmode from URL and add as connect_args for asyncpg
+        if "sslmode" in params:
+            sslmode = params.pop("sslmode")
+            if sslmode == "disable":
+                connect_args["ssl"] = False
+            elif sslmode in ("require", "verify-ca", "verify-full"):
+                connect_args["ssl"] = True
+
+            # Rebuild the URL without sslmode
+            new_query = "&".join([f"{k}={v}" for k, v in params.items()])
+            if new_query:
+                rest = f"{base_url}?{new_query}"
+            else:
+                rest = base_url
+
+    if scheme in ("postgres", "postgresql") and "+" not in scheme:
+        url = f"postgresql+asyncpg://{rest}"
+    return url, connect_args
+
+
 def get_async_engine(_settings: Settings | None = None) -> AsyncEngine:
     """Get or create async SQLModel engine instance."""
     global _async_engine, _async_sessionmaker
@@ -126,75 +199,77 @@ def get_async_engine(_settings: Settings | None = None) -> AsyncEngine:
     if _settings is None:
         _settings = get_settings()
 
-    url = _settings.database_url
-    engine_args: dict = {"echo": True}
-    
-    # SQLite: use the aiosqlite driver for async support
-    if url.startswith("sqlite") and "+aiosqlite" not in url:
-        url = url.replace("sqlite://", "sqlite+aiosqlite://", 1)
-        engine_args.update(
-            {"connect_args": {"check_same_thread": False}, "poolclass": StaticPool}
-        )
-    else:
-        # PostgreSQL: ensure an asyncpg driver if scheme is postgres/postgresql without a +driver suffix
-        try:
-            scheme, rest = url.split("://", 1)
-        except ValueError:
-            scheme = url
-            rest = ""
-            
-        # Handle SSL mode for asyncpg
-        connect_args = {}
-        if "?" in rest:
-            base_url, query_string = rest.split("?", 1)
-            params = {}
-            for param in query_string.split("&"):
-                if "=" in param:
-                    key, value = param.split("=", 1)
-                    params[key] = value
-            
-            # Remove sslmode from URL and add as connect_args for asyncpg
-            if "sslmode" in params:
-                sslmode = params.pop("sslmode")
-                if sslmode == "disable":
-                    connect_args["ssl"] = False
-                elif sslmode in ("require", "verify-ca", "verify-full"):
-                    connect_args["ssl"] = True
-                
-                # Rebuild the URL without sslmode
-                new_query = "&".join([f"{k}={v}" for k, v in params.items()])
-                if new_query:
-                    rest = f"{base_url}?{new_query}"
-                else:
-                    rest = base_url
-        
-        if connect_args:
-            engine_args["connect_args"] = connect_args
-            
-        if scheme in ("postgres", "postgresql") and "+" not in scheme:
-            url = f"postgresql+asyncpg://{rest}"
-
-    engine_args: dict = {"echo": True}
+    url, connect_args = async_database_url(_settings.database_url)
+    engine_args: dict = {"echo": _settings.database_echo}
+    if connect_args:
+        engine_args["connect_args"] = connect_args
     if url.startswith("sqlite"):
-        engine_args.update(
-            {"connect_args": {"check_same_thread": False}, "poolclass": StaticPool}
-        )
+        engine_args["poolclass"] = StaticPool
+    else:
+        engine_args.update(_pool_args(_settings, InstrumentedAsyncAdaptedQueuePool))
 
     _async_engine = create_async_engine(url, **engine_args)
+    install_query_logging(_async_engine.sync_engine, _settings)
+    if _settings.metrics_enabled:
+        install_query_metrics(_async_engine.sync_engine, "async")
     _async_sessionmaker = sessionmaker(
         _async_engine, class_=AsyncSession, expire_on_commit=False
     )
     return _async_engine
 
 
-async def get_async_session(
-    settings: Annotated[Settings, Depends(get_settings)],
-) -> AsyncGenerator[AsyncSession, None]:
+async def init_async_database(settings: Settings | None = None) -> None:
+    """Create the schema and tables through the async engine, as get_engine does for sync URLs."""
+    if settings is None:
+        settings = get_settings()
+    async with get_async_engine(settings).begin() as conn:
+        await conn.run_sync(_init_database, settings)
+
+
+async def dispose_engines() -> None:
+    """
+    Close every pooled connection and forget the engines.
+
+    Commands that run their own event loop (asyncio.run) must await this before the loop
+    ends: aiosqlite connections left in the pool keep their worker threads, and with them
+    the process, alive.
+    """
+    global _engine, _async_engine, _async_sessionmaker
+
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine = None
+        _async_sessionmaker = None
+    if _engine is not None:
+        _engine.dispose()
+        _engine = None
+
+
+def get_async_sessionmaker(
+    settings: Settings | None = None,
+) -> sessionmaker[AsyncSession]:
+    """Session factory for work that outlives a request-scoped session, e.g. streaming."""
     # Initialize the async engine if it doesn't exist yet
     get_async_engine(settings)
     assert _async_sessionmaker is not None
-    async with _async_sessionmaker() as session:
+    return _async_sessionmaker
+
+
+async def get_async_session(
+    settings: Annotated[Settings, Depends(get_settings)],
+) -> AsyncGenerator[AsyncSession, None]:
+    async with get_async_sessionmaker(settings)() as session:
         yield session
 
 
 AsyncSessionDep = Annotated[AsyncSession, Depends(get_async_session)]
+
+
+def get_pool_status() -> Dict[str, Any]:
+    """Pool usage and checkout latency for every engine created so far."""
+    status: Dict[str, Any] = {}
+    if _engine is not None:
+        status["sync"] = pool_status(_engine)
+    if _async_engine is not None:
+        status["async"] = pool_status(_async_engine.sync_engine)
+    return status
@@ -54,3 +54,45 @@ class NotFoundException(AppException):
             status_code=404,
             detail=detail
         )
+
+
+class BadRequestException(AppException):
+    """Exception raised when a request is malformed or carries invalid input"""
+    def __init__(
+        self,
+        message: str = "Bad request",
+        detail: Optional[str] = None
+    ) -> None:
+        super().__init__(
+            message=message,
+            status_code=400,
+            detail=detail
+        )
+
+
+class UnauthorizedException(AppException):
+    """Exception raised when a request cannot be authenticated"""
+    def __init__(
+        self,
+        message: str = "Unauthorized",
+        detail: Optional[str] = None
+    ) -> None:
+        super().__init__(
+            message=message,
+            status_code=401,
+            detail=detail
+        )
+
+
+class ConflictException(AppException):
+    """Exception raised when a write conflicts with the current state of a resource"""
+    def __init__(
+        self,
+        message: str = "Resource conflict",
+        detail: Optional[str] = None
+    ) -> None:
+        super().__init__(
+            message=message,
+            status_code=409,
+            detail=detail
+        )
@@ -3,15 +3,21 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI, APIRouter
 from fastapi.middleware.cors import CORSMiddleware
 
-from app.features.issues import router as issues_router
+from app.features.issues import router as issues_router, webhooks_router
+from app.features.issues.metrics_projection import get_issue_metrics_runner
+from app.features.issues.webhooks import get_issue_inbox
 from app.core.exceptions import AppException
 from app.core.middleware import app_exception_handler
 from config import Settings
 from app.core.database import get_async_engine, get_engine
+from app.core.loop_monitor import get_loop_monitor
+from app.core.resource_adapters.outbox import get_outbox_relay
+from app.core.responses import get_response_class
 
 # Create API router and include feature routers
 api_router = APIRouter()
 api_router.include_router(issues_router, tags=["issues"])
+api_router.include_router(webhooks_router, tags=["webhooks"])
 
 
 def create_app(settings: Settings, lifespan_handler=None) -> FastAPI:
@@ -31,18 +37,44 @@ def create_app(settings: Settings, lifespan_handler=None) -> FastAPI:
                 loop = asyncio.get_event_loop()
                 await loop.run_in_executor(None, lambda: get_engine(settings))
                 
+            loop_monitor = get_loop_monitor(settings)
+            if loop_monitor is not None:
+                loop_monitor.start()
+
+            outbox_relay = get_outbox_relay(settings)
+            if outbox_relay is not None:
+                outbox_relay.start()
+
+            inbox = get_issue_inbox(settings)
+            if inbox is not None:
+                inbox.start()
+
+            metrics_projection = get_issue_metrics_runner(settings)
+            if metrics_projection is not None:
+                metrics_projection.start()
+
             app.state.running = True
 
             yield
 
             app.state.running = False
 
+            if metrics_projection is not None:
+                await metrics_projection.stop()
+            if inbox is not None:
+                await inbox.stop()
+            if outbox_relay is not None:
+                await outbox_relay.stop()
+            if loop_monitor is not None:
+                await loop_monitor.stop()
+
         lifespan_handler = default_lifespan
 
     app = FastAPI(
         lifespan=lifespan_handler,
         title=settings.project_name,
         openapi_url="/v1/openapi.json",
+        default_response_class=get_response_class(settings),
     )
 
     # Register global exception handler
@@ -0,0 +1,184 @@
+import asyncio
+import datetime
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import text
+
+from app.core.database import get_async_engine, get_pool_status
+from config import Settings
+
+# https://inadarei.github.io/rfc-healthcheck/
+PASS = "pass"
+WARN = "warn"
+FAIL = "fail"
+
+_SEVERITY = {PASS: 0, WARN: 1, FAIL: 2}
+
+# a check returns its status and, optionally, the value it observed
+ProbeCheck = Callable[[], Awaitable[Tuple[str, Optional[float]]]]
+
+
+@dataclass
+class ProbeResult:
+    status: str
+    response_time_seconds: float
+    time: datetime.datetime
+    observed_value: Optional[float] = None
+    observed_unit: Optional[str] = None
+    output: Optional[str] = None
+
+    def as_dict(self, cached: bool) -> Dict[str, Any]:
+        result: Dict[str, Any] = {
+            "status": self.status,
+            "responseTime": f"{self.response_time_seconds * 1000:.2f}ms",
+            "time": self.time.isoformat(),
+            "cached": cached,
+        }
+        if self.observed_value is not None:
+            result["observedValue"] = self.observed_value
+            result["observedUnit"] = self.observed_unit
+        if self.output:
+            result["output"] = self.output
+        return result
+
+
+class CachedProbe:
+    """
+    Runs a check with a timeout and reuses its result for ttl_seconds.
+
+    Concurrent callers share one in-flight run, so a burst of probes costs a single check
+    (and at most one pooled connection for database checks).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        check: ProbeCheck,
+        timeout_seconds: float,
+        ttl_seconds: float,
+        observed_unit: Optional[str] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.name = name
+        self.check = check
+        self.timeout_seconds = timeout_seconds
+        self.ttl_seconds = ttl_seconds
+        self.observed_unit = observed_unit
+        self._clock = clock
+        self._result: Optional[ProbeResult] = None
+        self._checked_at = 0.0
+        self._inflight: Optional[asyncio.Future[ProbeResult]] = None
+
+    async def run(self) -> Tuple[ProbeResult, bool]:
+        """Return the probe result and whether it came from the cache."""
+        if self._result is not None and self._clock() - self._checked_at < self.ttl_seconds:
+            return self._result, True
+        if self._inflight is None or self._inflight.done():
+            self._inflight = asyncio.ensure_future(self._run_check())
+        return await asyncio.shield(self._inflight), False
+
+    async def _run_check(self) -> ProbeResult:
+        observed: Optional[float] = None
+        output: Optional[str] = None
+        start = time.perf_counter()
+        try:
+            status, observed = await asyncio.wait_for(self.check(), self.timeout_seconds)
+        except asyncio.TimeoutError:
+            status, output = FAIL, f"timed out after {self.timeout_seconds}s"
+        except Exception as exc:
+            status, output = FAIL, f"{type(exc).__name__}: {exc}"
+        result = ProbeResult(
+            status=status,
+            response_time_seconds=time.perf_counter() - start,
+            time=datetime.datetime.now(datetime.timezone.utc),
+            observed_value=observed,
+            observed_unit=self.observed_unit if observed is not None else None,
+            output=output,
+        )
+        self._result = result
+        self._checked_at = self._clock()
+        return result
+
+
+def database_check(settings: Settings) -> ProbeCheck:
+    """SELECT 1 on the async engine, which serves every request whatever the URL's driver."""
+
+    async def check() -> Tuple[str, Optional[float]]:
+        async with get_async_engine(settings).connect() as conn:
+            await conn.execute(text("SELECT 1"))
+        return PASS, None
+
+    return check
+
+
+def pool_saturation_check(settings: Settings) -> ProbeCheck:
+    """Warn when the busiest pool has most of its connections checked out."""
+
+    async def check() -> Tuple[str, Optional[float]]:
+        saturations = [
+            status["saturation"]
+            for status in get_pool_status().values()
+            if status.get("saturation") is not None
+        ]
+        if not saturations:
+            return PASS, None
+        saturation = max(saturations)
+        return (WARN if saturation >= settings.readiness_pool_saturation_warn else PASS), saturation
+
+    return check
+
+
+def event_loop_lag_check(settings: Settings) -> ProbeCheck:
+    """Time a callback waits in the ready queue; blocking work on the loop delays it."""
+
+    async def check() -> Tuple[str, Optional[float]]:
+        loop = asyncio.get_running_loop()
+        ran: asyncio.Future[float] = loop.create_future()
+        start = time.perf_counter()
+        loop.call_soon(lambda: ran.set_result(time.perf_counter()))
+        lag_ms = round((await ran - start) * 1000, 3)
+        if lag_ms >= settings.readiness_loop_lag_fail_ms:
+            return FAIL, lag_ms
+        if lag_ms >= settings.readiness_loop_lag_warn_ms:
+            return WARN, lag_ms
+        return PASS, lag_ms
+
+    return check
+
+
+class ReadinessProbes:
+    """The readiness checks, each cached and bounded by the configured timeout."""
+
+    def __init__(self, settings: Settings) -> None:
+        timeout = settings.readiness_probe_timeout_seconds
+        ttl = settings.readiness_cache_ttl_seconds
+        self.probes: List[CachedProbe] = [
+            CachedProbe("database", database_check(settings), timeout, ttl),
+            CachedProbe("pool:saturation", pool_saturation_check(settings), timeout, ttl, "ratio"),
+            CachedProbe("eventLoop:lag", event_loop_lag_check(settings), timeout, ttl, "ms"),
+        ]
+
+    async def run(self) -> Tuple[str, Dict[str, Dict[str, Any]]]:
+        """Run all probes concurrently; the overall status is the worst probe status."""
+        outcomes = await asyncio.gather(*(probe.run() for probe in self.probes))
+        checks = {
+            probe.name: result.as_dict(cached)
+            for probe, (result, cached) in zip(self.probes, outcomes, strict=True)
+        }
+        status = max(
+            (result.status for result, _ in outcomes), key=_SEVERITY.__getitem__, default=PASS
+        )
+        return status, checks
+
+
+_readiness_probes: Optional[ReadinessProbes] = None
+
+
+def get_readiness_probes(settings: Settings) -> ReadinessProbes:
+    global _readiness_probes
+
+    if _readiness_probes is None:
+        _readiness_probes = ReadinessProbes(settings)
+    return _readiness_probes
@@ -1 +1,7 @@
 # Inbox interface adapters initialization
+from app.core.interface_adapters.inbox.inbox import Inbox
+from app.core.interface_adapters.inbox.models import InboxEvent
+from app.core.interface_adapters.inbox.processor import InboxHandler, InboxProcessor
+from app.core.interface_adapters.inbox.writer import InboxWriter
+
+__all__ = ["Inbox", "InboxEvent", "InboxHandler", "InboxProcessor", "InboxWriter"]
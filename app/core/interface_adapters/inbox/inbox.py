@@ -0,0 +1,56 @@
+from typing import Any, Callable, Dict, Optional, Sequence
+
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.interface_adapters.inbox.models import InboxEvent
+from app.core.interface_adapters.inbox.processor import InboxHandler, InboxProcessor
+from app.core.interface_adapters.inbox.writer import InboxWriter
+
+
+class Inbox:
+    """
+    Idempotent receiver for externally delivered events: endpoints hand events to write(),
+    which returns once they are stored, and the processor applies them in the background.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession],
+        handler: InboxHandler,
+        workers: int = 8,
+        max_batch: int = 500,
+        max_delay_seconds: float = 0.005,
+        process_batch_size: int = 100,
+        sweep_interval_seconds: float = 5.0,
+        max_attempts: int = 5,
+        on_applied: Optional[Callable[[str, Sequence[InboxEvent]], None]] = None,
+    ) -> None:
+        self.processor = InboxProcessor(
+            session_factory,
+            handler,
+            workers=workers,
+            batch_size=process_batch_size,
+            sweep_interval_seconds=sweep_interval_seconds,
+            max_attempts=max_attempts,
+            on_applied=on_applied,
+        )
+        self.writer = InboxWriter(
+            session_factory,
+            self.processor.notify,
+            max_batch=max_batch,
+            max_delay_seconds=max_delay_seconds,
+        )
+
+    async def write(self, event: Dict[str, Any]) -> None:
+        await self.writer.write(event)
+
+    def start(self) -> None:
+        self.processor.start()
+
+    async def stop(self) -> None:
+        # requests still waiting on a batch get their answer before the workers go
+        await self.writer.drain()
+        await self.processor.stop()
+
+    def as_dict(self) -> Dict[str, Any]:
+        return self.processor.as_dict()
@@ -0,0 +1,52 @@
+import datetime
+from typing import Optional
+
+from sqlalchemy import Column, DateTime, Index, Text, text
+from sqlmodel import Field, SQLModel
+
+from config import get_settings
+
+
+def utcnow() -> datetime.datetime:
+    return datetime.datetime.now(datetime.timezone.utc)
+
+
+class InboxEvent(SQLModel, table=True):
+    """
+    A received event, stored raw before it is applied.
+
+    event_id is the sender's id for the event and the deduplication key: redelivered
+    events hit the unique constraint and are dropped by the insert. processed_at is set
+    in the same transaction that applies the event to its aggregate, so each event takes
+    effect exactly once however often it is delivered.
+    """
+
+    __tablename__ = "inbox"
+    __table_args__ = (
+        Index(
+            "ix_inbox_pending",
+            "aggregate_id",
+            "occurred_at",
+            "id",
+            postgresql_where=text("processed_at IS NULL"),
+            sqlite_where=text("processed_at IS NULL"),
+        ),
+        {"schema": get_settings().get_table_schema},
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    event_id: str = Field(unique=True)
+    event_type: str
+    aggregate_id: str
+    payload: str = Field(sa_column=Column(Text, nullable=False))
+    occurred_at: datetime.datetime = Field(
+        sa_column=Column(DateTime(timezone=True), nullable=False)
+    )
+    received_at: datetime.datetime = Field(
+        default_factory=utcnow, sa_column=Column(DateTime(timezone=True), nullable=False)
+    )
+    processed_at: Optional[datetime.datetime] = Field(
+        default=None, sa_column=Column(DateTime(timezone=True), nullable=True)
+    )
+    attempts: int = 0
+    last_error: Optional[str] = None
@@ -0,0 +1,235 @@
+import asyncio
+from typing import Any, Callable, Dict, Iterable, List, Optional, Protocol, Sequence, Set
+
+from loguru import logger
+from sqlalchemy.orm.exc import StaleDataError
+from sqlmodel import col, select, update
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlmodel.sql.expression import SelectOfScalar
+
+from app.core.exceptions import ConflictException
+from app.core.unit_of_work import retry_on_conflict
+from app.core.interface_adapters.inbox.models import InboxEvent, utcnow
+from app.core.metrics import REGISTRY
+
+INBOX_PROCESSED = REGISTRY.counter(
+    "inbox_events_processed_total", "Inbox events applied to their aggregate."
+)
+INBOX_FAILED = REGISTRY.counter(
+    "inbox_processing_failures_total", "Inbox event batches whose handler failed."
+)
+# failed events keep at most this much of the error for inspection
+MAX_ERROR_LENGTH = 500
+
+
+class InboxHandler(Protocol):
+    """
+    Applies one aggregate's pending events, oldest first.
+
+    handle runs inside the processor's transaction and must not commit: the events are
+    marked processed in that same transaction.
+    """
+
+    async def handle(
+        self, session: AsyncSession, aggregate_id: str, events: Sequence[InboxEvent]
+    ) -> None:
+        ...
+
+
+class InboxProcessor:
+    """
+    A fixed pool of asyncio workers applying inbox events.
+
+    Aggregate ids are partitioned over the workers by hash, so one aggregate's events are
+    only ever handled by one worker, serially and in (occurred_at, id) order, while
+    different aggregates proceed in parallel. notify() queues an aggregate once however
+    many of its events arrive before a worker gets to it. A periodic sweep picks up
+    events left pending by a crash or another process.
+
+    A batch that conflicts with a concurrent writer of its aggregate is retried at once
+    (retry_on_conflict, see the optimistic_lock_* settings). Any other failing batch, or
+    one that still conflicts, is rolled back and applied again one event at a time: the
+    events before the failing one are applied, and only the failing event has its attempts
+    counted and is retried on the next sweep. An event that reaches max_attempts is
+    skipped, unblocking the events after it.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession],
+        handler: InboxHandler,
+        workers: int = 8,
+        batch_size: int = 100,
+        sweep_interval_seconds: float = 5.0,
+        max_attempts: int = 5,
+        on_applied: Optional[Callable[[str, Sequence[InboxEvent]], None]] = None,
+    ) -> None:
+        self.session_factory = session_factory
+        self.handler = handler
+        # called with each batch once it is committed, e.g. to invalidate caches
+        self.on_applied = on_applied
+        self.batch_size = batch_size
+        self.sweep_interval_seconds = sweep_interval_seconds
+        self.max_attempts = max_attempts
+        self.processed_count = 0
+        self.failed_count = 0
+        self._queues: List[asyncio.Queue[str]] = [asyncio.Queue() for _ in range(workers)]
+        self._queued: Set[str] = set()
+        self._tasks: List[asyncio.Task[None]] = []
+
+    @property
+    def running(self) -> bool:
+        return any(not task.done() for task in self._tasks)
+
+    def start(self) -> None:
+        if self.running:
+            return
+        loop = asyncio.get_running_loop()
+        self._tasks = [
+            loop.create_task(self._work(queue), name=f"inbox-worker-{index}")
+            for index, queue in enumerate(self._queues)
+        ]
+        self._tasks.append(loop.create_task(self._sweep(), name="inbox-sweep"))
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def notify(self, aggregate_ids: Iterable[str]) -> None:
+        for aggregate_id in aggregate_ids:
+            if aggregate_id in self._queued:
+                continue
+            self._queued.add(aggregate_id)
+            self._queues[hash(aggregate_id) % len(self._queues)].put_nowait(aggregate_id)
+
+    async def _work(self, queue: "asyncio.Queue[str]") -> None:
+        while True:
+            aggregate_id = await queue.get()
+            # cleared before processing, so events arriving meanwhile queue it again
+            self._queued.discard(aggregate_id)
+            try:
+                if await self.process(aggregate_id) >= self.batch_size:
+                    self.notify([aggregate_id])
+            except Exception:
+                logger.exception("inbox processing failed for {}", aggregate_id)
+
+    async def _sweep(self) -> None:
+        while True:
+            try:
+                self.notify(await self.pending_aggregates())
+            except Exception:
+                logger.exception("inbox sweep failed")
+            await asyncio.sleep(self.sweep_interval_seconds)
+
+    def _pending(self) -> tuple:
+        return (
+            col(InboxEvent.processed_at).is_(None),
+            col(InboxEvent.attempts) < self.max_attempts,
+        )
+
+    async def pending_aggregates(self) -> List[str]:
+        async with self.session_factory() as session:
+            statement = select(InboxEvent.aggregate_id).where(*self._pending()).distinct()
+            return list((await session.exec(statement)).all())
+
+    async def process(self, aggregate_id: str) -> int:
+        """Apply one batch of an aggregate's pending events; returns how many were applied."""
+        try:
+            # a conflicting writer is retried at once, each attempt reloading the aggregate
+            events = await retry_on_conflict(
+                lambda: self._apply_batch(aggregate_id, self.batch_size)
+            )
+        except Exception as err:
+            self._record_failure(aggregate_id, err)
+            events = await self._apply_one_by_one(aggregate_id)
+        if not events:
+            return 0
+        if self.on_applied is not None:
+            self.on_applied(aggregate_id, events)
+
+        self.processed_count += len(events)
+        INBOX_PROCESSED.inc(amount=len(events))
+        return len(events)
+
+    def _batch(
+        self, statement: SelectOfScalar[Any], aggregate_id: str, limit: int
+    ) -> SelectOfScalar[Any]:
+        # the oldest pending events first, the same order for applying and for failing them
+        return (
+            statement.where(col(InboxEvent.aggregate_id) == aggregate_id, *self._pending())
+            .order_by(col(InboxEvent.occurred_at), col(InboxEvent.id))
+            .limit(limit)
+        )
+
+    async def _apply_one_by_one(self, aggregate_id: str) -> List[InboxEvent]:
+        """Apply a failed batch event by event, counting an attempt on the one that fails."""
+        applied: List[InboxEvent] = []
+        while len(applied) < self.batch_size:
+            try:
+                events = await retry_on_conflict(lambda: self._apply_batch(aggregate_id, 1))
+            except Exception as err:
+                await self._count_failed_attempt(aggregate_id, err)
+                break
+            if not events:
+                break
+            applied.extend(events)
+        return applied
+
+    async def _apply_batch(self, aggregate_id: str, limit: int) -> List[InboxEvent]:
+        async with self.session_factory() as session:
+            statement = self._batch(select(InboxEvent), aggregate_id, limit)
+            events = list((await session.exec(statement)).all())
+            if not events:
+                return events
+            try:
+                await self.handler.handle(session, aggregate_id, events)
+                await session.exec(
+                    update(InboxEvent)
+                    .where(col(InboxEvent.id).in_([event.id for event in events]))
+                    .values(processed_at=utcnow(), attempts=InboxEvent.attempts + 1)
+                )
+                await session.commit()
+            except StaleDataError as err:
+                await session.rollback()
+                raise ConflictException(
+                    message="Aggregate was modified concurrently", detail=str(err)
+                ) from err
+            except Exception:
+                await session.rollback()
+                raise
+        return events
+
+    async def _count_failed_attempt(self, aggregate_id: str, err: Exception) -> None:
+        # the events before it were just applied, so the oldest pending event is the one
+        async with self.session_factory() as session:
+            ids = (await session.exec(self._batch(select(InboxEvent.id), aggregate_id, 1))).all()
+            await session.exec(
+                update(InboxEvent)
+                .where(col(InboxEvent.id).in_(ids))
+                .values(
+                    attempts=InboxEvent.attempts + 1,
+                    last_error=repr(err)[:MAX_ERROR_LENGTH],
+                )
+            )
+            await session.commit()
+
+    def _record_failure(self, aggregate_id: str, err: Exception) -> None:
+        self.failed_count += 1
+        INBOX_FAILED.inc()
+        if isinstance(err, (ConflictException, StaleDataError)):
+            # another writer changed the aggregate, the retry reloads it
+            logger.info("inbox events for {} conflicted, will retry", aggregate_id)
+        else:
+            logger.warning("inbox events for {} failed: {!r}", aggregate_id, err)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "running": self.running,
+            "workers": len(self._queues),
+            "queued_aggregates": len(self._queued),
+            "processed_count": self.processed_count,
+            "failed_count": self.failed_count,
+        }
+
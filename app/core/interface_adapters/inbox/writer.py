@@ -0,0 +1,107 @@
+import asyncio
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from loguru import logger
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.interface_adapters.inbox.models import InboxEvent, utcnow
+from app.core.metrics import REGISTRY
+from app.core.resource_adapters.persistence.sqlmodel.bulk import insert_ignore_statement
+
+INBOX_RECEIVED = REGISTRY.counter("inbox_events_received_total", "Events written to the inbox.")
+INBOX_FLUSH_DURATION = REGISTRY.histogram(
+    "inbox_flush_seconds",
+    "Time to insert and commit one batch of inbox events.",
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+)
+INBOX_FLUSH_SIZE = REGISTRY.histogram(
+    "inbox_flush_events",
+    "Events per inbox insert batch.",
+    buckets=(1, 2, 5, 10, 25, 50, 100, 250, 500, 1000),
+)
+_EVENT_ID = ["event_id"]
+
+Pending = Tuple[Dict[str, Any], "asyncio.Future[None]"]
+
+
+class InboxWriter:
+    """
+    Group commit for inbox events.
+
+    write() adds the event to the current batch and returns once the batch is committed,
+    so a sender is only acknowledged for events that are durable. A batch is flushed when
+    it reaches max_batch events or max_delay_seconds after its first event, whichever is
+    first; under load one INSERT ... ON CONFLICT DO NOTHING and one commit serve hundreds
+    of requests, and the added latency is bounded by max_delay_seconds when idle.
+    on_flushed receives the aggregate ids of each committed batch.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession],
+        on_flushed: Callable[[Iterable[str]], None],
+        max_batch: int = 500,
+        max_delay_seconds: float = 0.005,
+    ) -> None:
+        self.session_factory = session_factory
+        self.on_flushed = on_flushed
+        self.max_batch = max_batch
+        self.max_delay_seconds = max_delay_seconds
+        self._pending: List[Pending] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._flushes: Set[asyncio.Task[None]] = set()
+
+    async def write(self, event: Dict[str, Any]) -> None:
+        """Persist one event given as an InboxEvent row; duplicates are accepted and dropped."""
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[None] = loop.create_future()
+        self._pending.append((event, future))
+        if len(self._pending) >= self.max_batch:
+            self._start_flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_delay_seconds, self._start_flush)
+        await future
+
+    def _start_flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        task = asyncio.get_running_loop().create_task(self._flush(batch))
+        self._flushes.add(task)
+        task.add_done_callback(self._flushes.discard)
+
+    async def _flush(self, batch: List[Pending]) -> None:
+        start = time.perf_counter()
+        received_at = utcnow()
+        rows = [{"received_at": received_at, **event} for event, _ in batch]
+        try:
+            async with self.session_factory() as session:
+                connection = await session.connection()
+                table = InboxEvent.__table__
+                statement = insert_ignore_statement(table, connection.dialect.name, _EVENT_ID)
+                await connection.execute(statement, rows)
+                await session.commit()
+        except Exception as err:
+            logger.warning("inbox batch of {} events failed: {!r}", len(batch), err)
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(err)
+            return
+
+        INBOX_RECEIVED.inc(amount=len(batch))
+        INBOX_FLUSH_SIZE.observe(len(batch))
+        INBOX_FLUSH_DURATION.observe(time.perf_counter() - start)
+        for _, future in batch:
+            if not future.done():
+                future.set_result(None)
+        self.on_flushed({row["aggregate_id"] for row in rows})
+
+    async def drain(self) -> None:
+        """Flush what is buffered and wait for flushes in progress."""
+        self._start_flush()
+        if self._flushes:
+            await asyncio.gather(*self._flushes, return_exceptions=True)
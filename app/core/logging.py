@@ -0,0 +1,81 @@
+import json
+import sys
+from typing import Any, Dict
+
+from loguru import logger
+
+from config import Settings
+
+# https://brandur.org/logfmt
+# https://loguru.readthedocs.io/en/stable/api/logger.html#loguru._logger.Logger.add
+#
+# Log calls should pass values as arguments rather than pre-formatting them:
+#     logger.info("analyzing issue: {}", issue_number)
+# loguru returns before formatting when no sink accepts the level, so disabled messages
+# cost almost nothing; use logger.opt(lazy=True) for arguments that are costly to build.
+
+_TEXT_FORMAT = (
+    "<green>{time:YYYY-MM-DD HH:mm:ss.SSS}</green> | <level>{level: <8}</level> | "
+    "{extra[request_id]} | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - "
+    "<level>{message}</level>"
+)
+
+
+def _logfmt_value(value: Any) -> str:
+    text = value if isinstance(value, str) else json.dumps(value, default=str)
+    if text and not any(c in text for c in ' ="\\\n'):
+        return text
+    escaped = text.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    return f'"{escaped}"'
+
+
+def _logfmt_format(record: Dict[str, Any]) -> str:
+    fields: Dict[str, Any] = {
+        "time": record["time"].isoformat(),
+        "level": record["level"].name.lower(),
+        "logger": record["name"],
+        "msg": record["message"],
+    }
+    fields.update(
+        (key, value)
+        for key, value in record["extra"].items()
+        if value is not None and not key.startswith("_")
+    )
+    record["extra"]["_logfmt"] = " ".join(
+        f"{key}={_logfmt_value(value)}" for key, value in fields.items()
+    )
+    # the line is built here, loguru only substitutes it (and any traceback)
+    return "{extra[_logfmt]}\n{exception}"
+
+
+def configure_logging(settings: Settings) -> None:
+    """
+    Replace loguru's default sink with the configured one.
+
+    The sink is enqueued: records are handed to a background thread that formats and
+    writes them, so request handlers never block on stderr. log_module_levels maps module
+    prefixes to their own minimum level, e.g. {"app.features.issues": "WARNING"}.
+    """
+    levels = {"": settings.log_level.upper()}
+    levels.update(
+        {module: level.upper() for module, level in settings.log_module_levels.items()}
+    )
+    # the sink level must admit the most verbose module, the filter then applies per module
+    sink_level = min(levels.values(), key=lambda name: logger.level(name).no)
+
+    logger.remove()
+    logger.configure(extra={"request_id": None})
+
+    options: Dict[str, Any] = {
+        "level": sink_level,
+        "filter": levels,
+        "enqueue": settings.log_enqueue,
+        "backtrace": False,
+        "diagnose": False,
+    }
+    if settings.log_format == "json":
+        logger.add(sys.stderr, serialize=True, **options)
+    elif settings.log_format == "logfmt":
+        logger.add(sys.stderr, format=_logfmt_format, colorize=False, **options)
+    else:
+        logger.add(sys.stderr, format=_TEXT_FORMAT, **options)
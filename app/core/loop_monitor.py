@@ -0,0 +1,200 @@
+import asyncio
+import datetime
+import time
+from collections import deque
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Deque, Dict, Optional
+
+from loguru import logger
+
+from app.core.metrics import REGISTRY
+from app.core.request_context import request_id_ctx, request_scope_ctx
+from config import Settings
+
+EVENT_LOOP_LAG = REGISTRY.histogram(
+    "event_loop_lag_seconds",
+    "How late the loop monitor's periodic sleep woke up.",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+EVENT_LOOP_SLOW_CALLBACKS = REGISTRY.counter(
+    "event_loop_slow_callbacks_total",
+    "Event loop callbacks that ran longer than the slow callback threshold.",
+    ("route",),
+)
+
+
+@dataclass
+class SlowCallback:
+    duration_ms: float
+    callback: str
+    request_id: Optional[str]
+    route: Optional[str]
+    time: str
+
+
+def _describe_callback(callback: Callable[..., Any]) -> str:
+    # task steps are the common case, name them by the coroutine they drive
+    owner = getattr(callback, "__self__", None)
+    if isinstance(owner, asyncio.Task):
+        coro = owner.get_coro()
+        return f"{owner.get_name()} {getattr(coro, '__qualname__', repr(coro))}"
+    return getattr(callback, "__qualname__", None) or repr(callback)[:200]
+
+
+class LoopMonitor:
+    """
+    Samples event loop lag and records callbacks that block the loop for too long.
+
+    Lag is how late a periodic asyncio.sleep wakes up. Slow callbacks are found by timing
+    asyncio.Handle._run, which every callback and task step goes through; the request id
+    and route come from the handle's own context, so blocking code is attributed to the
+    request that ran it. The patch is only applied while the monitor is running, so a
+    disabled monitor costs nothing.
+
+    Only loops built on asyncio.BaseEventLoop run callbacks through Handle._run. uvloop,
+    uvicorn's default loop whenever it is installed (as with uvicorn[standard]), runs them
+    in C: there start() logs a warning and only samples lag, and as_dict reports
+    slow_callback_tracking as false. Run uvicorn with --loop asyncio to record slow
+    callbacks.
+    """
+
+    def __init__(
+        self,
+        slow_callback_ms: float,
+        sample_interval_seconds: float,
+        max_records: int = 100,
+    ) -> None:
+        self.slow_callback_seconds = slow_callback_ms / 1000
+        self.sample_interval_seconds = sample_interval_seconds
+        self.slow_callbacks: Deque[SlowCallback] = deque(maxlen=max_records)
+        self.slow_callback_count = 0
+        self.last_lag_seconds: Optional[float] = None
+        self.max_lag_seconds = 0.0
+        self._sampler: Optional[asyncio.Task[None]] = None
+        self._original_run: Optional[Callable[[asyncio.Handle], None]] = None
+        self.slow_callback_tracking = False
+
+    @property
+    def running(self) -> bool:
+        return self._sampler is not None and not self._sampler.done()
+
+    def start(self) -> None:
+        """Patch Handle._run and start the lag sampler on the running loop."""
+        if self.running:
+            return
+        loop = asyncio.get_running_loop()
+        self.slow_callback_tracking = isinstance(loop, asyncio.BaseEventLoop)
+        if self.slow_callback_tracking:
+            self._patch()
+        else:
+            logger.warning(
+                "{}.{} does not run callbacks through asyncio.Handle, slow callbacks are "
+                "not recorded; start uvicorn with --loop asyncio to record them",
+                type(loop).__module__,
+                type(loop).__qualname__,
+            )
+        self._sampler = loop.create_task(self._sample(), name="loop-monitor")
+
+    async def stop(self) -> None:
+        self._unpatch()
+        if self._sampler is not None:
+            self._sampler.cancel()
+            try:
+                await self._sampler
+            except asyncio.CancelledError:
+                pass
+            self._sampler = None
+
+    def _patch(self) -> None:
+        if self._original_run is not None:
+            return
+        original_run = asyncio.Handle._run
+        threshold = self.slow_callback_seconds
+        record = self._record_slow_callback
+
+        def _timed_run(handle: asyncio.Handle) -> None:
+            start = time.perf_counter()
+            original_run(handle)
+            elapsed = time.perf_counter() - start
+            if elapsed >= threshold:
+                record(handle, elapsed)
+
+        self._original_run = original_run
+        asyncio.Handle._run = _timed_run  # type: ignore[method-assign]
+
+    def _unpatch(self) -> None:
+        if self._original_run is not None:
+            asyncio.Handle._run = self._original_run  # type: ignore[method-assign]
+            self._original_run = None
+
+    def _record_slow_callback(self, handle: asyncio.Handle, elapsed: float) -> None:
+        context = handle._context  # type: ignore[attr-defined]
+        scope = context.get(request_scope_ctx)
+        # request_id_ctx is reset when the request ends, which may be within this very step
+        request_id = scope.get("state", {}).get("request_id") if scope else None
+        # the metric is labelled by route template only, raw paths would be unbounded
+        template = getattr(scope.get("route"), "path", None) if scope else None
+        slow = SlowCallback(
+            duration_ms=round(elapsed * 1000, 3),
+            callback=_describe_callback(handle._callback),  # type: ignore[attr-defined]
+            request_id=request_id or context.get(request_id_ctx),
+            route=template or (scope.get("path") if scope else None),
+            time=datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        )
+        self.slow_callbacks.append(slow)
+        self.slow_callback_count += 1
+        EVENT_LOOP_SLOW_CALLBACKS.inc((template or "none",))
+        logger.warning(
+            "slow callback {:.1f}ms request_id={} route={}: {}",
+            slow.duration_ms,
+            slow.request_id,
+            slow.route,
+            slow.callback,
+        )
+
+    def record_lag(self, lag_seconds: float) -> None:
+        self.last_lag_seconds = lag_seconds
+        if lag_seconds > self.max_lag_seconds:
+            self.max_lag_seconds = lag_seconds
+        EVENT_LOOP_LAG.observe(lag_seconds)
+
+    async def _sample(self) -> None:
+        loop = asyncio.get_running_loop()
+        interval = self.sample_interval_seconds
+        while True:
+            start = loop.time()
+            await asyncio.sleep(interval)
+            self.record_lag(max(0.0, loop.time() - start - interval))
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "running": self.running,
+            "last_lag_ms": (
+                round(self.last_lag_seconds * 1000, 3)
+                if self.last_lag_seconds is not None
+                else None
+            ),
+            "max_lag_ms": round(self.max_lag_seconds * 1000, 3),
+            "slow_callback_tracking": self.slow_callback_tracking,
+            "slow_callback_threshold_ms": self.slow_callback_seconds * 1000,
+            "slow_callback_count": self.slow_callback_count,
+            "slow_callbacks": [asdict(slow) for slow in self.slow_callbacks],
+        }
+
+
+_loop_monitor: Optional[LoopMonitor] = None
+
+
+def get_loop_monitor(settings: Settings) -> Optional[LoopMonitor]:
+    """The process wide loop monitor, or None when it is disabled."""
+    global _loop_monitor
+
+    if not settings.loop_monitor_enabled:
+        return None
+    if _loop_monitor is None:
+        _loop_monitor = LoopMonitor(
+            slow_callback_ms=settings.loop_monitor_slow_callback_ms,
+            sample_interval_seconds=settings.loop_monitor_sample_interval_seconds,
+            max_records=settings.loop_monitor_max_records,
+        )
+    return _loop_monitor
@@ -0,0 +1,309 @@
+import threading
+from bisect import bisect_left
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.query_log import install_query_timer, query_elapsed_seconds
+
+# https://prometheus.io/docs/instrumenting/exposition_formats/#text-based-format
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 10.0)
+DB_LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 25, 50, 100)
+
+Labels = Tuple[str, ...]
+# sample name, label pairs, value
+Sample = Tuple[str, Sequence[Tuple[str, str]], float]
+
+
+@dataclass
+class MetricFamily:
+    """One metric with all of its samples, as rendered on /metrics."""
+
+    name: str
+    type: str
+    documentation: str
+    samples: List[Sample] = field(default_factory=list)
+
+
+class _Metric:
+    """
+    Base for metrics recorded from request handlers.
+
+    Every thread writes to its own shard, so recording is a thread-local lookup and a dict
+    update without a lock; the shards are only merged when the registry is collected.
+    Shards outlive their threads, so totals stay cumulative.
+    """
+
+    type = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._local = threading.local()
+        self._shards: List[Dict[Labels, Any]] = []
+        self._shards_lock = threading.Lock()
+
+    def _shard(self) -> Dict[Labels, Any]:
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard: Dict[Labels, Any] = {}
+            with self._shards_lock:
+                self._shards.append(shard)
+            self._local.shard = shard
+            return shard
+
+    def _merged(self) -> Dict[Labels, Any]:
+        raise NotImplementedError
+
+    def collect(self) -> MetricFamily:
+        raise NotImplementedError
+
+
+class _Sum(_Metric):
+    def inc(self, labels: Labels = (), amount: float = 1.0) -> None:
+        shard = self._shard()
+        shard[labels] = shard.get(labels, 0.0) + amount
+
+    def _merged(self) -> Dict[Labels, float]:
+        merged: Dict[Labels, float] = {}
+        with self._shards_lock:
+            shards = list(self._shards)
+        for shard in shards:
+            for labels, value in shard.copy().items():
+                merged[labels] = merged.get(labels, 0.0) + value
+        return merged
+
+    def value(self, labels: Labels = ()) -> float:
+        return self._merged().get(labels, 0.0)
+
+    def collect(self) -> MetricFamily:
+        return MetricFamily(
+            self.name,
+            self.type,
+            self.documentation,
+            [
+                (self.name, tuple(zip(self.labelnames, labels, strict=True)), value)
+                for labels, value in sorted(self._merged().items())
+            ],
+        )
+
+
+class Counter(_Sum):
+    type = "counter"
+
+
+class Gauge(_Sum):
+    """A gauge that moves up and down; a thread may dec what another thread inc'd."""
+
+    type = "gauge"
+
+    def dec(self, labels: Labels = (), amount: float = 1.0) -> None:
+        self.inc(labels, -amount)
+
+
+class Histogram(_Metric):
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, labels: Labels = ()) -> None:
+        shard = self._shard()
+        # one count per bucket plus +Inf, then the running sum
+        state = shard.get(labels)
+        if state is None:
+            state = shard[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        state[bisect_left(self.buckets, value)] += 1
+        state[-1] += value
+
+    def _merged(self) -> Dict[Labels, List[float]]:
+        merged: Dict[Labels, List[float]] = {}
+        with self._shards_lock:
+            shards = list(self._shards)
+        for shard in shards:
+            for labels, state in shard.copy().items():
+                total = merged.setdefault(labels, [0] * len(state))
+                for index, value in enumerate(list(state)):
+                    total[index] += value
+        return merged
+
+    def count(self, labels: Labels = ()) -> int:
+        state = self._merged().get(labels)
+        return int(sum(state[:-1])) if state else 0
+
+    def collect(self) -> MetricFamily:
+        family = MetricFamily(self.name, self.type, self.documentation)
+        bounds = [_format_value(bound) for bound in self.buckets] + ["+Inf"]
+        for labels, state in sorted(self._merged().items()):
+            pairs = tuple(zip(self.labelnames, labels, strict=True))
+            cumulative = 0
+            for bound, count in zip(bounds, state[:-1], strict=True):
+                cumulative += count
+                family.samples.append((f"{self.name}_bucket", pairs + (("le", bound),), cumulative))
+            family.samples.append((f"{self.name}_sum", pairs, state[-1]))
+            family.samples.append((f"{self.name}_count", pairs, cumulative))
+        return family
+
+
+class MetricsRegistry:
+    """Metrics recorded in-process plus collectors that read current state on scrape."""
+
+    def __init__(self) -> None:
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Callable[[], Iterable[MetricFamily]]] = []
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, metric: _Metric) -> Any:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is None:
+                self._metrics[metric.name] = existing = metric
+            elif type(existing) is not type(metric):
+                raise ValueError(f"metric {metric.name} already registered as {existing.type}")
+            return existing
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._get_or_create(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._get_or_create(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> Histogram:
+        return self._get_or_create(Histogram(name, documentation, labelnames, buckets))
+
+    def register_collector(self, collector: Callable[[], Iterable[MetricFamily]]) -> None:
+        with self._lock:
+            self._collectors.append(collector)
+
+    def collect(self) -> List[MetricFamily]:
+        with self._lock:
+            metrics = list(self._metrics.values())
+            collectors = list(self._collectors)
+        families = [metric.collect() for metric in metrics]
+        for collector in collectors:
+            families.extend(collector())
+        return families
+
+    def render(self) -> str:
+        return render_text(self.collect())
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if value == float("-inf"):
+        return "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+def render_text(families: Iterable[MetricFamily]) -> str:
+    """Render metric families in the Prometheus text exposition format."""
+    lines: List[str] = []
+    for family in families:
+        documentation = family.documentation.replace("\\", "\\\\").replace("\n", "\\n")
+        lines.append(f"# HELP {family.name} {documentation}")
+        lines.append(f"# TYPE {family.name} {family.type}")
+        for name, labels, value in family.samples:
+            if labels:
+                rendered = ",".join(f'{key}="{_escape_label(str(val))}"' for key, val in labels)
+                lines.append(f"{name}{{{rendered}}} {_format_value(value)}")
+            else:
+                lines.append(f"{name} {_format_value(value)}")
+    return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+HTTP_REQUESTS = REGISTRY.counter(
+    "http_requests_total", "HTTP requests handled.", ("method", "route", "status")
+)
+HTTP_REQUEST_DURATION = REGISTRY.histogram(
+    "http_request_duration_seconds",
+    "Time from receiving a request to sending the last body chunk.",
+    ("method", "route"),
+)
+HTTP_REQUESTS_IN_PROGRESS = REGISTRY.gauge(
+    "http_requests_in_progress", "HTTP requests currently being handled.", ("method",)
+)
+HTTP_REQUEST_DB_QUERIES = REGISTRY.histogram(
+    "http_request_db_queries",
+    "Database statements executed per HTTP request.",
+    ("method", "route"),
+    QUERY_COUNT_BUCKETS,
+)
+HTTP_REQUEST_DB_DURATION = REGISTRY.histogram(
+    "http_request_db_duration_seconds",
+    "Time spent executing database statements per HTTP request.",
+    ("method", "route"),
+)
+DB_QUERIES = REGISTRY.counter("db_queries_total", "Database statements executed.", ("engine",))
+DB_QUERY_DURATION = REGISTRY.histogram(
+    "db_query_duration_seconds",
+    "Database statement execution time.",
+    ("engine",),
+    DB_LATENCY_BUCKETS,
+)
+
+
+class RequestDbStats:
+    """Statements run on behalf of the current request, filled in by the engine events."""
+
+    __slots__ = ("queries", "seconds")
+
+    def __init__(self) -> None:
+        self.queries = 0
+        self.seconds = 0.0
+
+
+# set by the metrics middleware; threadpool workers and async greenlets share the object
+request_db_stats_ctx: ContextVar[Optional[RequestDbStats]] = ContextVar(
+    "request_db_stats", default=None
+)
+
+
+def install_query_metrics(engine: Engine, engine_label: str) -> None:
+    """
+    Count and time every statement on an engine, globally and for the current request.
+
+    For async engines pass engine.sync_engine. Shares the statement timer with the query
+    log, see app/core/query_log.py.
+    """
+    install_query_timer(engine)
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(
+        conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool
+    ) -> None:
+        elapsed = query_elapsed_seconds(context)
+        labels = (engine_label,)
+        DB_QUERIES.inc(labels)
+        DB_QUERY_DURATION.observe(elapsed, labels)
+        stats = request_db_stats_ctx.get()
+        if stats is not None:
+            stats.queries += 1
+            stats.seconds += elapsed
@@ -1,15 +1,43 @@
+import asyncio
+import datetime
+import hmac
+import os
+import random
+import re
+import time
+import uuid
+
 from fastapi import Request
 from fastapi.responses import JSONResponse
 from loguru import logger
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from app.core.exceptions import AppException
+from app.core.metrics import (
+    HTTP_REQUEST_DB_DURATION,
+    HTTP_REQUEST_DB_QUERIES,
+    HTTP_REQUEST_DURATION,
+    HTTP_REQUESTS,
+    HTTP_REQUESTS_IN_PROGRESS,
+    RequestDbStats,
+    request_db_stats_ctx,
+)
+from app.core.profiling import CProfileProfiler, RequestProfiler, SamplingProfiler
+from app.core.request_context import request_id_ctx, request_scope_ctx
+from config import Settings
+
+# incoming ids are echoed into headers and logs, so only accept short, plain tokens
+_VALID_REQUEST_ID = re.compile(r"^[A-Za-z0-9._:-]{1,128}$")
+# the example secret once shipped in .env.example, never accepted as a real one
+PLACEHOLDER_PROFILING_SECRET = "change-me"
 
 
 def app_exception_handler(request: Request, exc: Exception) -> JSONResponse:
     if isinstance(exc, AppException):
-        logger.error(f"Request to {request.url} failed: {exc.message}")
+        logger.error("Request to {} failed: {}", request.url, exc.message)
         if exc.detail:
-            logger.error(f"Detail: {exc.detail}")
+            logger.error("Detail: {}", exc.detail)
         return JSONResponse(
             status_code=exc.status_code,
             content={
@@ -20,7 +48,7 @@ def app_exception_handler(request: Request, exc: Exception) -> JSONResponse:
         )
     else:
         # Handle other exceptions
-        logger.error(f"Request to {request.url} failed: {str(exc)}")
+        logger.error("Request to {} failed: {}", request.url, exc)
         return JSONResponse(
             status_code=500,
             content={
@@ -29,3 +57,215 @@ def app_exception_handler(request: Request, exc: Exception) -> JSONResponse:
                 "path": str(request.url),
             },
         )
+
+
+class RequestContextMiddleware:
+    """
+    Pure ASGI middleware for request ids and timing.
+
+    Reuses a well-formed incoming X-Request-ID or generates one, publishes it through
+    request_id_ctx and request.state, and adds X-Request-ID and X-Process-Time (time to
+    the response headers) to the response. Unlike BaseHTTPMiddleware it does not run the
+    app in a separate task or re-wrap the response stream, so streaming responses pass
+    straight through; the log line records the full duration including the body.
+    """
+
+    def __init__(self, app: ASGIApp, header_name: str = "X-Request-ID") -> None:
+        self.app = app
+        self.header_name = header_name
+        self._header_key = header_name.lower().encode("latin-1")
+
+    def _incoming_request_id(self, scope: Scope) -> str | None:
+        for key, value in scope["headers"]:
+            if key == self._header_key:
+                request_id = value.decode("latin-1")
+                return request_id if _VALID_REQUEST_ID.match(request_id) else None
+        return None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.perf_counter()
+        request_id = self._incoming_request_id(scope) or str(uuid.uuid4())
+        scope.setdefault("state", {})["request_id"] = request_id
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers[self.header_name] = request_id
+                headers["X-Process-Time"] = str(time.perf_counter() - start_time)
+            await send(message)
+
+        token = request_id_ctx.set(request_id)
+        # deliberately not reset: servers run each request in its own task, and the loop
+        # monitor reads it from the task's context after a step that may end the request
+        request_scope_ctx.set(scope)
+        try:
+            # binds request_id to every record logged while handling this request
+            with logger.contextualize(request_id=request_id):
+                try:
+                    await self.app(scope, receive, send_with_headers)
+                finally:
+                    logger.info(
+                        "Request to {} took {:.4f} seconds",
+                        scope["path"],
+                        time.perf_counter() - start_time,
+                    )
+        finally:
+            request_id_ctx.reset(token)
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware recording request counts, latency and database usage per route.
+
+    Routes are labelled by their path template (e.g. /v1/issues/{issue_number}), never by
+    the raw path, so label cardinality stays bounded; unmatched paths share one label.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.perf_counter()
+        method = scope["method"]
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        db_stats = RequestDbStats()
+        token = request_db_stats_ctx.set(db_stats)
+        HTTP_REQUESTS_IN_PROGRESS.inc((method,))
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            HTTP_REQUESTS_IN_PROGRESS.dec((method,))
+            request_db_stats_ctx.reset(token)
+            route = scope.get("route")
+            labels = (method, getattr(route, "path", None) or "unmatched")
+            HTTP_REQUESTS.inc(labels + (str(status_code),))
+            HTTP_REQUEST_DURATION.observe(time.perf_counter() - start_time, labels)
+            HTTP_REQUEST_DB_QUERIES.observe(db_stats.queries, labels)
+            HTTP_REQUEST_DB_DURATION.observe(db_stats.seconds, labels)
+
+
+class ProfilingMiddleware:
+    """
+    Pure ASGI middleware profiling selected requests.
+
+    A request is profiled when it carries the profiling header with the configured secret,
+    or when it falls into profiling_sample_rate. The profile is written to
+    profiling_output_dir; header-triggered requests may send X-Profile-Output: response
+    to get the profile back instead of the endpoint's response, whose status is then
+    reported in X-Profiled-Status. One request is profiled at a time, others pass
+    straight through, as does every request that isn't selected.
+
+    Profiles expose the code and data paths of the app, so without a profiling_secret,
+    or with the placeholder one, the middleware disables itself and passes everything
+    through.
+    """
+
+    def __init__(self, app: ASGIApp, settings: Settings) -> None:
+        self.app = app
+        self.settings = settings
+        secret = settings.profiling_secret
+        self.enabled = bool(secret) and secret != PLACEHOLDER_PROFILING_SECRET
+        if not self.enabled:
+            logger.warning("profiling disabled: set APP_PROFILING_SECRET to a non-default value")
+        self._secret = secret.encode("latin-1") if self.enabled else None
+        self._header_key = settings.profiling_header.lower().encode("latin-1")
+        self._active = False
+
+    def _header(self, scope: Scope, key: bytes) -> bytes | None:
+        for name, value in scope["headers"]:
+            if name == key:
+                return value
+        return None
+
+    def _triggered_by_header(self, scope: Scope) -> bool:
+        value = self._header(scope, self._header_key)
+        return value is not None and hmac.compare_digest(value, self._secret)
+
+    def _new_profiler(self) -> RequestProfiler:
+        if self.settings.profiling_mode == "cprofile":
+            return CProfileProfiler()
+        return SamplingProfiler(self.settings.profiling_interval_ms / 1000)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or self._active or not self.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        by_header = self._triggered_by_header(scope)
+        sample_rate = self.settings.profiling_sample_rate
+        if not by_header and not (sample_rate > 0 and random.random() < sample_rate):
+            await self.app(scope, receive, send)
+            return
+
+        to_response = by_header and self._header(scope, b"x-profile-output") == b"response"
+        profiler = self._new_profiler()
+        try:
+            profiler.start()
+        except ValueError as exc:
+            logger.warning("profiling skipped: {}", exc)
+            await self.app(scope, receive, send)
+            return
+
+        self._active = True
+        status_code = 500
+
+        async def send_or_hold(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            if not to_response:
+                await send(message)
+
+        try:
+            await self.app(scope, receive, send_or_hold)
+        finally:
+            profiler.stop()
+            self._active = False
+
+        if to_response:
+            body = profiler.render().encode("utf-8")
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": 200,
+                    "headers": [
+                        (b"content-type", b"text/plain; charset=utf-8"),
+                        (b"content-length", str(len(body)).encode("latin-1")),
+                        (b"x-profiled-status", str(status_code).encode("latin-1")),
+                    ],
+                }
+            )
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        loop = asyncio.get_running_loop()
+        path = await loop.run_in_executor(None, self._write, profiler, scope)
+        logger.info("profile of {} written to {}", scope["path"], path)
+
+    def _write(self, profiler: RequestProfiler, scope: Scope) -> str:
+        directory = self.settings.profiling_output_dir
+        os.makedirs(directory, exist_ok=True)
+        timestamp = datetime.datetime.now(datetime.timezone.utc).strftime("%Y%m%dT%H%M%S%f")
+        request_id = scope.get("state", {}).get("request_id") or uuid.uuid4().hex
+        path = os.path.join(directory, f"{timestamp}-{request_id}.{profiler.suffix}")
+        if isinstance(profiler, CProfileProfiler):
+            profiler.dump(path)
+        else:
+            with open(path, "w", encoding="utf-8") as file:
+                file.write(profiler.render())
+        return path
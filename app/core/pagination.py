@@ -0,0 +1,27 @@
+import base64
+import binascii
+import json
+
+from app.core.exceptions import BadRequestException
+
+# Cursors are opaque to clients: a url-safe base64 JSON document holding the last key
+# of the previous page. Keyset pagination keeps every page an index range scan, where
+# OFFSET would re-read and discard all preceding rows.
+
+
+def encode_cursor(after: int) -> str:
+    payload = json.dumps({"after": after}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> int:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        after = json.loads(base64.urlsafe_b64decode(padded))["after"]
+        if not isinstance(after, int):
+            raise TypeError("cursor key must be an integer")
+        return after
+    except (binascii.Error, ValueError, KeyError, TypeError) as err:
+        raise BadRequestException(
+            message="Invalid cursor", detail=f"Cursor {cursor!r} is not valid"
+        ) from err
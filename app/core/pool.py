@@ -0,0 +1,93 @@
+import time
+from dataclasses import dataclass
+from typing import Any, Dict
+
+from sqlalchemy import exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, PoolProxiedConnection, QueuePool
+
+
+@dataclass
+class PoolCheckoutStats:
+    """Running totals for connection checkouts from a single pool."""
+
+    checkouts: int = 0
+    timeouts: int = 0
+    total_wait_seconds: float = 0.0
+    max_wait_seconds: float = 0.0
+
+    def record(self, wait_seconds: float) -> None:
+        self.checkouts += 1
+        self.total_wait_seconds += wait_seconds
+        if wait_seconds > self.max_wait_seconds:
+            self.max_wait_seconds = wait_seconds
+
+    @property
+    def avg_wait_seconds(self) -> float:
+        return self.total_wait_seconds / self.checkouts if self.checkouts else 0.0
+
+
+class _InstrumentedPoolMixin:
+    """Times every checkout, including waits on a saturated pool and overflow connects."""
+
+    stats: PoolCheckoutStats
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.stats = PoolCheckoutStats()
+
+    def connect(self) -> PoolProxiedConnection:
+        start = time.perf_counter()
+        try:
+            connection = super().connect()  # type: ignore[misc]
+        except exc.TimeoutError:
+            self.stats.timeouts += 1
+            raise
+        self.stats.record(time.perf_counter() - start)
+        return connection
+
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncAdaptedQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def pool_status(engine: Engine) -> Dict[str, Any]:
+    """
+    Report pool size, usage and checkout latency for an engine.
+
+    Saturation is the share of the maximum connection count (pool_size + max_overflow)
+    currently checked out; it is only meaningful for queue pools.
+    """
+    pool = engine.pool
+    status: Dict[str, Any] = {"pool_class": type(pool).__name__}
+    if not isinstance(pool, QueuePool):
+        return status
+
+    checked_out = pool.checkedout()
+    max_overflow = pool._max_overflow
+    capacity = pool.size() + max_overflow if max_overflow > -1 else None
+    status.update(
+        {
+            "size": pool.size(),
+            "checked_in": pool.checkedin(),
+            "checked_out": checked_out,
+            "overflow": pool.overflow(),
+            "saturation": round(checked_out / capacity, 4) if capacity else None,
+        }
+    )
+
+    stats = getattr(pool, "stats", None)
+    if isinstance(stats, PoolCheckoutStats):
+        status.update(
+            {
+                "checkouts": stats.checkouts,
+                "checkout_timeouts": stats.timeouts,
+                "checkout_wait_avg_ms": round(stats.avg_wait_seconds * 1000, 3),
+                "checkout_wait_max_ms": round(stats.max_wait_seconds * 1000, 3),
+            }
+        )
+    return status
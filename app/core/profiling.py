@@ -0,0 +1,111 @@
+import cProfile
+import io
+import pstats
+import sys
+import threading
+from collections import Counter
+from types import FrameType
+from typing import Dict, Optional, Protocol
+
+
+class RequestProfiler(Protocol):
+    """Profiles one request; start and stop are called on the event loop thread."""
+
+    suffix: str
+
+    def start(self) -> None:
+        ...
+
+    def stop(self) -> None:
+        ...
+
+    def render(self) -> str:
+        ...
+
+
+def _frame_label(frame: FrameType) -> str:
+    return f"{frame.f_globals.get('__name__', '?')}:{frame.f_code.co_qualname}"
+
+
+class SamplingProfiler(RequestProfiler):
+    """
+    Statistical profiler: a background thread samples every thread's stack at a fixed
+    interval and counts identical stacks.
+
+    render() returns collapsed stacks (root first, frames separated by ';', then the
+    sample count) as consumed by flamegraph.pl and speedscope. Everything running in the
+    process while the request is profiled is sampled, including other requests
+    interleaved on the event loop; each stack is prefixed with its thread name.
+    """
+
+    suffix = "collapsed"
+
+    def __init__(self, interval_seconds: float = 0.001) -> None:
+        self.interval_seconds = interval_seconds
+        self.samples: Counter[str] = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval_seconds):
+            names: Dict[int, str] = {
+                thread.ident: thread.name
+                for thread in threading.enumerate()
+                if thread.ident is not None
+            }
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = []
+                current: Optional[FrameType] = frame
+                while current is not None:
+                    stack.append(_frame_label(current))
+                    current = current.f_back
+                stack.append(names.get(thread_id, str(thread_id)))
+                self.samples[";".join(reversed(stack))] += 1
+
+    def render(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.samples.most_common())
+
+
+class CProfileProfiler(RequestProfiler):
+    """
+    Deterministic profiler for the event loop thread only.
+
+    Sync endpoints run in threadpool workers and are not captured; use the sampling
+    profiler for those. render() returns pstats output sorted by cumulative time, and
+    dump() writes the binary stats that snakeviz or pstats can load.
+    """
+
+    suffix = "prof"
+
+    def __init__(self, limit: int = 50) -> None:
+        self.limit = limit
+        self.profile = cProfile.Profile()
+
+    def start(self) -> None:
+        # raises ValueError if another profiler is already active on this thread
+        self.profile.enable()
+
+    def stop(self) -> None:
+        self.profile.disable()
+
+    def render(self) -> str:
+        stream = io.StringIO()
+        pstats.Stats(self.profile, stream=stream).sort_stats("cumulative").print_stats(
+            self.limit
+        )
+        return stream.getvalue()
+
+    def dump(self, path: str) -> None:
+        self.profile.dump_stats(path)
@@ -0,0 +1,65 @@
+"""
+Slow and sampled statement logging.
+
+Records carry the statement and its duration; the request id is not part of the message
+but the record's request_id extra field, contextualized by the request id middleware.
+Arguments are passed to loguru unformatted, which only saves work while the level is
+below every sink's minimum: a per-module level from log_module_levels (see
+app/core/logging.py) is a sink filter, applied after the record and its message are built.
+
+Statements are timed once per engine by install_query_timer, whose start time on the
+execution context both this log and the query metrics (app/core/metrics.py) read.
+"""
+
+import random
+import time
+from typing import Any
+
+from loguru import logger
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from config import Settings
+
+
+def _record_start(
+    conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool
+) -> None:
+    context.query_started_at = time.perf_counter()
+
+
+def install_query_timer(engine: Engine) -> None:
+    """Record when each statement starts on its execution context, once per engine."""
+    if not event.contains(engine, "before_cursor_execute", _record_start):
+        event.listen(engine, "before_cursor_execute", _record_start)
+
+
+def query_elapsed_seconds(context: Any) -> float:
+    """Time since the statement of context started, from an after_cursor_execute listener."""
+    return time.perf_counter() - context.query_started_at
+
+
+def install_query_logging(engine: Engine, settings: Settings) -> None:
+    """
+    Log slow and sampled statements through cursor execute events instead of echo.
+
+    A statement is logged when it runs for at least database_slow_query_ms, or when it
+    falls into the database_query_sample_rate share of all statements. Parameters are
+    never logged. For async engines pass engine.sync_engine.
+    """
+    threshold_ms = settings.database_slow_query_ms
+    sample_rate = settings.database_query_sample_rate
+    if threshold_ms is None and sample_rate <= 0:
+        return
+
+    install_query_timer(engine)
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(
+        conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool
+    ) -> None:
+        elapsed_ms = query_elapsed_seconds(context) * 1000
+        if threshold_ms is not None and elapsed_ms >= threshold_ms:
+            logger.warning("slow query {:.2f}ms: {}", elapsed_ms, statement)
+        elif sample_rate > 0 and random.random() < sample_rate:
+            logger.info("sampled query {:.2f}ms: {}", elapsed_ms, statement)
@@ -0,0 +1,12 @@
+from contextvars import ContextVar
+from typing import Any, Dict, Optional
+
+# set per request by the request id middleware, readable from anywhere on the request's task
+request_id_ctx: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+# the request's ASGI scope; the router adds the matched route to it once routing is done
+request_scope_ctx: ContextVar[Optional[Dict[str, Any]]] = ContextVar("request_scope", default=None)
+
+
+def get_request_id() -> Optional[str]:
+    return request_id_ctx.get()
@@ -1 +1,20 @@
 # Outbox resource adapters initialization
+from app.core.resource_adapters.outbox.models import OutboxMessage, outbox_message
+from app.core.resource_adapters.outbox.relay import OutboxRelay, get_outbox_relay
+from app.core.resource_adapters.outbox.sinks import (
+    InMemorySink,
+    LoggingSink,
+    OutboxSink,
+    WebhookSink,
+)
+
+__all__ = [
+    "InMemorySink",
+    "LoggingSink",
+    "OutboxMessage",
+    "OutboxRelay",
+    "OutboxSink",
+    "WebhookSink",
+    "get_outbox_relay",
+    "outbox_message",
+]
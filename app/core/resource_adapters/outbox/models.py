@@ -0,0 +1,94 @@
+import dataclasses
+import datetime
+import uuid
+from typing import Any, Dict, Optional
+
+from pydantic import BaseModel
+from pydantic_core import to_jsonable_python
+from sqlalchemy import JSON, Column, DateTime, Index, text
+from sqlmodel import Field, SQLModel
+
+from config import get_settings
+
+
+def utcnow() -> datetime.datetime:
+    return datetime.datetime.now(datetime.timezone.utc)
+
+
+def as_utc(moment: datetime.datetime) -> datetime.datetime:
+    # SQLite hands back naive datetimes for timezone aware columns
+    return moment if moment.tzinfo else moment.replace(tzinfo=datetime.timezone.utc)
+
+
+class OutboxMessage(SQLModel, table=True):
+    """
+    A domain event waiting to be published, written in the same transaction as the
+    aggregate change that raised it.
+
+    published_at stays NULL until the relay has handed the message to its sink; the
+    partial index keeps the relay's claim query on the pending rows only. claimed_until
+    is the lease of the relay publishing the message, NULL when none holds it. event_id is
+    the consumer's deduplication key: delivery is at least once.
+    """
+
+    __tablename__ = "outbox"
+    __table_args__ = (
+        Index(
+            "ix_outbox_pending",
+            "id",
+            postgresql_where=text("published_at IS NULL"),
+            sqlite_where=text("published_at IS NULL"),
+        ),
+        {"schema": get_settings().get_table_schema},
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    event_id: str = Field(unique=True)
+    event_type: str
+    aggregate_type: str
+    aggregate_id: str
+    payload: Dict[str, Any] = Field(sa_column=Column(JSON, nullable=False))
+    created_at: datetime.datetime = Field(
+        default_factory=utcnow, sa_column=Column(DateTime(timezone=True), nullable=False)
+    )
+    published_at: Optional[datetime.datetime] = Field(
+        default=None, sa_column=Column(DateTime(timezone=True), nullable=True)
+    )
+    claimed_until: Optional[datetime.datetime] = Field(
+        default=None, sa_column=Column(DateTime(timezone=True), nullable=True)
+    )
+    attempts: int = 0
+    last_error: Optional[str] = None
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "event_id": self.event_id,
+            "event_type": self.event_type,
+            "aggregate_type": self.aggregate_type,
+            "aggregate_id": self.aggregate_id,
+            "payload": self.payload,
+            "created_at": as_utc(self.created_at).isoformat(),
+        }
+
+
+def _event_payload(event: Any) -> Dict[str, Any]:
+    if hasattr(event, "to_dict"):
+        # events that define their own serialized form, e.g. IssueEvent
+        return event.to_dict()
+    if isinstance(event, BaseModel):
+        return event.model_dump(mode="json")
+    if dataclasses.is_dataclass(event):
+        return to_jsonable_python(event)
+    # plain event classes such as IssueEvent keep their fields as instance attributes
+    return to_jsonable_python(vars(event))
+
+
+def outbox_message(event: Any, aggregate_type: str, aggregate_id: Any) -> OutboxMessage:
+    return OutboxMessage(
+        event_id=str(getattr(event, "event_id", None) or uuid.uuid4()),
+        event_type=type(event).__name__,
+        aggregate_type=aggregate_type,
+        aggregate_id=str(aggregate_id),
+        payload=_event_payload(event),
+    )
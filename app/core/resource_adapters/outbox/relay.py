@@ -0,0 +1,233 @@
+import asyncio
+import datetime
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from loguru import logger
+from sqlmodel import col, or_, select, update
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlmodel.sql.expression import SelectOfScalar
+
+from app.core.database import get_async_sessionmaker
+from app.core.exceptions import ConfigurationException
+from app.core.metrics import REGISTRY
+from app.core.resource_adapters.outbox.models import OutboxMessage, as_utc, utcnow
+from app.core.resource_adapters.outbox.sinks import LoggingSink, OutboxSink, WebhookSink
+from config import Settings
+
+OUTBOX_PUBLISHED = REGISTRY.counter(
+    "outbox_messages_published_total", "Outbox messages handed to the sink."
+)
+OUTBOX_FAILED = REGISTRY.counter(
+    "outbox_publish_failures_total", "Outbox messages in batches the sink rejected."
+)
+OUTBOX_BATCH_DURATION = REGISTRY.histogram(
+    "outbox_relay_batch_seconds", "Time to claim, publish and mark one outbox batch."
+)
+OUTBOX_DELIVERY_LAG = REGISTRY.histogram(
+    "outbox_delivery_lag_seconds",
+    "Time from an outbox message's commit to its publication.",
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0),
+)
+# failed messages keep at most this much of the error for inspection
+MAX_ERROR_LENGTH = 500
+
+
+def claim_statement(
+    dialect_name: str, batch_size: int, max_attempts: int, now: datetime.datetime
+) -> SelectOfScalar[OutboxMessage]:
+    """The oldest pending unleased messages, locked so concurrent relays claim disjoint batches."""
+    statement = (
+        select(OutboxMessage)
+        .where(
+            col(OutboxMessage.published_at).is_(None),
+            col(OutboxMessage.attempts) < max_attempts,
+            or_(
+                col(OutboxMessage.claimed_until).is_(None),
+                col(OutboxMessage.claimed_until) < now,
+            ),
+        )
+        .order_by(col(OutboxMessage.id))
+        .limit(batch_size)
+    )
+    if dialect_name == "postgresql":
+        # rows another relay holds are skipped instead of waited for
+        statement = statement.with_for_update(skip_locked=True)
+    return statement
+
+
+class OutboxRelay:
+    """
+    Publishes committed outbox messages in batches from a background task.
+
+    A batch is claimed in a short transaction that leases its messages for
+    claim_lease_seconds (claimed_until), then published with no transaction open, so the
+    sink's runtime holds neither row locks nor a pooled connection, and marked in a second
+    transaction. On Postgres the claim is SELECT ... FOR UPDATE SKIP LOCKED, so any number
+    of relays (one per worker process) split the backlog without claiming a message
+    twice. SQLite has no row locks and serializes writers anyway; there the claim is a
+    plain poll and one relay should run per database. Messages are published in id order
+    within a relay, but batches of different relays interleave.
+
+    A relay that dies mid-batch leaves its lease to expire, after which another relay
+    publishes the batch again (delivery is at least once). The lease must outlast the
+    sink's timeout, or a slow publish could overlap the next claim of the same messages.
+    A rejected batch is released with its attempts counted; messages that reach
+    max_attempts are no longer claimed and stay in the table for inspection.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession],
+        sink: OutboxSink,
+        batch_size: int = 100,
+        poll_interval_seconds: float = 1.0,
+        max_attempts: int = 10,
+        claim_lease_seconds: float = 60.0,
+    ) -> None:
+        self.session_factory = session_factory
+        self.sink = sink
+        self.batch_size = batch_size
+        self.poll_interval_seconds = poll_interval_seconds
+        self.max_attempts = max_attempts
+        self.claim_lease_seconds = claim_lease_seconds
+        self.published_count = 0
+        self.failed_count = 0
+        self.oldest_pending_age_seconds = 0.0
+        self._task: Optional[asyncio.Task[None]] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._task = asyncio.get_running_loop().create_task(self._run(), name="outbox-relay")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.sink.close()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                published = await self.relay_once()
+            except Exception:
+                logger.exception("outbox relay batch failed")
+                published = 0
+            # a full batch means there is probably more waiting, keep draining
+            if published < self.batch_size:
+                await asyncio.sleep(self.poll_interval_seconds)
+
+    async def _claim(self) -> List[OutboxMessage]:
+        async with self.session_factory() as session:
+            connection = await session.connection()
+            now = utcnow()
+            statement = claim_statement(
+                connection.dialect.name, self.batch_size, self.max_attempts, now
+            )
+            messages: List[OutboxMessage] = list((await session.exec(statement)).all())
+            if messages:
+                await session.exec(
+                    update(OutboxMessage)
+                    .where(col(OutboxMessage.id).in_([message.id for message in messages]))
+                    .values(
+                        claimed_until=now + datetime.timedelta(seconds=self.claim_lease_seconds)
+                    )
+                )
+            await session.commit()
+        return messages
+
+    async def _mark(self, ids: List[Optional[int]], **values: Any) -> None:
+        async with self.session_factory() as session:
+            await session.exec(
+                update(OutboxMessage)
+                .where(col(OutboxMessage.id).in_(ids))
+                .values(attempts=OutboxMessage.attempts + 1, claimed_until=None, **values)
+            )
+            await session.commit()
+
+    async def relay_once(self) -> int:
+        """Claim, publish and mark one batch; returns the number of messages published."""
+        start = time.perf_counter()
+        messages = await self._claim()
+        if not messages:
+            self.oldest_pending_age_seconds = 0.0
+            return 0
+
+        oldest = as_utc(messages[0].created_at)
+        self.oldest_pending_age_seconds = (utcnow() - oldest).total_seconds()
+        ids = [message.id for message in messages]
+        try:
+            await self.sink.publish(messages)
+        except Exception as err:
+            logger.warning("outbox sink rejected {} messages: {!r}", len(messages), err)
+            await self._mark(ids, last_error=repr(err)[:MAX_ERROR_LENGTH])
+            self.failed_count += len(messages)
+            OUTBOX_FAILED.inc(amount=len(messages))
+            return 0
+
+        published_at = utcnow()
+        await self._mark(ids, published_at=published_at)
+
+        self.published_count += len(messages)
+        OUTBOX_PUBLISHED.inc(amount=len(messages))
+        OUTBOX_BATCH_DURATION.observe(time.perf_counter() - start)
+        for message in messages:
+            OUTBOX_DELIVERY_LAG.observe(
+                (published_at - as_utc(message.created_at)).total_seconds()
+            )
+        logger.debug("outbox relayed {} messages", len(messages))
+        return len(messages)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "running": self.running,
+            "published_count": self.published_count,
+            "failed_count": self.failed_count,
+            "oldest_pending_age_seconds": round(self.oldest_pending_age_seconds, 3),
+        }
+
+
+_outbox_relay: Optional[OutboxRelay] = None
+
+
+def _create_sink(settings: Settings) -> OutboxSink:
+    if settings.outbox_sink == "webhook":
+        if not settings.outbox_webhook_url:
+            raise ConfigurationException(
+                detail="outbox_sink is 'webhook' but outbox_webhook_url is not set"
+            )
+        if settings.outbox_webhook_timeout_seconds >= settings.outbox_claim_lease_seconds:
+            raise ConfigurationException(
+                detail="outbox_webhook_timeout_seconds must be below outbox_claim_lease_seconds"
+            )
+        return WebhookSink(
+            settings.outbox_webhook_url, settings.outbox_webhook_timeout_seconds
+        )
+    return LoggingSink()
+
+
+def get_outbox_relay(settings: Settings) -> Optional[OutboxRelay]:
+    """The process wide outbox relay, or None when it is disabled."""
+    global _outbox_relay
+
+    if not settings.outbox_relay_enabled:
+        return None
+    if _outbox_relay is None:
+        _outbox_relay = OutboxRelay(
+            session_factory=get_async_sessionmaker(settings),
+            sink=_create_sink(settings),
+            batch_size=settings.outbox_batch_size,
+            poll_interval_seconds=settings.outbox_poll_interval_seconds,
+            max_attempts=settings.outbox_max_attempts,
+            claim_lease_seconds=settings.outbox_claim_lease_seconds,
+        )
+    return _outbox_relay
@@ -0,0 +1,66 @@
+import json
+from typing import List, Protocol, Sequence
+
+import httpx
+from loguru import logger
+
+from app.core.resource_adapters.outbox.models import OutboxMessage
+
+
+class OutboxSink(Protocol):
+    """
+    Where the relay publishes messages.
+
+    publish gets a whole claimed batch and must raise if any message was not accepted;
+    the batch is then retried, so sinks have to tolerate redelivery.
+    """
+
+    async def publish(self, messages: Sequence[OutboxMessage]) -> None:
+        ...
+
+    async def close(self) -> None:
+        ...
+
+
+class LoggingSink(OutboxSink):
+    async def publish(self, messages: Sequence[OutboxMessage]) -> None:
+        for message in messages:
+            logger.info(
+                "outbox event {} {} for {} {}",
+                message.event_type,
+                message.event_id,
+                message.aggregate_type,
+                message.aggregate_id,
+            )
+
+    async def close(self) -> None:
+        pass
+
+
+class InMemorySink(OutboxSink):
+    def __init__(self) -> None:
+        self.messages: List[OutboxMessage] = []
+
+    async def publish(self, messages: Sequence[OutboxMessage]) -> None:
+        self.messages.extend(messages)
+
+    async def close(self) -> None:
+        pass
+
+
+class WebhookSink(OutboxSink):
+    """POSTs each batch as {"messages": [...]} to url; any non-2xx status fails the batch."""
+
+    def __init__(self, url: str, timeout_seconds: float = 10.0) -> None:
+        self.url = url
+        self.client = httpx.AsyncClient(timeout=timeout_seconds)
+
+    async def publish(self, messages: Sequence[OutboxMessage]) -> None:
+        body = json.dumps({"messages": [message.as_dict() for message in messages]})
+        response = await self.client.post(
+            self.url, content=body, headers={"Content-Type": "application/json"}
+        )
+        response.raise_for_status()
+
+    async def close(self) -> None:
+        await self.client.aclose()
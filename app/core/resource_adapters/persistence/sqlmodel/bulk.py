@@ -0,0 +1,167 @@
+from enum import Enum
+from typing import Any, Dict, Iterable, Iterator, List, Sequence
+
+from sqlalchemy import Table, or_, text
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncConnection
+from sqlalchemy.sql.dml import Insert
+
+from app.core.exceptions import UnsupportedOperationException
+
+# Bulk INSERT ... ON CONFLICT DO UPDATE for Postgres and SQLite.
+# Large Postgres batches are COPY'd into a temporary staging table first and merged with a
+# single INSERT ... SELECT, which avoids binding (and parsing) every value as a parameter.
+# https://www.postgresql.org/docs/current/sql-copy.html
+# https://www.sqlite.org/lang_upsert.html
+
+
+def batched(rows: Iterable[Dict[str, Any]], batch_size: int) -> Iterator[List[Dict[str, Any]]]:
+    batch: List[Dict[str, Any]] = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _dialect_insert(table: Table, dialect_name: str) -> Insert:
+    if dialect_name == "postgresql":
+        return postgresql.insert(table)
+    if dialect_name == "sqlite":
+        return sqlite.insert(table)
+    raise UnsupportedOperationException(
+        message="Bulk upsert not supported",
+        detail=f"No upsert support for the {dialect_name} dialect",
+    )
+
+
+def insert_ignore_statement(
+    table: Table, dialect_name: str, index_elements: Sequence[str]
+) -> Insert:
+    """Bulk INSERT that silently skips rows whose key already exists, for idempotent writes."""
+    return _dialect_insert(table, dialect_name).on_conflict_do_nothing(
+        index_elements=list(index_elements)
+    )
+
+
+def upsert_statement(
+    table: Table, dialect_name: str, index_elements: Sequence[str]
+) -> Insert:
+    """
+    Build an upsert for executemany use.
+
+    Conflicting rows get every non-key column from the incoming row and their version
+    bumped, but only when something actually changed, so re-importing an unchanged dump
+    writes nothing.
+    """
+    statement = _dialect_insert(table, dialect_name)
+    data_columns = [
+        column
+        for column in table.columns
+        if column.name not in index_elements and column.name != "version"
+    ]
+    set_: Dict[str, Any] = {
+        column.name: statement.excluded[column.name] for column in data_columns
+    }
+    if "version" in table.columns:
+        set_["version"] = table.c.version + 1
+    changed = [
+        column.is_distinct_from(statement.excluded[column.name]) for column in data_columns
+    ]
+    return statement.on_conflict_do_update(
+        index_elements=list(index_elements),
+        set_=set_,
+        where=or_(*changed) if changed else None,
+    )
+
+
+def _copy_value(value: Any) -> Any:
+    # SQLAlchemy stores Enum columns by member name, COPY has to send the same text
+    return value.name if isinstance(value, Enum) else value
+
+
+def last_per_key(
+    rows: Sequence[Dict[str, Any]], index_elements: Sequence[str]
+) -> List[Dict[str, Any]]:
+    """
+    Keep the last row for each key, in the position of its first occurrence.
+
+    One INSERT ... SELECT cannot update the same row twice ("command cannot affect row a
+    second time"), so a staged batch must be unique on its key. Executing the upsert row
+    by row applies duplicates in order; last one wins matches that.
+    """
+    unique: Dict[tuple, Dict[str, Any]] = {}
+    for row in rows:
+        unique[tuple(row[key] for key in index_elements)] = row
+    return list(unique.values())
+
+
+def _staging_sql(table: Table, columns: Sequence[str], index_elements: Sequence[str]) -> tuple[str, str]:
+    staging = f"{table.name}_import"
+    create = (
+        f"create temporary table if not exists {staging} "
+        f"(like {table.fullname} including defaults) on commit drop"
+    )
+    column_list = ", ".join(columns)
+    updates = [c for c in columns if c not in index_elements and c != "version"]
+    assignments = [f"{c} = excluded.{c}" for c in updates]
+    if "version" in columns:
+        assignments.append(f"version = {table.fullname}.version + 1")
+    changed = " or ".join(f"{table.fullname}.{c} is distinct from excluded.{c}" for c in updates)
+    merge = (
+        f"insert into {table.fullname} ({column_list}) "
+        f"select {column_list} from {staging} "
+        f"on conflict ({', '.join(index_elements)}) do update set {', '.join(assignments)}"
+        + (f" where {changed}" if changed else "")
+    )
+    return create, merge
+
+
+def copy_upsert(
+    connection: Connection,
+    table: Table,
+    rows: Sequence[Dict[str, Any]],
+    index_elements: Sequence[str],
+) -> None:
+    """COPY a batch into a staging table and merge it, psycopg (v3) connections only."""
+    rows = last_per_key(rows, index_elements)
+    columns = list(rows[0].keys())
+    create, merge = _staging_sql(table, columns, index_elements)
+    staging = f"{table.name}_import"
+    connection.execute(text(create))
+    connection.execute(text(f"truncate {staging}"))
+    cursor = connection.connection.driver_connection.cursor()
+    with cursor.copy(f"copy {staging} ({', '.join(columns)}) from stdin") as copy:
+        for row in rows:
+            copy.write_row([_copy_value(row[c]) for c in columns])
+    connection.execute(text(merge))
+
+
+async def copy_upsert_async(
+    connection: AsyncConnection,
+    table: Table,
+    rows: Sequence[Dict[str, Any]],
+    index_elements: Sequence[str],
+) -> None:
+    """COPY a batch into a staging table and merge it, asyncpg connections only."""
+    rows = last_per_key(rows, index_elements)
+    columns = list(rows[0].keys())
+    create, merge = _staging_sql(table, columns, index_elements)
+    staging = f"{table.name}_import"
+    await connection.execute(text(create))
+    await connection.execute(text(f"truncate {staging}"))
+    raw = await connection.get_raw_connection()
+    await raw.driver_connection.copy_records_to_table(
+        staging,
+        records=[tuple(_copy_value(row[c]) for c in columns) for row in rows],
+        columns=columns,
+    )
+    await connection.execute(text(merge))
+
+
+def supports_copy(connection: Connection | AsyncConnection) -> bool:
+    dialect = connection.dialect
+    return dialect.name == "postgresql" and dialect.driver in ("psycopg", "asyncpg")
@@ -0,0 +1,171 @@
+import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
+
+from loguru import logger
+from sqlalchemy import JSON, Column, DateTime, UniqueConstraint
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Field, SQLModel, col, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.exceptions import ConflictException
+from config import get_settings
+
+# Append-only event store: every change to an event sourced aggregate is one row, numbered
+# per aggregate from 1. The unique (aggregate_type, aggregate_id, version) key is the
+# optimistic lock, two writers appending at the same version cannot both commit.
+# Snapshots hold an aggregate's state at some version, so loading one only replays the
+# events after its latest snapshot.
+
+
+# (aggregate_id, version, event_type), as stream_columns yields them
+EventColumnRow = Tuple[str, int, str]
+STREAM_CHUNK_SIZE = 10_000
+VERSION_CONSTRAINT = "uq_event_store_aggregate_version"
+
+
+def utcnow() -> datetime.datetime:
+    return datetime.datetime.now(datetime.timezone.utc)
+
+
+def is_version_conflict(err: IntegrityError) -> bool:
+    # Postgres names the violated constraint, SQLite lists its columns
+    message = str(err.orig)
+    return VERSION_CONSTRAINT in message or "event_store.version" in message
+
+
+class StoredEvent(SQLModel, table=True):
+    __tablename__ = "event_store"
+    __table_args__ = (
+        UniqueConstraint(
+            "aggregate_type", "aggregate_id", "version", name=VERSION_CONSTRAINT
+        ),
+        {"schema": get_settings().get_table_schema},
+    )
+
+    # global append order, for consumers that read every aggregate's events
+    id: Optional[int] = Field(default=None, primary_key=True)
+    aggregate_type: str
+    aggregate_id: str
+    version: int
+    event_id: str = Field(unique=True)
+    event_type: str
+    payload: Dict[str, Any] = Field(sa_column=Column(JSON, nullable=False))
+    recorded_at: datetime.datetime = Field(
+        default_factory=utcnow, sa_column=Column(DateTime(timezone=True), nullable=False)
+    )
+
+
+class Snapshot(SQLModel, table=True):
+    __tablename__ = "event_snapshot"
+    __table_args__ = {"schema": get_settings().get_table_schema}
+
+    aggregate_type: str = Field(primary_key=True)
+    aggregate_id: str = Field(primary_key=True)
+    version: int = Field(primary_key=True)
+    state: Dict[str, Any] = Field(sa_column=Column(JSON, nullable=False))
+    created_at: datetime.datetime = Field(
+        default_factory=utcnow, sa_column=Column(DateTime(timezone=True), nullable=False)
+    )
+
+
+class EventStore:
+    """
+    Reads and appends one aggregate type's events within the caller's session.
+
+    Nothing here commits: appended events, snapshots and whatever else the unit of work
+    wrote (the aggregate's outbox messages) commit or roll back together.
+    """
+
+    def __init__(self, session: AsyncSession, aggregate_type: str) -> None:
+        self.session = session
+        self.aggregate_type = aggregate_type
+
+    async def load(self, aggregate_id: str, after_version: int = 0) -> List[StoredEvent]:
+        statement = (
+            select(StoredEvent)
+            .where(
+                StoredEvent.aggregate_type == self.aggregate_type,
+                StoredEvent.aggregate_id == aggregate_id,
+                col(StoredEvent.version) > after_version,
+            )
+            .order_by(col(StoredEvent.version))
+        )
+        return list((await self.session.exec(statement)).all())
+
+    async def append(
+        self,
+        aggregate_id: str,
+        expected_version: int,
+        events: Sequence[Dict[str, Any]],
+    ) -> int:
+        """
+        Append events (each with event_id, event_type and payload) after expected_version.
+
+        Returns the new version. Raises ConflictException when another writer appended at
+        one of these versions first; the whole unit of work has to be retried. Any other
+        IntegrityError, such as an event_id stored before, is raised as is: retrying would
+        fail the same way.
+        """
+        rows = [
+            StoredEvent(
+                aggregate_type=self.aggregate_type,
+                aggregate_id=aggregate_id,
+                version=expected_version + offset,
+                **event,
+            )
+            for offset, event in enumerate(events, start=1)
+        ]
+        self.session.add_all(rows)
+        try:
+            await self.session.flush(rows)
+        except IntegrityError as err:
+            if not is_version_conflict(err):
+                raise
+            logger.info(
+                "append conflict for {} {} at version {}",
+                self.aggregate_type,
+                aggregate_id,
+                expected_version,
+            )
+            raise ConflictException(
+                message="Aggregate was modified concurrently",
+                detail=(
+                    f"{self.aggregate_type} {aggregate_id} has events after "
+                    f"version {expected_version}"
+                ),
+            ) from err
+        return expected_version + len(rows)
+
+    async def stream_columns(
+        self, chunk_size: int = STREAM_CHUNK_SIZE
+    ) -> AsyncIterator[Sequence[EventColumnRow]]:
+        """Every event of this aggregate type as chunks of column tuples, for bulk analysis."""
+        statement = select(
+            StoredEvent.aggregate_id, StoredEvent.version, StoredEvent.event_type
+        ).where(StoredEvent.aggregate_type == self.aggregate_type)
+        connection = await self.session.connection()
+        result = await connection.stream(statement)
+        async for chunk in result.partitions(chunk_size):
+            yield chunk
+
+    async def latest_snapshot(self, aggregate_id: str) -> Optional[Snapshot]:
+        statement = (
+            select(Snapshot)
+            .where(
+                Snapshot.aggregate_type == self.aggregate_type,
+                Snapshot.aggregate_id == aggregate_id,
+            )
+            .order_by(col(Snapshot.version).desc())
+            .limit(1)
+        )
+        return (await self.session.exec(statement)).first()
+
+    def add_snapshot(self, aggregate_id: str, version: int, state: Dict[str, Any]) -> None:
+        self.session.add(
+            Snapshot(
+                aggregate_type=self.aggregate_type,
+                aggregate_id=aggregate_id,
+                version=version,
+                state=state,
+            )
+        )
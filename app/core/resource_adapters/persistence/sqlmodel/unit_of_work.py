@@ -1,26 +1,47 @@
 from types import TracebackType
+from typing import Any, Iterable
 
 from loguru import logger
+from sqlalchemy.orm.exc import StaleDataError
 from sqlmodel import Session
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from app.core.exceptions import ConflictException
+from app.core.resource_adapters.outbox.models import outbox_message
 from app.core.unit_of_work import UnitOfWork
 
 
+def _conflict(err: StaleDataError) -> ConflictException:
+    return ConflictException(
+        message="Stale commit, the aggregate was modified concurrently",
+        detail=str(err),
+    )
+
+
 class SQLModelUnitOfWork(UnitOfWork):
     def __init__(self, session: Session | None = None) -> None:
         self.session: Session = session
 
     def commit(self) -> None:
         if self.session:
-            self.session.commit()
+            try:
+                self.session.commit()
+            except StaleDataError as err:
+                self.session.rollback()
+                raise _conflict(err) from err
 
     def rollback(self) -> None:
         if self.session:
             self.session.rollback()
 
+    def add_events(self, aggregate_type: str, aggregate_id: Any, events: Iterable[Any]) -> None:
+        """Stage events in the outbox, committed or rolled back with the aggregate change."""
+        self.session.add_all(
+            outbox_message(event, aggregate_type, aggregate_id) for event in events
+        )
+
     def __enter__(self) -> "SQLModelUnitOfWork":
-        logger.info("enter sqlmodel uow")
+        logger.debug("enter sqlmodel uow")
         return self
 
     def __exit__(
@@ -29,15 +50,19 @@ class SQLModelUnitOfWork(UnitOfWork):
         exc_val: BaseException | None,
         exc_tb: TracebackType | None,
     ) -> None:
-        if exc_type:
-            logger.info("exit rollback sqlmodel uow")
-            self.rollback()
-        else:
-            logger.info("exit commit sqlmodel uow")
-            self.commit()
-
-        if self.session:
-            self.session.close()
+        try:
+            if exc_type:
+                logger.debug("exit rollback sqlmodel uow")
+                self.rollback()
+                if isinstance(exc_val, StaleDataError):
+                    # raised by an autoflush inside the block rather than by commit
+                    raise _conflict(exc_val) from exc_val
+            else:
+                logger.debug("exit commit sqlmodel uow")
+                self.commit()
+        finally:
+            if self.session:
+                self.session.close()
 
 
 class AsyncSQLModelUnitOfWork(UnitOfWork):
@@ -46,14 +71,24 @@ class AsyncSQLModelUnitOfWork(UnitOfWork):
 
     async def commit(self) -> None:
         if self.session:
-            await self.session.commit()
+            try:
+                await self.session.commit()
+            except StaleDataError as err:
+                await self.session.rollback()
+                raise _conflict(err) from err
 
     async def rollback(self) -> None:
         if self.session:
             await self.session.rollback()
 
+    def add_events(self, aggregate_type: str, aggregate_id: Any, events: Iterable[Any]) -> None:
+        """Stage events in the outbox, committed or rolled back with the aggregate change."""
+        self.session.add_all(
+            outbox_message(event, aggregate_type, aggregate_id) for event in events
+        )
+
     async def __aenter__(self) -> "AsyncSQLModelUnitOfWork":
-        logger.info("enter async sqlmodel uow")
+        logger.debug("enter async sqlmodel uow")
         return self
 
     async def __aexit__(
@@ -62,12 +97,15 @@ class AsyncSQLModelUnitOfWork(UnitOfWork):
         exc_val: BaseException | None,
         exc_tb: TracebackType | None,
     ) -> None:
-        if exc_type:
-            logger.info("exit rollback async sqlmodel uow")
-            await self.rollback()
-        else:
-            logger.info("exit commit async sqlmodel uow")
-            await self.commit()
-
-        if self.session:
-            await self.session.close()
+        try:
+            if exc_type:
+                logger.debug("exit rollback async sqlmodel uow")
+                await self.rollback()
+                if isinstance(exc_val, StaleDataError):
+                    raise _conflict(exc_val) from exc_val
+            else:
+                logger.debug("exit commit async sqlmodel uow")
+                await self.commit()
+        finally:
+            if self.session:
+                await self.session.close()
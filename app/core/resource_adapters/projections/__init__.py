@@ -0,0 +1,5 @@
+# Projection resource adapters initialization
+from app.core.resource_adapters.projections.models import ProjectionCheckpoint
+from app.core.resource_adapters.projections.runner import Projection, ProjectionRunner
+
+__all__ = ["Projection", "ProjectionCheckpoint", "ProjectionRunner"]
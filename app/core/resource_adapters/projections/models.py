@@ -0,0 +1,20 @@
+import datetime
+
+from sqlalchemy import Column, DateTime
+from sqlmodel import Field, SQLModel
+
+from app.core.resource_adapters.outbox.models import utcnow
+from config import get_settings
+
+
+class ProjectionCheckpoint(SQLModel, table=True):
+    """How far into the event store (by StoredEvent.id) a projection has applied events."""
+
+    __tablename__ = "projection_checkpoint"
+    __table_args__ = {"schema": get_settings().get_table_schema}
+
+    name: str = Field(primary_key=True)
+    position: int = 0
+    updated_at: datetime.datetime = Field(
+        default_factory=utcnow, sa_column=Column(DateTime(timezone=True), nullable=False)
+    )
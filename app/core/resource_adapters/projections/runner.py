@@ -0,0 +1,232 @@
+import asyncio
+import datetime
+import time
+from typing import Any, Callable, Dict, List, Optional, Protocol, Sequence
+
+from loguru import logger
+from sqlalchemy import func
+from sqlmodel import col, select, update
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.metrics import REGISTRY
+from app.core.resource_adapters.outbox.models import as_utc, utcnow
+from app.core.resource_adapters.persistence.sqlmodel.bulk import insert_ignore_statement
+from app.core.resource_adapters.persistence.sqlmodel.event_store import StoredEvent
+from app.core.resource_adapters.projections.models import ProjectionCheckpoint
+
+PROJECTION_EVENTS = REGISTRY.counter(
+    "projection_events_applied_total", "Event store events applied to read models."
+)
+PROJECTION_BATCH_DURATION = REGISTRY.histogram(
+    "projection_batch_seconds", "Time to read, apply and checkpoint one projection batch."
+)
+
+
+class Projection(Protocol):
+    """
+    A read model maintained from the event store.
+
+    apply gets every event after the checkpoint, of any aggregate type, in event store
+    order; it runs in the runner's transaction, which also moves the checkpoint, and must
+    not commit. reset puts the read model back to its state before the first event,
+    usually by deleting everything apply wrote, before a rebuild.
+    """
+
+    name: str
+
+    async def apply(self, session: AsyncSession, events: Sequence[StoredEvent]) -> None:
+        ...
+
+    async def reset(self, session: AsyncSession) -> None:
+        ...
+
+
+class ProjectionRunner:
+    """
+    Feeds a projection the event store's events in batches from a background task.
+
+    Each batch is read, applied and checkpointed in one transaction, so a restarted runner
+    resumes exactly after the last committed batch. When several processes run the same
+    projection, the batch's transaction holds the checkpoint row (SELECT ... FOR UPDATE
+    SKIP LOCKED), and the others skip their turn instead of applying the same events.
+    SQLite has no row locks, there the checkpoint only moves from the position the batch
+    was read at and a runner that lost the race rolls back.
+
+    Event ids are handed out before commit, so a reader can see id 12 while id 11 is
+    still being written. A batch therefore stops at a gap in the ids unless the event
+    after it was recorded more than gap_timeout_seconds ago, when the missing id is
+    taken to be a rolled back append. Keep the timeout above the longest transaction
+    that appends events.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession],
+        projection: Projection,
+        batch_size: int = 500,
+        poll_interval_seconds: float = 1.0,
+        gap_timeout_seconds: float = 5.0,
+    ) -> None:
+        self.session_factory = session_factory
+        self.projection = projection
+        self.batch_size = batch_size
+        self.poll_interval_seconds = poll_interval_seconds
+        self.gap_timeout_seconds = gap_timeout_seconds
+        self.position = 0
+        self.applied_count = 0
+        self.lag_events = 0
+        self._task: Optional[asyncio.Task[None]] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._task = asyncio.get_running_loop().create_task(
+            self._run(), name=f"projection-{self.projection.name}"
+        )
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                applied = await self.run_once()
+            except Exception:
+                logger.exception("projection {} batch failed", self.projection.name)
+                applied = 0
+            # a full batch means there is probably more waiting, keep going
+            if applied < self.batch_size:
+                await asyncio.sleep(self.poll_interval_seconds)
+
+    async def _checkpoint(
+        self, session: AsyncSession, skip_locked: bool = True
+    ) -> Optional[int]:
+        """The position, locked until the session ends; None if another runner holds it."""
+        connection = await session.connection()
+        await session.exec(
+            insert_ignore_statement(
+                ProjectionCheckpoint.__table__, connection.dialect.name, ["name"]
+            ).values(name=self.projection.name, position=0, updated_at=utcnow())
+        )
+        statement = (
+            select(ProjectionCheckpoint.position)
+            .where(ProjectionCheckpoint.name == self.projection.name)
+            .with_for_update(skip_locked=skip_locked)
+        )
+        return (await session.exec(statement)).first()
+
+    def _contiguous(self, position: int, events: List[StoredEvent]) -> List[StoredEvent]:
+        settled_before = utcnow() - datetime.timedelta(seconds=self.gap_timeout_seconds)
+        previous = position
+        for index, event in enumerate(events):
+            if event.id != previous + 1 and as_utc(event.recorded_at) > settled_before:
+                logger.debug(
+                    "projection {} waiting for event {}", self.projection.name, previous + 1
+                )
+                return events[:index]
+            previous = event.id
+        return events
+
+    async def run_once(self, batch_size: Optional[int] = None) -> int:
+        """Apply one batch; returns the number of events applied."""
+        batch_size = batch_size or self.batch_size
+        start = time.perf_counter()
+        async with self.session_factory() as session:
+            position = await self._checkpoint(session)
+            if position is None:
+                # another runner is applying the next batch
+                await session.rollback()
+                logger.debug("projection {} checkpoint locked", self.projection.name)
+                return 0
+            statement = (
+                select(StoredEvent)
+                .where(col(StoredEvent.id) > position)
+                .order_by(col(StoredEvent.id))
+                .limit(batch_size)
+            )
+            events = self._contiguous(position, list((await session.exec(statement)).all()))
+            if not events:
+                self.position = position
+                self.lag_events = await self._lag(session, position)
+                await session.commit()
+                return 0
+
+            await self.projection.apply(session, events)
+            new_position = events[-1].id
+            result = await session.exec(
+                update(ProjectionCheckpoint)
+                .where(
+                    col(ProjectionCheckpoint.name) == self.projection.name,
+                    col(ProjectionCheckpoint.position) == position,
+                )
+                .values(position=new_position, updated_at=utcnow())
+            )
+            if result.rowcount != 1:
+                # another runner applied this batch first
+                await session.rollback()
+                logger.info("projection {} lost batch at {}", self.projection.name, position)
+                return 0
+            lag = await self._lag(session, new_position)
+            await session.commit()
+
+        self.position = new_position
+        self.lag_events = lag
+        self.applied_count += len(events)
+        PROJECTION_EVENTS.inc(amount=len(events))
+        PROJECTION_BATCH_DURATION.observe(time.perf_counter() - start)
+        logger.debug("projection {} applied {} events", self.projection.name, len(events))
+        return len(events)
+
+    async def _lag(self, session: AsyncSession, position: int) -> int:
+        last = (await session.exec(select(func.max(StoredEvent.id)))).one()
+        return max((last or 0) - position, 0)
+
+    async def catch_up(self, batch_size: Optional[int] = None) -> int:
+        """Apply batches until none is full; returns the number of events applied."""
+        batch_size = batch_size or self.batch_size
+        total = 0
+        while True:
+            applied = await self.run_once(batch_size)
+            total += applied
+            if applied < batch_size:
+                return total
+
+    async def rebuild(self, batch_size: Optional[int] = None) -> int:
+        """
+        Reset the read model and replay the whole event store into it.
+
+        The reset commits first and every batch commits on its own, so readers see the
+        read model fill up again; a runner in another process just continues from
+        wherever the rebuild has got to.
+        """
+        async with self.session_factory() as session:
+            # waits for a running batch to commit rather than skipping it
+            await self._checkpoint(session, skip_locked=False)
+            await self.projection.reset(session)
+            await session.exec(
+                update(ProjectionCheckpoint)
+                .where(col(ProjectionCheckpoint.name) == self.projection.name)
+                .values(position=0, updated_at=utcnow())
+            )
+            await session.commit()
+        logger.info("projection {} reset, replaying", self.projection.name)
+        return await self.catch_up(batch_size)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.projection.name,
+            "running": self.running,
+            "position": self.position,
+            "lag_events": self.lag_events,
+            "applied_count": self.applied_count,
+        }
@@ -0,0 +1,61 @@
+import datetime
+import json
+import uuid
+from enum import Enum
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+from config import Settings
+
+
+def _default(obj: Any) -> Any:
+    """Types neither encoder handles on its own; orjson already covers datetimes and enums."""
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json")
+    if isinstance(obj, Enum):
+        return obj.value
+    if isinstance(obj, (datetime.datetime, datetime.date, datetime.time)):
+        return obj.isoformat()
+    if isinstance(obj, uuid.UUID):
+        return str(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class DefaultJSONResponse(JSONResponse):
+    """
+    Standard library JSON, plus datetimes, enums and models.
+
+    Endpoints can return their content directly, without FastAPI's jsonable_encoder pass.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return json.dumps(
+            content,
+            ensure_ascii=False,
+            allow_nan=False,
+            separators=(",", ":"),
+            default=_default,
+        ).encode("utf-8")
+
+
+class ORJSONResponse(JSONResponse):
+    """orjson encoding; datetimes, enums, dataclasses and UUIDs are serialized natively."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+def get_response_class(settings: Settings) -> type[JSONResponse]:
+    """
+    The app's default response class, from settings.json_response_class.
+
+    "auto" and "orjson" both use orjson, "json" the standard library encoder.
+    """
+    if settings.json_response_class == "json":
+        return DefaultJSONResponse
+    return ORJSONResponse
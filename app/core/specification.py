@@ -0,0 +1,127 @@
+import abc
+from dataclasses import dataclass
+from typing import Any, Optional, Tuple
+
+from sqlalchemy import and_, not_, or_, true
+from sqlalchemy.sql.elements import ColumnElement
+from sqlmodel import SQLModel
+
+# Specification pattern: a predicate over an entity's fields that can both compile to a
+# SQL clause (so the database filters with its indexes) and be evaluated in memory.
+# https://en.wikipedia.org/wiki/Specification_pattern
+
+
+class Specification(abc.ABC):
+    @abc.abstractmethod
+    def to_clause(self, model: type[SQLModel]) -> ColumnElement[bool]:
+        pass
+
+    @abc.abstractmethod
+    def is_satisfied_by(self, entity: Any) -> bool:
+        pass
+
+    def __call__(self, entity: Any) -> bool:
+        return self.is_satisfied_by(entity)
+
+    def __and__(self, other: "Specification") -> "Specification":
+        return And((self, other))
+
+    def __or__(self, other: "Specification") -> "Specification":
+        return Or((self, other))
+
+    def __invert__(self) -> "Specification":
+        return Not(self)
+
+
+@dataclass(frozen=True)
+class Eq(Specification):
+    field: str
+    value: Any
+
+    def to_clause(self, model: type[SQLModel]) -> ColumnElement[bool]:
+        return getattr(model, self.field) == self.value
+
+    def is_satisfied_by(self, entity: Any) -> bool:
+        return getattr(entity, self.field) == self.value
+
+
+@dataclass(frozen=True)
+class In(Specification):
+    field: str
+    values: Tuple[Any, ...]
+
+    def __init__(self, field: str, values: Any) -> None:
+        object.__setattr__(self, "field", field)
+        object.__setattr__(self, "values", tuple(values))
+
+    def to_clause(self, model: type[SQLModel]) -> ColumnElement[bool]:
+        return getattr(model, self.field).in_(self.values)
+
+    def is_satisfied_by(self, entity: Any) -> bool:
+        return getattr(entity, self.field) in self.values
+
+
+@dataclass(frozen=True)
+class Range(Specification):
+    """Inclusive range, either bound may be omitted."""
+
+    field: str
+    gte: Optional[Any] = None
+    lte: Optional[Any] = None
+
+    def to_clause(self, model: type[SQLModel]) -> ColumnElement[bool]:
+        column = getattr(model, self.field)
+        clauses = []
+        if self.gte is not None:
+            clauses.append(column >= self.gte)
+        if self.lte is not None:
+            clauses.append(column <= self.lte)
+        return and_(true(), *clauses)
+
+    def is_satisfied_by(self, entity: Any) -> bool:
+        value = getattr(entity, self.field)
+        if self.gte is not None and value < self.gte:
+            return False
+        if self.lte is not None and value > self.lte:
+            return False
+        return True
+
+
+@dataclass(frozen=True)
+class And(Specification):
+    specs: Tuple[Specification, ...]
+
+    def to_clause(self, model: type[SQLModel]) -> ColumnElement[bool]:
+        return and_(*(spec.to_clause(model) for spec in self.specs))
+
+    def is_satisfied_by(self, entity: Any) -> bool:
+        return all(spec.is_satisfied_by(entity) for spec in self.specs)
+
+    def __and__(self, other: Specification) -> Specification:
+        # keep chained a & b & c flat rather than nesting one And per operator
+        return And((*self.specs, other))
+
+
+@dataclass(frozen=True)
+class Or(Specification):
+    specs: Tuple[Specification, ...]
+
+    def to_clause(self, model: type[SQLModel]) -> ColumnElement[bool]:
+        return or_(*(spec.to_clause(model) for spec in self.specs))
+
+    def is_satisfied_by(self, entity: Any) -> bool:
+        return any(spec.is_satisfied_by(entity) for spec in self.specs)
+
+    def __or__(self, other: Specification) -> Specification:
+        return Or((*self.specs, other))
+
+
+@dataclass(frozen=True)
+class Not(Specification):
+    spec: Specification
+
+    def to_clause(self, model: type[SQLModel]) -> ColumnElement[bool]:
+        return not_(self.spec.to_clause(model))
+
+    def is_satisfied_by(self, entity: Any) -> bool:
+        return not self.spec.is_satisfied_by(entity)
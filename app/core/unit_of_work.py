@@ -1,5 +1,14 @@
+import asyncio
+import random
 from types import TracebackType
-from typing import Protocol
+from typing import Awaitable, Callable, Optional, Protocol, TypeVar
+
+from loguru import logger
+
+from app.core.exceptions import ConflictException
+from config import get_settings
+
+T = TypeVar("T")
 
 
 class UnitOfWork(Protocol):
@@ -19,3 +28,36 @@ class UnitOfWork(Protocol):
         exc_tb: TracebackType | None,
     ) -> None:
         ...
+
+
+async def retry_on_conflict(
+    operation: Callable[[], Awaitable[T]],
+    max_attempts: Optional[int] = None,
+    backoff_seconds: Optional[float] = None,
+) -> T:
+    """
+    Run operation again when it fails with an optimistic concurrency conflict.
+
+    operation must do the whole read-modify-write in a fresh unit of work on each call,
+    so every retry reloads the aggregate at its current version. Waits between attempts
+    grow exponentially from backoff_seconds, with jitter to spread competing writers.
+    Both default to the optimistic_lock_* settings.
+    """
+    settings = get_settings()
+    if max_attempts is None:
+        max_attempts = settings.optimistic_lock_max_attempts
+    if backoff_seconds is None:
+        backoff_seconds = settings.optimistic_lock_backoff_seconds
+    attempt = 1
+    while True:
+        try:
+            return await operation()
+        except ConflictException:
+            if attempt >= max_attempts:
+                raise
+            delay = backoff_seconds * (2 ** (attempt - 1)) * (0.5 + random.random())
+            logger.info(
+                "conflict on attempt {}/{}, retrying in {:.3f}s", attempt, max_attempts, delay
+            )
+            await asyncio.sleep(delay)
+            attempt += 1
@@ -1,8 +1,11 @@
 import abc
 from datetime import datetime
-from typing import Protocol
+from typing import Any, Protocol
 from config import get_settings
 
+from sqlalchemy import event, inspect
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Mapper, declared_attr
 from sqlmodel import SQLModel
 
 
@@ -26,11 +29,25 @@ class AggregateRoot(SQLModel, abc.ABC, table=False):
 
     The metadata for this class is injected at runtime using FastAPI's dependency injection.
     Before using this class for database operations, ensure that set_metadata has been called.
+
+    version is an optimistic lock: the ORM adds "AND version = :loaded" to every UPDATE/DELETE
+    it flushes for a table aggregate and raises StaleDataError when no row matched.
+    Inserts keep the version the aggregate was built with (0 for a new one, the last event's
+    number for a restored one); every flushed change bumps it by one.
     """
 
     __table_args__ = {"schema": get_settings().get_table_schema}
     version: int = 0
 
+    @declared_attr
+    def __mapper_args__(cls) -> dict[str, Any]:
+        return {
+            "version_id_col": cls.__table__.c.version,
+            # a generator would be called with None on every insert, overwriting the version
+            # the instance carries; _bump_version below increments it on update instead
+            "version_id_generator": False,
+        }
+
     def __init__(self, **data):
         super().__init__(**data)
 
@@ -42,3 +59,13 @@ class AggregateRoot(SQLModel, abc.ABC, table=False):
     @abc.abstractmethod
     def apply(self, event: BaseEvent) -> None:
         pass
+
+
+@event.listens_for(AggregateRoot, "before_update", propagate=True)
+def _bump_version(mapper: Mapper, connection: Connection, target: AggregateRoot) -> None:
+    state = inspect(target)
+    # an explicitly set version is written as is, like a generated one would be
+    if "version" in state.committed_state:
+        return
+    if state.session is not None and state.session.is_modified(target):
+        target.version += 1
@@ -4,6 +4,8 @@ from enum import Enum, auto
 from types import MappingProxyType
 from typing import Any, Final, Optional
 
+from pydantic import PrivateAttr
+from sqlalchemy import event as sa_event
 from sqlmodel import Field
 
 from app.domain.aggregate_root import AggregateRoot, BaseCommand, BaseEvent
@@ -125,8 +127,10 @@ class IssueEvent(BaseEvent):
     timestamp: datetime
     issue_number: int
     issue_state: IssueState
-    issue_state_transition: IssueTransitionState
+    # None for events that do not change the state, e.g. EDITED or LABLED
+    issue_state_transition: Optional[IssueTransitionState]
     issue_event_type: IssueEventType
+    # the new values of edited fields ("title", "body"), previous_* hold the old ones
     changes: dict[str, Any]
     previous_title: str
     previous_body: str
@@ -139,7 +143,7 @@ class IssueEvent(BaseEvent):
         timestamp: datetime,
         issue_number: int,
         issue_state: IssueState,
-        issue_state_transition: IssueTransitionState,
+        issue_state_transition: Optional[IssueTransitionState],
         issue_event_type: IssueEventType,
         changes: dict[str, Any],
         previous_title: str,
@@ -160,6 +164,41 @@ class IssueEvent(BaseEvent):
         self.assignee = assignee
         self.label = label
 
+    def to_dict(self) -> dict[str, Any]:
+        """JSON compatible form, as stored in the event store and the outbox."""
+        return {
+            "event_id": self.event_id,
+            "timestamp": self.timestamp.isoformat(),
+            "issue_number": self.issue_number,
+            "issue_state": self.issue_state.value,
+            "issue_state_transition": (
+                self.issue_state_transition.value if self.issue_state_transition else None
+            ),
+            "issue_event_type": self.issue_event_type.value,
+            "changes": self.changes,
+            "previous_title": self.previous_title,
+            "previous_body": self.previous_body,
+            "assignee": self.assignee,
+            "label": self.label,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "IssueEvent":
+        transition = data.get("issue_state_transition")
+        return cls(
+            event_id=data["event_id"],
+            timestamp=datetime.fromisoformat(data["timestamp"]),
+            issue_number=data["issue_number"],
+            issue_state=IssueState(data["issue_state"]),
+            issue_state_transition=IssueTransitionState(transition) if transition else None,
+            issue_event_type=IssueEventType(data["issue_event_type"]),
+            changes=data.get("changes") or {},
+            previous_title=data.get("previous_title", ""),
+            previous_body=data.get("previous_body", ""),
+            assignee=data.get("assignee"),
+            label=data.get("label"),
+        )
+
 
 ## potential sub-events
 # - connected
@@ -187,6 +226,29 @@ class Issue(AggregateRoot, table=True):
     issue_number: int = Field(primary_key=True)
     issue_state: IssueState = IssueState.OPEN
 
+    # Event sourced state beyond the issue table's columns. Private attributes are not
+    # columns and are left out of API responses; only rehydrated issues fill them in.
+    _title: str = PrivateAttr(default="")
+    _body: str = PrivateAttr(default="")
+    _assignees: set[str] = PrivateAttr(default_factory=set)
+    _labels: set[str] = PrivateAttr(default_factory=set)
+
+    @property
+    def title(self) -> str:
+        return self._title
+
+    @property
+    def body(self) -> str:
+        return self._body
+
+    @property
+    def assignees(self) -> frozenset[str]:
+        return frozenset(self._assignees)
+
+    @property
+    def labels(self) -> frozenset[str]:
+        return frozenset(self._labels)
+
     def process(self, command: BaseCommand) -> list[BaseEvent]:
         if command.validate():
             return []
@@ -194,11 +256,74 @@ class Issue(AggregateRoot, table=True):
             return []
 
     def apply(self, event: BaseEvent) -> None:
-        pass
+        """
+        Change the state as the event records; events are facts, so nothing is validated.
+
+        Does not touch version: the event store numbers events, and the repository sets
+        version to the last applied event's number.
+        """
+        assert isinstance(event, IssueEvent)
+        match event.issue_event_type:
+            case IssueEventType.OPENED:
+                self.issue_state = IssueState.OPEN
+                self._title = event.changes.get("title", self._title)
+                self._body = event.changes.get("body", self._body)
+            case IssueEventType.EDITED:
+                self._title = event.changes.get("title", self._title)
+                self._body = event.changes.get("body", self._body)
+            case IssueEventType.CLOSED:
+                self.issue_state = IssueState.CLOSED
+            case IssueEventType.REOPENED:
+                self.issue_state = IssueState.OPEN
+            case IssueEventType.ASSIGNED:
+                if event.assignee:
+                    self._assignees.add(event.assignee)
+            case IssueEventType.UNASSIGNED:
+                self._assignees.discard(event.assignee)
+            case IssueEventType.LABLED:
+                if event.label:
+                    self._labels.add(event.label)
+            case IssueEventType.UNLABLED:
+                self._labels.discard(event.label)
+            case _:
+                raise ValueError(f"Unknown issue event type: {event.issue_event_type}")
+
+    def snapshot(self) -> dict[str, Any]:
+        """The state apply() builds, in a JSON compatible form restore() accepts."""
+        return {
+            "issue_state": self.issue_state.value,
+            "title": self._title,
+            "body": self._body,
+            "assignees": sorted(self._assignees),
+            "labels": sorted(self._labels),
+        }
+
+    @classmethod
+    def restore(cls, issue_number: int, version: int, state: dict[str, Any]) -> "Issue":
+        issue = cls(
+            issue_number=issue_number,
+            issue_state=IssueState(state["issue_state"]),
+            version=version,
+        )
+        issue._title = state["title"]
+        issue._body = state["body"]
+        issue._assignees = set(state["assignees"])
+        issue._labels = set(state["labels"])
+        return issue
 
     # likely need a handler method here for 'domain' events and not aggregate events
 
 
+@sa_event.listens_for(Issue, "load")
+def _init_private_state(issue: Issue, _context: Any) -> None:
+    # the ORM builds loaded rows without __init__, which is where pydantic sets these up
+    object.__setattr__(
+        issue,
+        "__pydantic_private__",
+        {name: attr.get_default() for name, attr in Issue.__private_attributes__.items()},
+    )
+
+
 ### Commands ###
 class IssueCommand(BaseCommand):
     command_id: str
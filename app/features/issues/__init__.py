@@ -1,3 +1,5 @@
+from app.features.issues.event_sourced_repository import EventSourcedIssueRepository
 from app.features.issues.router import router
+from app.features.issues.webhooks import router as webhooks_router
 
-__all__ = ["router"]
+__all__ = ["EventSourcedIssueRepository", "router", "webhooks_router"]
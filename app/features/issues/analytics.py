@@ -0,0 +1,222 @@
+import asyncio
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+from loguru import logger
+from pydantic import BaseModel
+
+from app.core.cache import CacheBackend, TTLLRUCache
+from app.core.resource_adapters.persistence.sqlmodel.event_store import EventStore
+from app.domain.issue import IssueEventType, IssueState
+from app.features.issues.repository import IssueRepository
+from config import Settings
+
+# Fleet-wide issue analytics over column arrays. Issues and events are read in chunks of
+# plain tuples (never as ORM objects) and appended to NumPy arrays, with states and event
+# types encoded as small integer codes on the way in. Every metric is then a handful of
+# whole-array operations: bincount for distributions, one argsort and a shifted
+# comparison for state transitions. Each run still reads every issue and event, so the
+# result is cached per process for analytics_cache_ttl_seconds.
+
+ISSUE_STATES = tuple(state.value for state in IssueState)
+EVENT_TYPES = tuple(event_type.value for event_type in IssueEventType)
+_STATE_CODES = {name: code for code, name in enumerate(ISSUE_STATES)}
+_EVENT_TYPE_CODES = {name: code for code, name in enumerate(EVENT_TYPES)}
+_OPENED, _CLOSED, _REOPENED = (
+    _EVENT_TYPE_CODES[event_type.value]
+    for event_type in (IssueEventType.OPENED, IssueEventType.CLOSED, IssueEventType.REOPENED)
+)
+
+# transition state codes; NEW is "before the first state changing event"
+_NEW, _OPEN_STATE, _CLOSED_STATE = 0, 1, 2
+_TRANSITION_STATES = ("NEW", IssueState.OPEN.value, IssueState.CLOSED.value)
+# the one entry of the analytics cache
+ANALYTICS_CACHE_KEY = "issues"
+
+_analytics_cache: CacheBackend | None = None
+
+
+class EventsPerIssue(BaseModel):
+    p50: float
+    p95: float
+    max: int
+
+
+class IssueAnalytics(BaseModel):
+    issues: int
+    events: int
+    state_distribution: Dict[str, int]
+    event_type_counts: Dict[str, int]
+    # "OPEN->CLOSED": how often an event moved an issue between those states
+    transitions: Dict[str, int]
+    issues_closed: int
+    issues_reopened: int
+    # share of the issues ever closed that were reopened at least once
+    reopen_rate: Optional[float]
+    events_per_issue: Optional[EventsPerIssue]
+
+
+@dataclass
+class IssueColumns:
+    issue_number: Any
+    # codes into ISSUE_STATES
+    issue_state: Any
+    version: Any
+
+
+@dataclass
+class EventColumns:
+    issue_number: Any
+    version: Any
+    # codes into EVENT_TYPES
+    event_type: Any
+
+
+def get_analytics_cache(settings: Settings) -> CacheBackend | None:
+    """Get or create the per-process cache of the last analytics, None when disabled."""
+    global _analytics_cache
+
+    if settings.analytics_cache_ttl_seconds <= 0:
+        return None
+
+    if _analytics_cache is None:
+        _analytics_cache = TTLLRUCache(
+            max_size=1, ttl_seconds=settings.analytics_cache_ttl_seconds
+        )
+    return _analytics_cache
+
+
+def _ints(values: Sequence[int]) -> Any:
+    return np.fromiter(values, dtype=np.int64, count=len(values))
+
+
+def _parsed_ints(values: Sequence[str]) -> Any:
+    return np.fromiter(map(int, values), dtype=np.int64, count=len(values))
+
+
+def encode_issue_states(values: Sequence[str]) -> Any:
+    return np.fromiter(map(_STATE_CODES.__getitem__, values), dtype=np.int8, count=len(values))
+
+
+def encode_event_types(values: Sequence[str]) -> Any:
+    return np.fromiter(
+        map(_EVENT_TYPE_CODES.__getitem__, values), dtype=np.int8, count=len(values)
+    )
+
+
+async def _load_columns(
+    chunks: AsyncIterator[Sequence[Sequence[Any]]],
+    converters: Sequence[Callable[[Sequence[Any]], Any]],
+    dtypes: Sequence[Any],
+) -> List[Any]:
+    parts: List[List[Any]] = [[] for _ in converters]
+    async for chunk in chunks:
+        for index, (column, convert) in enumerate(zip(zip(*chunk, strict=True), converters, strict=True)):
+            parts[index].append(convert(column))
+    return [
+        np.concatenate(column_parts) if column_parts else np.empty(0, dtype=dtype)
+        for column_parts, dtype in zip(parts, dtypes, strict=True)
+    ]
+
+
+async def load_issue_columns(repo: IssueRepository, chunk_size: int) -> IssueColumns:
+    numbers, states, versions = await _load_columns(
+        repo.stream_columns(chunk_size),
+        (_ints, encode_issue_states, _ints),
+        (np.int64, np.int8, np.int64),
+    )
+    return IssueColumns(issue_number=numbers, issue_state=states, version=versions)
+
+
+async def load_event_columns(store: EventStore, chunk_size: int) -> EventColumns:
+    # aggregate ids are the issue numbers as text
+    numbers, versions, event_types = await _load_columns(
+        store.stream_columns(chunk_size),
+        (_parsed_ints, _ints, encode_event_types),
+        (np.int64, np.int64, np.int8),
+    )
+    return EventColumns(issue_number=numbers, version=versions, event_type=event_types)
+
+
+def _counts(codes: Any, names: Sequence[str]) -> Dict[str, int]:
+    counts = np.bincount(codes, minlength=len(names))
+    return {name: count for name, count in zip(names, counts.tolist(), strict=True) if count}
+
+
+def _transitions(events: EventColumns) -> Dict[str, int]:
+    if not len(events.version):
+        return {}
+    # sorted by issue_number, then version within an issue: each issue's events in order
+    order = np.lexsort((events.version, events.issue_number))
+    event_types = events.event_type[order]
+    changing = np.isin(event_types, (_OPENED, _CLOSED, _REOPENED))
+    numbers = events.issue_number[order][changing]
+    new_state = np.where(event_types[changing] == _CLOSED, _CLOSED_STATE, _OPEN_STATE)
+
+    # each event's previous state is the event before it, unless that was another issue's
+    previous_state = np.empty_like(new_state)
+    if len(new_state):
+        previous_state[0] = _NEW
+        previous_state[1:] = new_state[:-1]
+        previous_state[1:][numbers[1:] != numbers[:-1]] = _NEW
+    moved = previous_state != new_state
+    pairs = np.bincount(previous_state[moved] * 3 + new_state[moved], minlength=9)
+    return {
+        f"{_TRANSITION_STATES[pair // 3]}->{_TRANSITION_STATES[pair % 3]}": count
+        for pair, count in enumerate(pairs.tolist())
+        if count
+    }
+
+
+def compute_issue_analytics(issues: IssueColumns, events: EventColumns) -> IssueAnalytics:
+    closed = np.unique(events.issue_number[events.event_type == _CLOSED])
+    reopened = np.unique(events.issue_number[events.event_type == _REOPENED])
+    events_per_issue = None
+    if len(events.issue_number):
+        _, per_issue = np.unique(events.issue_number, return_counts=True)
+        p50, p95 = np.percentile(per_issue, [50, 95]).tolist()
+        events_per_issue = EventsPerIssue(p50=p50, p95=p95, max=int(per_issue.max()))
+    return IssueAnalytics(
+        issues=len(issues.issue_number),
+        events=len(events.issue_number),
+        state_distribution=_counts(issues.issue_state, ISSUE_STATES),
+        event_type_counts=_counts(events.event_type, EVENT_TYPES),
+        transitions=_transitions(events),
+        issues_closed=len(closed),
+        issues_reopened=len(reopened),
+        reopen_rate=(
+            len(np.intersect1d(reopened, closed, assume_unique=True)) / len(closed)
+            if len(closed)
+            else None
+        ),
+        events_per_issue=events_per_issue,
+    )
+
+
+async def analyze_issues(
+    repo: IssueRepository,
+    store: EventStore,
+    chunk_size: int,
+    cache: CacheBackend | None = None,
+) -> IssueAnalytics:
+    """Load both column sets and compute the analytics off the event loop, or reuse cache's."""
+    if cache is not None:
+        cached = cache.get(ANALYTICS_CACHE_KEY)
+        if cached is not None:
+            cache.stats.hits += 1
+            return cached
+        cache.stats.misses += 1
+
+    issues = await load_issue_columns(repo, chunk_size)
+    events = await load_event_columns(store, chunk_size)
+    logger.info(
+        "computing analytics over {} issues and {} events",
+        len(issues.issue_number),
+        len(events.issue_number),
+    )
+    # numpy releases the GIL in its sorts and reductions, other requests keep running
+    result = await asyncio.to_thread(compute_issue_analytics, issues, events)
+    if cache is not None:
+        cache.set(ANALYTICS_CACHE_KEY, result)
+    return result
@@ -21,11 +21,11 @@ class AnalyzeIssue(Protocol):
         self.repo = repo
 
     def analyze(self) -> Issue:
-        logger.info(f"analyzing issue: {self.issue_number}")
+        logger.info("analyzing issue: {}", self.issue_number)
         issue = self.repo.get_by_id(self.issue_number)
-        logger.info(f"issue: {issue}")
+        logger.debug("issue: {}", issue)
         if issue.issue_number == 0:
-            logger.info(f"not found issue: {self.issue_number}")
+            logger.info("not found issue: {}", self.issue_number)
             raise NotFoundException(
                 message="Issue not found",
                 detail=f"Issue with number {self.issue_number} does not exist",
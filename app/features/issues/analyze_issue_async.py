@@ -1,4 +1,8 @@
+from typing import List, Optional
+
 from loguru import logger
+from pydantic import BaseModel
+
 from app.features.issues.repository import AsyncSQLModelIssueRepository
 from app.domain.issue import Issue
 from app.core.exceptions import NotFoundException
@@ -10,13 +14,51 @@ class AsyncAnalyzeIssue:
         self.repo = repo
 
     async def analyze(self) -> Issue:
-        logger.info(f"analyzing issue: {self.issue_number}")
+        logger.info("analyzing issue: {}", self.issue_number)
         issue = await self.repo.get_by_id(self.issue_number)
-        logger.info(f"issue: {issue}")
+        logger.debug("issue: {}", issue)
         if issue.issue_number == 0:
-            logger.info(f"not found issue: {self.issue_number}")
+            logger.info("not found issue: {}", self.issue_number)
             raise NotFoundException(
                 message="Issue not found",
                 detail=f"Issue with number {self.issue_number} does not exist",
             )
-        return issue
\ No newline at end of file
+        return issue
+
+
+class BatchAnalyzeItem(BaseModel):
+    """Outcome of analyzing a single issue within a batch."""
+
+    issue_number: int
+    status_code: int
+    issue: Optional[Issue] = None
+    detail: Optional[str] = None
+
+
+class AsyncBatchAnalyzeIssue:
+    def __init__(
+        self, issue_numbers: List[int], repo: AsyncSQLModelIssueRepository
+    ) -> None:
+        self.issue_numbers = issue_numbers
+        self.repo = repo
+
+    async def analyze(self) -> List[BatchAnalyzeItem]:
+        logger.info("analyzing batch of {} issues", len(self.issue_numbers))
+        found = await self.repo.get_many(self.issue_numbers)
+        results: List[BatchAnalyzeItem] = []
+        for issue_number in self.issue_numbers:
+            issue = found.get(issue_number)
+            if issue is None:
+                # a missing issue is reported per item so it does not fail the batch
+                results.append(
+                    BatchAnalyzeItem(
+                        issue_number=issue_number,
+                        status_code=404,
+                        detail=f"Issue with number {issue_number} does not exist",
+                    )
+                )
+            else:
+                results.append(
+                    BatchAnalyzeItem(issue_number=issue_number, status_code=200, issue=issue)
+                )
+        return results
@@ -0,0 +1,257 @@
+from dataclasses import dataclass
+from types import TracebackType
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Union,
+)
+
+from loguru import logger
+from sqlalchemy.sql.elements import ClauseElement
+
+from app.core.cache import CacheBackend, TTLLRUCache
+from app.core.specification import Specification
+from app.domain.issue import Issue
+from app.features.issues.repository import (
+    AsyncSQLModelIssueRepository,
+    STREAM_CHUNK_SIZE,
+    IssueColumnRow,
+    IssueRepository,
+)
+from config import Settings, get_settings
+
+_issue_cache: CacheBackend | None = None
+_missing_issue_cache: CacheBackend | None = None
+
+
+@dataclass(frozen=True)
+class CachedIssue:
+    """
+    Cache entry for one issue.
+
+    data is None for an invalidated entry: it still records the version written by the
+    last update/remove so an older row read concurrently cannot be cached over it.
+    """
+
+    version: int
+    data: Optional[Dict[str, Any]] = None
+
+
+def get_issue_cache(settings: Settings | None = None) -> CacheBackend | None:
+    """Get or create the per-process issue cache, None when caching is disabled."""
+    global _issue_cache
+
+    if settings is None:
+        settings = get_settings()
+
+    if not settings.issue_cache_enabled:
+        return None
+
+    if _issue_cache is None:
+        _issue_cache = TTLLRUCache(
+            max_size=settings.issue_cache_max_size,
+            ttl_seconds=settings.issue_cache_ttl_seconds,
+        )
+    return _issue_cache
+
+
+def get_missing_issue_cache(settings: Settings | None = None) -> CacheBackend | None:
+    """Get or create the per-process negative cache of missing issue numbers."""
+    global _missing_issue_cache
+
+    if settings is None:
+        settings = get_settings()
+
+    if not settings.issue_negative_cache_enabled:
+        return None
+
+    if _missing_issue_cache is None:
+        _missing_issue_cache = TTLLRUCache(
+            max_size=settings.issue_negative_cache_max_size,
+            ttl_seconds=settings.issue_negative_cache_ttl_seconds,
+        )
+    return _missing_issue_cache
+
+
+def invalidate_cached_issues(
+    issue_numbers: Iterable[int], settings: Settings | None = None
+) -> None:
+    """Forget issues written past a CachingIssueRepository, in this process's caches."""
+    caches = [
+        cache
+        for cache in (get_issue_cache(settings), get_missing_issue_cache(settings))
+        if cache is not None
+    ]
+    for issue_number in issue_numbers:
+        for cache in caches:
+            cache.delete(issue_number)
+
+
+class CachingIssueRepository(IssueRepository):
+    """
+    Read-through cache in front of an async issue repository.
+
+    cache holds found issues, missing_cache the issue numbers known not to exist; either
+    may be None. Both are per process, so writes made by other workers are only picked
+    up once an entry's TTL expires; keep the TTLs short.
+    """
+
+    def __init__(
+        self,
+        repo: AsyncSQLModelIssueRepository,
+        cache: CacheBackend | None,
+        missing_cache: CacheBackend | None = None,
+    ) -> None:
+        self.repo = repo
+        self.cache = cache
+        self.missing_cache = missing_cache
+
+    async def commit(self) -> None:
+        await self.repo.commit()
+
+    async def rollback(self) -> None:
+        await self.repo.rollback()
+
+    async def __aenter__(self) -> "CachingIssueRepository":
+        await self.repo.__aenter__()
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        await self.repo.__aexit__(exc_type, exc_val, exc_tb)
+
+    def _lookup(self, id: int) -> Issue | None:
+        if self.missing_cache is not None:
+            if self.missing_cache.get(id) is not None:
+                self.missing_cache.stats.hits += 1
+                return Issue(issue_number=0, version=0)
+            self.missing_cache.stats.misses += 1
+
+        if self.cache is None:
+            return None
+        cached = self.cache.get(id)
+        if cached is not None and cached.data is not None:
+            self.cache.stats.hits += 1
+            # hand out a fresh instance so callers never share (or mutate) the cached one
+            return Issue(**cached.data)
+        self.cache.stats.misses += 1
+        return None
+
+    def _populate(self, issue: Issue) -> None:
+        if self.cache is None:
+            return
+        current = self.cache.get(issue.issue_number)
+        if current is not None and current.version > issue.version:
+            # an update landed while this row was being read, do not cache the older version
+            logger.debug("skipping stale cache fill for issue: {}", issue.issue_number)
+            return
+        self.cache.set(issue.issue_number, CachedIssue(issue.version, issue.model_dump()))
+
+    def _populate_missing(self, id: int) -> None:
+        if self.missing_cache is None:
+            return
+        if self.cache is not None and self.cache.get(id) is not None:
+            # the issue was added or changed while it was being looked up
+            return
+        self.missing_cache.set(id, True)
+
+    async def get_by_id(self, id: int) -> Issue:
+        issue = self._lookup(id)
+        if issue is not None:
+            return issue
+        issue = await self.repo.get_by_id(id)
+        if issue.issue_number == 0:
+            self._populate_missing(id)
+        else:
+            self._populate(issue)
+        return issue
+
+    async def get_version(self, id: int) -> Optional[int]:
+        if self.missing_cache is not None and self.missing_cache.get(id) is not None:
+            self.missing_cache.stats.hits += 1
+            return None
+        if self.cache is not None:
+            cached = self.cache.get(id)
+            # an invalidation marker's version may be ahead of the committed row, only a
+            # filled entry is a version some reader actually saw
+            if cached is not None and cached.data is not None:
+                self.cache.stats.hits += 1
+                return cached.version
+            self.cache.stats.misses += 1
+        return await self.repo.get_version(id)
+
+    async def get_many(self, ids: Iterable[int]) -> Dict[int, Issue]:
+        found: Dict[int, Issue] = {}
+        missing: List[int] = []
+        for id in dict.fromkeys(ids):
+            issue = self._lookup(id)
+            if issue is None:
+                missing.append(id)
+            elif issue.issue_number != 0:
+                found[id] = issue
+        if missing:
+            loaded = await self.repo.get_many(missing)
+            for id in missing:
+                if id in loaded:
+                    self._populate(loaded[id])
+                else:
+                    self._populate_missing(id)
+            found.update(loaded)
+        return found
+
+    async def list(self) -> List[Issue]:
+        return await self.repo.list()
+
+    async def list_page(self, after: Optional[int], limit: int) -> List[Issue]:
+        return await self.repo.list_page(after, limit)
+
+    def stream(self) -> AsyncIterator[Issue]:
+        return self.repo.stream()
+
+    def stream_columns(
+        self, chunk_size: int = STREAM_CHUNK_SIZE
+    ) -> AsyncIterator[Sequence[IssueColumnRow]]:
+        return self.repo.stream_columns(chunk_size)
+
+    async def list_with_predicate(
+        self, predicate: Union[Specification, Callable[[Issue], bool], ClauseElement]
+    ) -> List[Issue]:
+        return await self.repo.list_with_predicate(predicate)
+
+    async def add(self, entity: Issue) -> None:
+        await self.repo.add(entity)
+        if self.missing_cache is not None:
+            self.missing_cache.delete(entity.issue_number)
+        if self.cache is not None:
+            # marks the number as existing so a lookup racing this insert cannot cache it as missing
+            self.cache.set(entity.issue_number, CachedIssue(entity.version))
+
+    async def upsert_many(self, issues: Iterable[Union[Issue, Mapping[str, Any]]]) -> int:
+        count = await self.repo.upsert_many(issues)
+        # bulk writes bypass per-entry invalidation
+        for cache in (self.cache, self.missing_cache):
+            if cache is not None:
+                cache.clear()
+        return count
+
+    async def update(self, entity: Issue) -> None:
+        await self.repo.update(entity)
+        if self.cache is not None:
+            self.cache.set(entity.issue_number, CachedIssue(entity.version))
+
+    async def remove(self, entity: Issue) -> None:
+        await self.repo.remove(entity)
+        if self.cache is not None:
+            # anything read at the removed version or earlier is stale
+            self.cache.set(entity.issue_number, CachedIssue(entity.version + 1))
@@ -0,0 +1,73 @@
+from typing import Optional, Sequence
+
+from loguru import logger
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.resource_adapters.persistence.sqlmodel.event_store import EventStore
+from app.core.resource_adapters.persistence.sqlmodel.unit_of_work import AsyncSQLModelUnitOfWork
+from app.domain.issue import Issue, IssueEvent
+
+ISSUE_AGGREGATE = "issue"
+
+
+class EventSourcedIssueRepository(AsyncSQLModelUnitOfWork):
+    """
+    Issues rebuilt from their events instead of read from the issue table.
+
+    get() starts from the latest snapshot and replays only the events recorded after it,
+    so load time depends on snapshot_interval, not on how many events an issue has.
+    append() records new events at the issue's loaded version, applies them, snapshots
+    whenever the version crosses a multiple of snapshot_interval (0 disables snapshots)
+    and stages the events in the outbox, all in this unit of work's transaction.
+    """
+
+    def __init__(self, session: AsyncSession, snapshot_interval: int = 100) -> None:
+        super().__init__(session)
+        self.store = EventStore(session, ISSUE_AGGREGATE)
+        self.snapshot_interval = snapshot_interval
+
+    async def get(self, issue_number: int) -> Optional[Issue]:
+        aggregate_id = str(issue_number)
+        snapshot = await self.store.latest_snapshot(aggregate_id)
+        if snapshot is None:
+            issue = Issue(issue_number=issue_number, version=0)
+        else:
+            issue = Issue.restore(issue_number, snapshot.version, snapshot.state)
+        events = await self.store.load(aggregate_id, after_version=issue.version)
+        for stored in events:
+            issue.apply(IssueEvent.from_dict(stored.payload))
+            issue.version = stored.version
+        logger.debug(
+            "rehydrated issue {} at version {} replaying {} events",
+            issue_number,
+            issue.version,
+            len(events),
+        )
+        return issue if issue.version > 0 else None
+
+    async def append(self, issue: Issue, events: Sequence[IssueEvent]) -> None:
+        """Record events for issue, which must still be at the version it was loaded at."""
+        if not events:
+            return
+        aggregate_id = str(issue.issue_number)
+        previous_version = issue.version
+        new_version = await self.store.append(
+            aggregate_id,
+            previous_version,
+            [
+                {
+                    "event_id": event.event_id,
+                    "event_type": event.issue_event_type.value,
+                    "payload": event.to_dict(),
+                }
+                for event in events
+            ],
+        )
+        for event in events:
+            issue.apply(event)
+        issue.version = new_version
+
+        interval = self.snapshot_interval
+        if interval and new_version // interval > previous_version // interval:
+            self.store.add_snapshot(aggregate_id, new_version, issue.snapshot())
+        self.add_events(ISSUE_AGGREGATE, issue.issue_number, events)
@@ -0,0 +1,32 @@
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterator, Mapping
+
+from app.domain.issue import IssueState
+
+# GitHub issue exports, shaped like app/domain/issue.json, either as
+# newline-delimited JSON (streamed line by line), a JSON array or a single issue object.
+# https://docs.github.com/en/rest/issues/issues?apiVersion=2022-11-28#get-an-issue
+
+
+def issue_row_from_github(payload: Mapping[str, Any]) -> Dict[str, Any]:
+    return {
+        "issue_number": int(payload["number"]),
+        "issue_state": IssueState(payload["state"].upper()),
+        "version": 0,
+    }
+
+
+def read_github_issues(path: Path) -> Iterator[Dict[str, Any]]:
+    if path.suffix in (".ndjson", ".jsonl"):
+        with path.open(encoding="utf-8") as lines:
+            for line in lines:
+                if line.strip():
+                    yield issue_row_from_github(json.loads(line))
+        return
+
+    with path.open(encoding="utf-8") as file:
+        document = json.load(file)
+    payloads = document if isinstance(document, list) else [document]
+    for payload in payloads:
+        yield issue_row_from_github(payload)
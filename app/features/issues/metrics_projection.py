@@ -0,0 +1,304 @@
+import datetime
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, Optional, Sequence, Tuple
+
+from pydantic import BaseModel
+from sqlalchemy import Column, Date, DateTime, String, cast, exists, insert
+from sqlmodel import Field, SQLModel, col, delete, select, update
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.database import get_async_sessionmaker
+from app.core.resource_adapters.outbox.models import as_utc
+from app.core.resource_adapters.persistence.sqlmodel.bulk import batched, insert_ignore_statement
+from app.core.resource_adapters.persistence.sqlmodel.event_store import Snapshot, StoredEvent
+from app.core.resource_adapters.projections import ProjectionCheckpoint, ProjectionRunner
+from app.domain.issue import Issue, IssueEvent, IssueEventType, IssueState, IssueTransitionState
+from app.features.issues.event_sourced_repository import ISSUE_AGGREGATE
+from config import Settings, get_settings
+
+# Issue metrics as in https://docs.github.com/en/issues/tracking-your-work-with-issues,
+# maintained per event instead of computed by scanning issues: counters per state and
+# close reason, and closes bucketed per day with their summed time to close, so a
+# dashboard reads a handful of counter rows plus one row per day of its window.
+# Issues written to the issue table without events, by an import or an upsert, have no
+# event to count them by: a rebuild seeds them from the table, so run rebuild-projections
+# after such writes. Until then the state counts leave them out.
+
+PROJECTION_NAME = "issue_metrics"
+# rebuilds read far larger batches than the live runner, one transaction each
+REBUILD_BATCH_SIZE = 10_000
+# metric names in issue_metric_count
+STATE, CLOSE_REASON, REOPENED = "state", "close_reason", "reopened"
+
+
+class IssueLifecycle(SQLModel, table=True):
+    """Per issue state the projection needs to turn an event into counter changes."""
+
+    __tablename__ = "issue_metrics_lifecycle"
+    __table_args__ = {"schema": get_settings().get_table_schema}
+
+    issue_number: int = Field(primary_key=True)
+    # None until an event tells the state, e.g. for issues first seen being edited
+    issue_state: Optional[IssueState] = None
+    opened_at: Optional[datetime.datetime] = Field(
+        default=None, sa_column=Column(DateTime(timezone=True), nullable=True)
+    )
+
+
+class IssueMetricCount(SQLModel, table=True):
+    __tablename__ = "issue_metrics_count"
+    __table_args__ = {"schema": get_settings().get_table_schema}
+
+    metric: str = Field(primary_key=True)
+    key: str = Field(primary_key=True)
+    value: int = 0
+
+
+class IssueCloseDaily(SQLModel, table=True):
+    """Closes per UTC day, with the summed time from open to close of those that have one."""
+
+    __tablename__ = "issue_metrics_close_daily"
+    __table_args__ = {"schema": get_settings().get_table_schema}
+
+    day: datetime.date = Field(sa_column=Column(Date, primary_key=True))
+    closed_count: int = 0
+    timed_count: int = 0
+    time_to_close_seconds: float = 0.0
+
+
+@dataclass
+class _CloseBucket:
+    closed: int = 0
+    timed: int = 0
+    seconds: float = 0.0
+
+
+class TimeToClose(BaseModel):
+    window_days: int
+    closed: int
+    mean_seconds: Optional[float]
+
+
+class IssueMetrics(BaseModel):
+    open: int
+    closed: int
+    close_reasons: Dict[str, int]
+    reopened: int
+    # reopens per close
+    reopen_rate: Optional[float]
+    time_to_close: TimeToClose
+    # event store id the metrics are up to date with
+    position: int
+
+
+class IssueMetricsProjection:
+    name = PROJECTION_NAME
+
+    async def apply(self, session: AsyncSession, events: Sequence[StoredEvent]) -> None:
+        issue_events = [
+            IssueEvent.from_dict(event.payload)
+            for event in events
+            if event.aggregate_type == ISSUE_AGGREGATE
+        ]
+        if not issue_events:
+            return
+        numbers = {event.issue_number for event in issue_events}
+        statement = select(IssueLifecycle).where(col(IssueLifecycle.issue_number).in_(numbers))
+        lifecycles = {row.issue_number: row for row in (await session.exec(statement)).all()}
+
+        counts: Counter[Tuple[str, str]] = Counter()
+        daily: Dict[datetime.date, _CloseBucket] = {}
+        for event in issue_events:
+            lifecycle = lifecycles.get(event.issue_number)
+            if lifecycle is None:
+                lifecycle = IssueLifecycle(issue_number=event.issue_number)
+                lifecycles[event.issue_number] = lifecycle
+                session.add(lifecycle)
+            self._apply(lifecycle, event, counts, daily)
+
+        await self._add_counts(session, counts)
+        await self._add_daily(session, daily)
+
+    def _apply(
+        self,
+        lifecycle: IssueLifecycle,
+        event: IssueEvent,
+        counts: Counter[Tuple[str, str]],
+        daily: Dict[datetime.date, _CloseBucket],
+    ) -> None:
+        def move_to(state: IssueState) -> None:
+            if lifecycle.issue_state is not None:
+                counts[(STATE, lifecycle.issue_state.value)] -= 1
+            counts[(STATE, state.value)] += 1
+            lifecycle.issue_state = state
+
+        match event.issue_event_type:
+            case IssueEventType.OPENED:
+                if lifecycle.opened_at is None:
+                    lifecycle.opened_at = event.timestamp
+                if lifecycle.issue_state is not IssueState.OPEN:
+                    move_to(IssueState.OPEN)
+            case IssueEventType.CLOSED if lifecycle.issue_state is not IssueState.CLOSED:
+                move_to(IssueState.CLOSED)
+                reason = event.issue_state_transition or IssueTransitionState.COMPLETED
+                counts[(CLOSE_REASON, reason.value)] += 1
+                closed_at = as_utc(event.timestamp).astimezone(datetime.timezone.utc)
+                bucket = daily.setdefault(closed_at.date(), _CloseBucket())
+                bucket.closed += 1
+                if lifecycle.opened_at is not None:
+                    bucket.timed += 1
+                    bucket.seconds += (closed_at - as_utc(lifecycle.opened_at)).total_seconds()
+            case IssueEventType.REOPENED if lifecycle.issue_state is not IssueState.OPEN:
+                move_to(IssueState.OPEN)
+                counts[(REOPENED, "")] += 1
+            case _:
+                # edits, assignees and labels do not feed any metric
+                pass
+
+    async def _add_counts(
+        self, session: AsyncSession, counts: Counter[Tuple[str, str]]
+    ) -> None:
+        changed = [(key, delta) for key, delta in counts.items() if delta]
+        if not changed:
+            return
+        connection = await session.connection()
+        await session.exec(
+            insert_ignore_statement(
+                IssueMetricCount.__table__, connection.dialect.name, ["metric", "key"]
+            ).values(
+                [{"metric": metric, "key": key, "value": 0} for (metric, key), _ in changed]
+            )
+        )
+        for (metric, key), delta in changed:
+            await session.exec(
+                update(IssueMetricCount)
+                .where(col(IssueMetricCount.metric) == metric, col(IssueMetricCount.key) == key)
+                .values(value=IssueMetricCount.value + delta)
+            )
+
+    async def _add_daily(
+        self, session: AsyncSession, daily: Dict[datetime.date, _CloseBucket]
+    ) -> None:
+        if not daily:
+            return
+        connection = await session.connection()
+        await session.exec(
+            insert_ignore_statement(
+                IssueCloseDaily.__table__, connection.dialect.name, ["day"]
+            ).values(
+                [
+                    {"day": day, "closed_count": 0, "timed_count": 0, "time_to_close_seconds": 0.0}
+                    for day in daily
+                ]
+            )
+        )
+        for day, bucket in daily.items():
+            await session.exec(
+                update(IssueCloseDaily)
+                .where(col(IssueCloseDaily.day) == day)
+                .values(
+                    closed_count=IssueCloseDaily.closed_count + bucket.closed,
+                    timed_count=IssueCloseDaily.timed_count + bucket.timed,
+                    time_to_close_seconds=IssueCloseDaily.time_to_close_seconds + bucket.seconds,
+                )
+            )
+
+    async def reset(self, session: AsyncSession) -> None:
+        for model in (IssueLifecycle, IssueMetricCount, IssueCloseDaily):
+            await session.exec(delete(model))
+        await self._seed(session)
+
+    async def _seed(self, session: AsyncSession) -> None:
+        # the state issues were in before their first event, which replaying moves them
+        # from: the version 0 snapshot of streams not starting with OPENED, and the issue
+        # row of issues without any event
+        snapshots = select(Snapshot.aggregate_id, Snapshot.state).where(
+            Snapshot.aggregate_type == ISSUE_AGGREGATE, Snapshot.version == 0
+        )
+        has_events = exists().where(
+            col(StoredEvent.aggregate_type) == ISSUE_AGGREGATE,
+            col(StoredEvent.aggregate_id) == cast(Issue.issue_number, String),
+        )
+        rows = select(Issue.issue_number, Issue.issue_state).where(~has_events)
+        lifecycles = [
+            {"issue_number": int(aggregate_id), "issue_state": IssueState(state["issue_state"])}
+            for aggregate_id, state in (await session.exec(snapshots)).all()
+        ]
+        lifecycles += [
+            {"issue_number": number, "issue_state": state}
+            for number, state in (await session.exec(rows)).all()
+        ]
+        if not lifecycles:
+            return
+        connection = await session.connection()
+        for batch in batched(lifecycles, REBUILD_BATCH_SIZE):
+            await connection.execute(insert(IssueLifecycle.__table__), batch)
+        await self._add_counts(
+            session, Counter((STATE, row["issue_state"].value) for row in lifecycles)
+        )
+
+
+async def read_issue_metrics(
+    session: AsyncSession, window_days: int, today: Optional[datetime.date] = None
+) -> IssueMetrics:
+    """The dashboard numbers: reads the counter rows and window_days daily rows."""
+    if today is None:
+        today = datetime.datetime.now(datetime.timezone.utc).date()
+    counts = {
+        (row.metric, row.key): row.value
+        for row in (await session.exec(select(IssueMetricCount))).all()
+    }
+    since = today - datetime.timedelta(days=window_days - 1)
+    days = (
+        await session.exec(select(IssueCloseDaily).where(col(IssueCloseDaily.day) >= since))
+    ).all()
+    position = (
+        await session.exec(
+            select(ProjectionCheckpoint.position).where(
+                ProjectionCheckpoint.name == PROJECTION_NAME
+            )
+        )
+    ).first()
+
+    close_reasons = {
+        key: value for (metric, key), value in counts.items() if metric == CLOSE_REASON
+    }
+    closes = sum(close_reasons.values())
+    reopened = counts.get((REOPENED, ""), 0)
+    timed = sum(day.timed_count for day in days)
+    return IssueMetrics(
+        open=counts.get((STATE, IssueState.OPEN.value), 0),
+        closed=counts.get((STATE, IssueState.CLOSED.value), 0),
+        close_reasons=close_reasons,
+        reopened=reopened,
+        reopen_rate=reopened / closes if closes else None,
+        time_to_close=TimeToClose(
+            window_days=window_days,
+            closed=sum(day.closed_count for day in days),
+            mean_seconds=(
+                sum(day.time_to_close_seconds for day in days) / timed if timed else None
+            ),
+        ),
+        position=position or 0,
+    )
+
+
+_issue_metrics_runner: Optional[ProjectionRunner] = None
+
+
+def get_issue_metrics_runner(settings: Settings) -> Optional[ProjectionRunner]:
+    """The process wide issue metrics projection runner, or None when it is disabled."""
+    global _issue_metrics_runner
+
+    if not settings.projections_enabled:
+        return None
+    if _issue_metrics_runner is None:
+        _issue_metrics_runner = ProjectionRunner(
+            session_factory=get_async_sessionmaker(settings),
+            projection=IssueMetricsProjection(),
+            batch_size=settings.projection_batch_size,
+            poll_interval_seconds=settings.projection_poll_interval_seconds,
+            gap_timeout_seconds=settings.projection_gap_timeout_seconds,
+        )
+    return _issue_metrics_runner
@@ -1,24 +1,140 @@
-from typing import Callable, Iterable, List, Protocol, Union
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Protocol,
+    Sequence,
+    Tuple,
+    Union,
+)
 
 from loguru import logger
-from sqlalchemy.sql.elements import BinaryExpression, BooleanClauseList, ClauseElement
-from sqlmodel import Session, select
+from sqlalchemy import String, cast
+from sqlalchemy.sql.elements import ClauseElement, ColumnElement
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.sql.dml import Update
+from sqlmodel import Session, col, delete, select, update
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from app.core.exceptions import AppException, ConflictException, NotFoundException
+from app.core.specification import Specification
 from app.domain.issue import Issue
+from app.core.resource_adapters.persistence.sqlmodel.bulk import (
+    batched,
+    copy_upsert,
+    copy_upsert_async,
+    supports_copy,
+    upsert_statement,
+)
 from app.core.resource_adapters.persistence.sqlmodel.unit_of_work import SQLModelUnitOfWork, AsyncSQLModelUnitOfWork
 
+# keeps each IN (...) list well below driver bind-parameter limits (sqlite: 32766, asyncpg: 32767)
+GET_MANY_CHUNK_SIZE = 1000
+# rows buffered per server-side cursor fetch when streaming
+STREAM_CHUNK_SIZE = 1000
+UPSERT_BATCH_SIZE = 5000
+# Postgres batches at least this large are loaded with COPY instead of a multi-row INSERT
+COPY_MIN_ROWS = 1000
+_ISSUE_KEY = ["issue_number"]
+# (issue_number, issue_state name, version), as stream_columns yields them
+IssueColumnRow = Tuple[int, str, int]
+_ISSUE_COLUMNS = (Issue.issue_number, cast(Issue.issue_state, String), Issue.version)
+
+
+def _chunked(ids: Iterable[int], chunk_size: int) -> Iterable[List[int]]:
+    # dict.fromkeys drops duplicate ids while preserving request order
+    unique_ids = list(dict.fromkeys(ids))
+    for start in range(0, len(unique_ids), chunk_size):
+        yield unique_ids[start : start + chunk_size]
+
+
+def _issue_row(issue: Union[Issue, Mapping[str, Any]]) -> Dict[str, Any]:
+    if isinstance(issue, Issue):
+        return {
+            "issue_number": issue.issue_number,
+            "issue_state": issue.issue_state,
+            "version": issue.version,
+        }
+    return dict(issue)
+
+
+def _update_statement(entity: Issue) -> Update:
+    # compare-and-set on version: if another writer got there first no row matches
+    return (
+        update(Issue)
+        .where(
+            col(Issue.issue_number) == entity.issue_number,
+            col(Issue.version) == entity.version,
+        )
+        .values(issue_state=entity.issue_state, version=entity.version + 1)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _mark_updated(entity: Issue) -> None:
+    # sync the instance without leaving it dirty, so an attached one is not flushed again on commit
+    set_committed_value(entity, "issue_state", entity.issue_state)
+    set_committed_value(entity, "version", entity.version + 1)
+
+
+def _update_failure(entity: Issue, current_version: Optional[int]) -> AppException:
+    if current_version is None:
+        return NotFoundException(
+            message="Issue not found",
+            detail=f"Issue with number {entity.issue_number} does not exist",
+        )
+    return ConflictException(
+        message="Issue was modified concurrently",
+        detail=(
+            f"Issue {entity.issue_number} is at version {current_version}, "
+            f"update expected version {entity.version}"
+        ),
+    )
+
+
+def _remove_failure(entity: Issue) -> AppException:
+    return NotFoundException(
+        message="Issue not found",
+        detail=f"Issue with number {entity.issue_number} does not exist",
+    )
+
 
 class IssueRepository(Protocol):
     # or get
     def get_by_id(self, id: int) -> Issue:
         ...
 
+    def get_many(self, ids: Iterable[int]) -> Dict[int, Issue]:
+        # missing ids are simply absent from the returned mapping
+        ...
+
+    def get_version(self, id: int) -> Optional[int]:
+        # the current version alone, None when the issue does not exist
+        ...
+
     # or get_all
     def list(self) -> Iterable[Issue]:
         # return []
         ...
 
+    def list_page(self, after: Optional[int], limit: int) -> Iterable[Issue]:
+        # keyset pagination: issues ordered by issue_number, strictly after the cursor
+        ...
+
+    def stream(self) -> Iterable[Issue]:
+        # all issues ordered by issue_number, fetched in chunks from a server-side cursor
+        ...
+
+    def stream_columns(self, chunk_size: int) -> Iterable[Sequence[IssueColumnRow]]:
+        # like stream(), but chunks of plain column tuples: no Issue objects are built
+        ...
+
     def list_with_predicate(self, predicate: Callable[[Issue], bool]) -> Iterable[Issue]:
         # for item in self.list():
         #    if predicate(item):
@@ -32,6 +148,10 @@ class IssueRepository(Protocol):
     def update(self, entity: Issue) -> None:
         ...
 
+    def upsert_many(self, issues: Iterable[Union[Issue, Mapping[str, Any]]]) -> int:
+        # insert or update in bulk, bypassing the session's identity map
+        ...
+
     def remove(self, entity: Issue) -> None:
         ...
 
@@ -41,56 +161,116 @@ class SQLModelIssueRepository(SQLModelUnitOfWork, IssueRepository):
         super().__init__(session)
 
     def get_by_id(self, id: int) -> Issue:
-        logger.info(f"getting issue by id: {id}")
+        logger.info("getting issue by id: {}", id)
         statement = select(Issue).where(Issue.issue_number == id)
         result = self.session.exec(statement).first()
         if not result:
             return Issue(issue_number=0, version=0)
         return result
 
+    def get_version(self, id: int) -> Optional[int]:
+        statement = select(Issue.version).where(Issue.issue_number == id)
+        return self.session.exec(statement).first()
+
+    def get_many(
+        self, ids: Iterable[int], chunk_size: int = GET_MANY_CHUNK_SIZE
+    ) -> Dict[int, Issue]:
+        found: Dict[int, Issue] = {}
+        for chunk in _chunked(ids, chunk_size):
+            logger.info("getting {} issues by id", len(chunk))
+            statement = select(Issue).where(col(Issue.issue_number).in_(chunk))
+            for issue in self.session.exec(statement):
+                found[issue.issue_number] = issue
+        return found
+
     def list(self) -> List[Issue]:
         statement = select(Issue)
         results = self.session.exec(statement).all()
         return results
 
+    def list_page(self, after: Optional[int], limit: int) -> List[Issue]:
+        statement = select(Issue).order_by(Issue.issue_number).limit(limit)
+        if after is not None:
+            statement = statement.where(Issue.issue_number > after)
+        return self.session.exec(statement).all()
+
+    def stream(self, chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[Issue]:
+        statement = (
+            select(Issue)
+            .order_by(Issue.issue_number)
+            .execution_options(yield_per=chunk_size)
+        )
+        yield from self.session.exec(statement)
+
+    def stream_columns(
+        self, chunk_size: int = STREAM_CHUNK_SIZE
+    ) -> Iterator[Sequence[IssueColumnRow]]:
+        statement = (
+            select(*_ISSUE_COLUMNS)
+            .order_by(Issue.issue_number)
+            .execution_options(yield_per=chunk_size)
+        )
+        yield from self.session.exec(statement).partitions(chunk_size)
+
     def list_with_predicate(
-        self, predicate: Union[Callable[[Issue], bool], ClauseElement]
+        self, predicate: Union[Specification, Callable[[Issue], bool], ClauseElement]
     ) -> List[Issue]:
-        if isinstance(predicate, (BinaryExpression, BooleanClauseList)):
+        if isinstance(predicate, Specification):
+            # Specifications compile to SQL so the database can use its indexes
+            # open_issues = repo.list_with_predicate(issue_in_state(IssueState.OPEN))
+            predicate = predicate.to_clause(Issue)
+        if isinstance(predicate, ColumnElement):
             # If we're passed a SQLModel/SQLAlchemy filter condition, use it directly
             # open_issues = repo.list_with_predicate(Issue.issue_state == IssueState.OPEN)
             statement = select(Issue).where(predicate)
             return self.session.exec(statement).all()
         else:
-            # Fall back to in-memory filtering for complex predicates that can't be expressed in SQL
+            # Fall back to in-memory filtering for complex predicates that can't be expressed in SQL,
+            # streaming rows in chunks so only the matches are held in memory
             # open_issues = repository.list_with_predicate(lambda issue: issue.issue_state == IssueState.OPEN)
-            all_issues = self.list()
-            return [issue for issue in all_issues if predicate(issue)]
+            return [issue for issue in self.stream() if predicate(issue)]
 
     def add(self, entity: Issue) -> None:
-        logger.info(f"adding issue: {entity.issue_number}")
+        logger.info("adding issue: {}", entity.issue_number)
         self.session.add(entity)
 
+    def upsert_many(
+        self,
+        issues: Iterable[Union[Issue, Mapping[str, Any]]],
+        batch_size: int = UPSERT_BATCH_SIZE,
+        copy_min_rows: int = COPY_MIN_ROWS,
+    ) -> int:
+        connection = self.session.connection()
+        table = Issue.__table__
+        statement = upsert_statement(table, connection.dialect.name, _ISSUE_KEY)
+        use_copy = supports_copy(connection)
+        count = 0
+        for batch in batched(map(_issue_row, issues), batch_size):
+            if use_copy and len(batch) >= copy_min_rows:
+                copy_upsert(connection, table, batch, _ISSUE_KEY)
+            else:
+                connection.execute(statement, batch)
+            count += len(batch)
+        logger.info("upserted {} issues", count)
+        return count
+
     def update(self, entity: Issue) -> None:
-        logger.info(f"updating issue: {entity}")
-        # Use the raw issue number to avoid detached instance issues
-        issue_number = entity.issue_number
-        statement = select(Issue).where(Issue.issue_number == issue_number)
-        existing = self.session.exec(statement).first()
-        if existing:
-            # Update fields from the detached entity
-            existing.issue_state = entity.issue_state
-            existing.version = entity.version
-            self.session.add(existing)
+        logger.info("updating issue: {}", entity.issue_number)
+        # no autoflush: a modified attached entity would otherwise be written twice
+        with self.session.no_autoflush:
+            result = self.session.exec(_update_statement(entity))
+        if result.rowcount == 0:
+            # only the failure path pays for a second query, to tell missing from stale
+            statement = select(Issue.version).where(Issue.issue_number == entity.issue_number)
+            raise _update_failure(entity, self.session.exec(statement).first())
+        _mark_updated(entity)
 
     def remove(self, entity: Issue) -> None:
-        logger.info(f"removing issue: {entity}")
-        # Use the raw issue number to avoid detached instance issues
-        issue_number = entity.issue_number
-        statement = select(Issue).where(Issue.issue_number == issue_number)
-        existing = self.session.exec(statement).first()
-        if existing:
-            self.session.delete(existing)
+        logger.info("removing issue: {}", entity.issue_number)
+        statement = delete(Issue).where(col(Issue.issue_number) == entity.issue_number)
+        result = self.session.exec(statement)
+        if result.rowcount == 0:
+            raise _remove_failure(entity)
 
 
 class AsyncSQLModelIssueRepository(AsyncSQLModelUnitOfWork, IssueRepository):
@@ -98,7 +278,7 @@ class AsyncSQLModelIssueRepository(AsyncSQLModelUnitOfWork, IssueRepository):
         super().__init__(session)
 
     async def get_by_id(self, id: int) -> Issue:
-        logger.info(f"getting issue by id: {id}")
+        logger.info("getting issue by id: {}", id)
         statement = select(Issue).where(Issue.issue_number == id)
         result = await self.session.exec(statement)
         issue = result.first()
@@ -106,41 +286,101 @@ class AsyncSQLModelIssueRepository(AsyncSQLModelUnitOfWork, IssueRepository):
             return Issue(issue_number=0, version=0)
         return issue
 
+    async def get_version(self, id: int) -> Optional[int]:
+        statement = select(Issue.version).where(Issue.issue_number == id)
+        return (await self.session.exec(statement)).first()
+
+    async def get_many(
+        self, ids: Iterable[int], chunk_size: int = GET_MANY_CHUNK_SIZE
+    ) -> Dict[int, Issue]:
+        found: Dict[int, Issue] = {}
+        for chunk in _chunked(ids, chunk_size):
+            logger.info("getting {} issues by id", len(chunk))
+            statement = select(Issue).where(col(Issue.issue_number).in_(chunk))
+            result = await self.session.exec(statement)
+            for issue in result:
+                found[issue.issue_number] = issue
+        return found
+
     async def list(self) -> List[Issue]:
         statement = select(Issue)
         result = await self.session.exec(statement)
         return result.all()
 
+    async def list_page(self, after: Optional[int], limit: int) -> List[Issue]:
+        statement = select(Issue).order_by(Issue.issue_number).limit(limit)
+        if after is not None:
+            statement = statement.where(Issue.issue_number > after)
+        result = await self.session.exec(statement)
+        return result.all()
+
+    async def stream(self, chunk_size: int = STREAM_CHUNK_SIZE) -> AsyncIterator[Issue]:
+        statement = (
+            select(Issue)
+            .order_by(Issue.issue_number)
+            .execution_options(yield_per=chunk_size)
+        )
+        result = await self.session.stream_scalars(statement)
+        async for issue in result:
+            yield issue
+
+    async def stream_columns(
+        self, chunk_size: int = STREAM_CHUNK_SIZE
+    ) -> AsyncIterator[Sequence[IssueColumnRow]]:
+        statement = select(*_ISSUE_COLUMNS).order_by(Issue.issue_number)
+        # Core rows straight off the session's connection skip the ORM result layer
+        connection = await self.session.connection()
+        result = await connection.stream(statement)
+        async for chunk in result.partitions(chunk_size):
+            yield chunk
+
     async def list_with_predicate(
-        self, predicate: Union[Callable[[Issue], bool], ClauseElement]
+        self, predicate: Union[Specification, Callable[[Issue], bool], ClauseElement]
     ) -> List[Issue]:
-        if isinstance(predicate, (BinaryExpression, BooleanClauseList)):
+        if isinstance(predicate, Specification):
+            predicate = predicate.to_clause(Issue)
+        if isinstance(predicate, ColumnElement):
             statement = select(Issue).where(predicate)
             result = await self.session.exec(statement)
             return result.all()
-        all_issues = await self.list()
-        return [issue for issue in all_issues if predicate(issue)]
+        return [issue async for issue in self.stream() if predicate(issue)]
 
     async def add(self, entity: Issue) -> None:
-        logger.info(f"adding issue: {entity.issue_number}")
+        logger.info("adding issue: {}", entity.issue_number)
         self.session.add(entity)
 
+    async def upsert_many(
+        self,
+        issues: Iterable[Union[Issue, Mapping[str, Any]]],
+        batch_size: int = UPSERT_BATCH_SIZE,
+        copy_min_rows: int = COPY_MIN_ROWS,
+    ) -> int:
+        connection = await self.session.connection()
+        table = Issue.__table__
+        statement = upsert_statement(table, connection.dialect.name, _ISSUE_KEY)
+        use_copy = supports_copy(connection)
+        count = 0
+        for batch in batched(map(_issue_row, issues), batch_size):
+            if use_copy and len(batch) >= copy_min_rows:
+                await copy_upsert_async(connection, table, batch, _ISSUE_KEY)
+            else:
+                await connection.execute(statement, batch)
+            count += len(batch)
+        logger.info("upserted {} issues", count)
+        return count
+
     async def update(self, entity: Issue) -> None:
-        logger.info(f"updating issue: {entity}")
-        issue_number = entity.issue_number
-        statement = select(Issue).where(Issue.issue_number == issue_number)
-        result = await self.session.exec(statement)
-        existing = result.first()
-        if existing:
-            existing.issue_state = entity.issue_state
-            existing.version = entity.version
-            self.session.add(existing)
+        logger.info("updating issue: {}", entity.issue_number)
+        with self.session.no_autoflush:
+            result = await self.session.exec(_update_statement(entity))
+        if result.rowcount == 0:
+            statement = select(Issue.version).where(Issue.issue_number == entity.issue_number)
+            raise _update_failure(entity, (await self.session.exec(statement)).first())
+        _mark_updated(entity)
 
     async def remove(self, entity: Issue) -> None:
-        logger.info(f"removing issue: {entity}")
-        issue_number = entity.issue_number
-        statement = select(Issue).where(Issue.issue_number == issue_number)
+        logger.info("removing issue: {}", entity.issue_number)
+        statement = delete(Issue).where(col(Issue.issue_number) == entity.issue_number)
         result = await self.session.exec(statement)
-        existing = result.first()
-        if existing:
-            self.session.delete(existing)
+        if result.rowcount == 0:
+            raise _remove_failure(entity)
@@ -1,25 +1,185 @@
-from typing import Annotated
+from typing import Annotated, AsyncIterator, List, Optional
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Header, Query, Response
+from fastapi.responses import StreamingResponse
 from loguru import logger
-from app.core.database import AsyncSessionDep
-from app.features.issues.repository import AsyncSQLModelIssueRepository
-from app.features.issues.analyze_issue_async import AsyncAnalyzeIssue
+from pydantic import BaseModel, Field
+from app.core.conditional import CACHE_CONTROL, etag_matches, not_modified, version_etag
+from app.core.database import AsyncSessionDep, get_async_sessionmaker
+from app.core.exceptions import NotFoundException, UnsupportedOperationException
+from app.core.pagination import decode_cursor, encode_cursor
+from app.features.issues.caching_repository import (
+    CachingIssueRepository,
+    get_issue_cache,
+    get_missing_issue_cache,
+)
+from app.core.resource_adapters.persistence.sqlmodel.event_store import EventStore
+from app.features.issues.analytics import IssueAnalytics, analyze_issues, get_analytics_cache
+from app.features.issues.event_sourced_repository import ISSUE_AGGREGATE
+from app.features.issues.metrics_projection import IssueMetrics, read_issue_metrics
+from app.features.issues.repository import AsyncSQLModelIssueRepository, IssueRepository
+from app.features.issues.analyze_issue_async import (
+    AsyncAnalyzeIssue,
+    AsyncBatchAnalyzeIssue,
+    BatchAnalyzeItem,
+)
 from app.domain.issue import Issue
+from config import Settings, get_settings
 
 router = APIRouter()
 
+MAX_BATCH_SIZE = 10_000
+MAX_PAGE_SIZE = 1000
+MAX_METRICS_WINDOW_DAYS = 366
+# rows serialized per NDJSON write when streaming
+STREAM_WRITE_ROWS = 100
 
-async def get_repository(session: AsyncSessionDep) -> AsyncSQLModelIssueRepository:
-    async with AsyncSQLModelIssueRepository(session) as repo:
+
+class BatchAnalyzeRequest(BaseModel):
+    issue_numbers: List[int] = Field(..., min_length=1, max_length=MAX_BATCH_SIZE)
+
+
+class BatchAnalyzeResponse(BaseModel):
+    results: List[BatchAnalyzeItem]
+
+
+class IssuePage(BaseModel):
+    items: List[Issue]
+    next_cursor: Optional[str] = None
+
+
+async def get_repository(
+    session: AsyncSessionDep,
+    settings: Annotated[Settings, Depends(get_settings)],
+) -> IssueRepository:
+    repo: IssueRepository = AsyncSQLModelIssueRepository(session)
+    cache = get_issue_cache(settings)
+    missing_cache = get_missing_issue_cache(settings)
+    if cache is not None or missing_cache is not None:
+        repo = CachingIssueRepository(repo, cache, missing_cache)
+    async with repo:
         yield repo
 
 
+async def _stream_issues_ndjson(settings: Settings) -> AsyncIterator[str]:
+    # the response body outlives the request-scoped session, so the stream owns its own
+    async with get_async_sessionmaker(settings)() as session:
+        repo = AsyncSQLModelIssueRepository(session)
+        lines: List[str] = []
+        async for issue in repo.stream():
+            lines.append(issue.model_dump_json())
+            if len(lines) >= STREAM_WRITE_ROWS:
+                yield "\n".join(lines) + "\n"
+                lines = []
+        if lines:
+            yield "\n".join(lines) + "\n"
+
+
+@router.get("/issues", response_model=IssuePage)
+async def list_issues(
+    repo: Annotated[IssueRepository, Depends(get_repository)],
+    settings: Annotated[Settings, Depends(get_settings)],
+    limit: Annotated[int, Query(ge=1, le=MAX_PAGE_SIZE)] = 100,
+    cursor: Optional[str] = None,
+    stream: bool = False,
+) -> IssuePage | StreamingResponse:
+    if stream:
+        logger.info("streaming all issues")
+        return StreamingResponse(
+            _stream_issues_ndjson(settings), media_type="application/x-ndjson"
+        )
+
+    after = decode_cursor(cursor) if cursor else None
+    logger.info("listing issues after: {}", after)
+    # one extra row tells us whether another page exists
+    issues = await repo.list_page(after, limit + 1)
+    next_cursor = None
+    if len(issues) > limit:
+        issues = issues[:limit]
+        next_cursor = encode_cursor(issues[-1].issue_number)
+    return IssuePage(items=issues, next_cursor=next_cursor)
+
+
+@router.get("/issues/metrics", response_model=IssueMetrics)
+async def issue_metrics(
+    session: AsyncSessionDep,
+    settings: Annotated[Settings, Depends(get_settings)],
+    window_days: Annotated[int, Query(ge=1, le=MAX_METRICS_WINDOW_DAYS)] = 30,
+) -> IssueMetrics:
+    # served from the projection's read model, as current as its checkpoint; without a
+    # runner nothing maintains it and it would report zeros
+    if not settings.projections_enabled:
+        raise UnsupportedOperationException(
+            message="Issue metrics disabled",
+            detail="Set APP_PROJECTIONS_ENABLED to maintain the issue metrics",
+        )
+    return await read_issue_metrics(session, window_days)
+
+
+@router.get("/issues/analytics", response_model=IssueAnalytics)
+async def issue_analytics(
+    session: AsyncSessionDep,
+    repo: Annotated[IssueRepository, Depends(get_repository)],
+    settings: Annotated[Settings, Depends(get_settings)],
+) -> IssueAnalytics:
+    # computed from every issue and event, unlike the projected /issues/metrics, and
+    # reused for analytics_cache_ttl_seconds
+    return await analyze_issues(
+        repo,
+        EventStore(session, ISSUE_AGGREGATE),
+        settings.analytics_chunk_size,
+        get_analytics_cache(settings),
+    )
+
+
+@router.get(
+    "/issues/{issue_number}",
+    response_model=Issue,
+    responses={304: {"description": "The issue still has the version in If-None-Match"}},
+)
+async def get_issue(
+    issue_number: int,
+    response: Response,
+    repo: Annotated[IssueRepository, Depends(get_repository)],
+    if_none_match: Annotated[Optional[str], Header()] = None,
+) -> Issue | Response:
+    # literal /issues/... GET routes must be declared above this one, the int path
+    # parameter would otherwise reject them with a 422
+    if if_none_match:
+        # revalidation only needs the version, not the row or a serialized body
+        version = await repo.get_version(issue_number)
+        if version is not None:
+            etag = version_etag("issue", issue_number, version)
+            if etag_matches(if_none_match, etag):
+                logger.debug("issue not modified: {}", issue_number)
+                return not_modified(etag)
+
+    issue = await repo.get_by_id(issue_number)
+    if issue.issue_number == 0:
+        raise NotFoundException(
+            message="Issue not found",
+            detail=f"Issue with number {issue_number} does not exist",
+        )
+    response.headers["ETag"] = version_etag("issue", issue.issue_number, issue.version)
+    response.headers["Cache-Control"] = CACHE_CONTROL
+    return issue
+
+
+@router.post("/issues/analyze:batch", response_model=BatchAnalyzeResponse)
+async def analyze_issues_batch(
+    request: BatchAnalyzeRequest,
+    repo: Annotated[IssueRepository, Depends(get_repository)],
+) -> BatchAnalyzeResponse:
+    logger.info("analyzing batch of {} issues", len(request.issue_numbers))
+    use_case = AsyncBatchAnalyzeIssue(issue_numbers=request.issue_numbers, repo=repo)
+    return BatchAnalyzeResponse(results=await use_case.analyze())
+
+
 @router.post("/issues/{issue_number}/analyze", response_model=Issue)
 async def analyze_issue(
     issue_number: int,
-    repo: Annotated[AsyncSQLModelIssueRepository, Depends(get_repository)],
+    repo: Annotated[IssueRepository, Depends(get_repository)],
 ) -> Issue:
-    logger.info(f"analyzing issue: {issue_number}")
+    logger.info("analyzing issue: {}", issue_number)
     use_case = AsyncAnalyzeIssue(issue_number=issue_number, repo=repo)
     return await use_case.analyze()
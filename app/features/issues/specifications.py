@@ -0,0 +1,25 @@
+from typing import Iterable, Optional
+
+from app.core.specification import Eq, In, Range, Specification
+from app.domain.issue import IssueState
+
+# Issue specifications for repository.list_with_predicate, compiled to SQL where possible:
+#   repo.list_with_predicate(issue_in_state(IssueState.OPEN) & issue_number_between(1, 100))
+
+
+def issue_in_state(state: IssueState) -> Specification:
+    return Eq("issue_state", state)
+
+
+def issue_is_open() -> Specification:
+    return issue_in_state(IssueState.OPEN)
+
+
+def issue_numbers_in(issue_numbers: Iterable[int]) -> Specification:
+    return In("issue_number", issue_numbers)
+
+
+def issue_number_between(
+    first: Optional[int] = None, last: Optional[int] = None
+) -> Specification:
+    return Range("issue_number", gte=first, lte=last)
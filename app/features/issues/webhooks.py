@@ -0,0 +1,293 @@
+import datetime
+import hashlib
+import hmac
+import json
+from typing import Annotated, Any, Callable, Dict, Optional, Sequence
+
+from fastapi import APIRouter, Depends, Request, Response
+from loguru import logger
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.database import get_async_sessionmaker
+from app.core.exceptions import (
+    BadRequestException,
+    UnauthorizedException,
+    UnsupportedOperationException,
+)
+from app.core.interface_adapters.inbox import Inbox, InboxEvent, InboxHandler
+from app.domain.issue import (
+    Issue,
+    IssueEvent,
+    IssueEventType,
+    IssueState,
+    IssueTransitionState,
+)
+from app.features.issues.caching_repository import invalidate_cached_issues
+from app.features.issues.event_sourced_repository import EventSourcedIssueRepository
+from app.features.issues.github_import import issue_row_from_github
+from app.features.issues.repository import AsyncSQLModelIssueRepository
+from config import Settings, get_settings
+
+# GitHub issue events, either webhook deliveries (IssuesEvent: "action" plus the issue)
+# or issue event objects as in app/domain/issue_event.json ("id", "event", "created_at").
+# https://docs.github.com/en/webhooks/webhook-events-and-payloads#issues
+# https://docs.github.com/en/webhooks/using-webhooks/validating-webhook-deliveries
+
+router = APIRouter()
+
+# GitHub event names ("event" of issue events, "action" of webhooks) the issue records;
+# others, e.g. milestoned or locked, are acknowledged and dropped
+_EVENT_TYPES = {
+    "opened": IssueEventType.OPENED,
+    "edited": IssueEventType.EDITED,
+    "renamed": IssueEventType.EDITED,
+    "closed": IssueEventType.CLOSED,
+    "reopened": IssueEventType.REOPENED,
+    "assigned": IssueEventType.ASSIGNED,
+    "unassigned": IssueEventType.UNASSIGNED,
+    "labeled": IssueEventType.LABLED,
+    "unlabeled": IssueEventType.UNLABLED,
+}
+_CLOSE_REASONS = {
+    "completed": IssueTransitionState.COMPLETED,
+    "not_planned": IssueTransitionState.NOT_PLANNED,
+}
+
+_issue_inbox: Inbox | None = None
+
+
+def _baseline(github_issue: Dict[str, Any], row: Optional[Issue]) -> Issue:
+    # the state an issue's first recorded events start from: its issue table row when it
+    # was imported before any event arrived, otherwise the issue as the event carries it
+    if row is None:
+        state = issue_row_from_github(github_issue)["issue_state"]
+    else:
+        state = row.issue_state
+    return Issue.restore(
+        int(github_issue["number"]),
+        0,
+        {
+            "issue_state": state.value,
+            "title": github_issue.get("title") or "",
+            "body": github_issue.get("body") or "",
+            "assignees": [user["login"] for user in github_issue.get("assignees") or []],
+            "labels": [label["name"] for label in github_issue.get("labels") or []],
+        },
+    )
+
+
+def issue_event_from_github(issue: Issue, event: InboxEvent) -> Optional[IssueEvent]:
+    """The IssueEvent a GitHub event records for issue as it is now, None if not tracked."""
+    event_type = _EVENT_TYPES.get(event.event_type)
+    if event_type is None:
+        return None
+    payload = json.loads(event.payload)
+    github_issue = payload.get("issue") or {}
+    state = issue.issue_state
+    transition: Optional[IssueTransitionState] = None
+    changes: Dict[str, Any] = {}
+    match event_type:
+        case IssueEventType.OPENED:
+            state = IssueState.OPEN
+            changes = {
+                "title": github_issue.get("title") or "",
+                "body": github_issue.get("body") or "",
+            }
+        case IssueEventType.EDITED if payload.get("rename"):
+            changes = {"title": payload["rename"]["to"]}
+        case IssueEventType.EDITED:
+            # webhooks name the edited fields in changes, with their previous values
+            changes = {
+                field: github_issue.get(field) or ""
+                for field in payload.get("changes") or {}
+                if field in ("title", "body")
+            }
+        case IssueEventType.CLOSED:
+            state = IssueState.CLOSED
+            transition = _CLOSE_REASONS.get(
+                github_issue.get("state_reason"), IssueTransitionState.COMPLETED
+            )
+        case IssueEventType.REOPENED:
+            state = IssueState.OPEN
+            transition = IssueTransitionState.REOPENED
+    return IssueEvent(
+        event_id=event.event_id,
+        timestamp=event.occurred_at,
+        issue_number=issue.issue_number,
+        issue_state=state,
+        issue_state_transition=transition,
+        issue_event_type=event_type,
+        changes=changes,
+        previous_title=issue.title,
+        previous_body=issue.body,
+        assignee=(payload.get("assignee") or {}).get("login"),
+        label=(payload.get("label") or {}).get("name"),
+    )
+
+
+class GithubIssueEventHandler(InboxHandler):
+    """
+    Records GitHub issue events in the issue's event stream and mirrors its state in the
+    issue table, in the inbox's transaction.
+
+    Events go through EventSourcedIssueRepository.append, so they are snapshotted and
+    staged in the outbox like any other, and a concurrent append conflicts and is retried
+    by the processor. The issue row is created or updated with its version check in the
+    same transaction, so the stream and the table cannot drift. Unless its first event
+    opens it, an issue's stream starts with a version 0 snapshot of the state the events
+    apply to: its row for issues imported before any event arrived, otherwise the issue
+    as the first event carries it.
+    """
+
+    async def handle(
+        self, session: AsyncSession, aggregate_id: str, events: Sequence[InboxEvent]
+    ) -> None:
+        issue_number = int(aggregate_id)
+        repo = EventSourcedIssueRepository(session)
+        row: Optional[Issue] = await AsyncSQLModelIssueRepository(session).get_by_id(
+            issue_number
+        )
+        if row is not None and row.issue_number == 0:
+            row = None
+        issue = await repo.get(issue_number)
+        baseline = None
+        if issue is None:
+            issue = _baseline(json.loads(events[0].payload)["issue"], row)
+            baseline = issue.snapshot()
+
+        draft = Issue.restore(issue_number, issue.version, issue.snapshot())
+        issue_events = []
+        for event in events:
+            issue_event = issue_event_from_github(draft, event)
+            if issue_event is None:
+                logger.debug("inbox ignored {} event {}", event.event_type, event.event_id)
+                continue
+            draft.apply(issue_event)
+            issue_events.append(issue_event)
+        await repo.append(issue, issue_events)
+        opened = issue_events and issue_events[0].issue_event_type is IssueEventType.OPENED
+        if baseline is not None and issue_events and not opened:
+            repo.store.add_snapshot(aggregate_id, 0, baseline)
+
+        if row is None:
+            session.add(Issue(issue_number=issue_number, issue_state=issue.issue_state))
+        elif row.issue_state != issue.issue_state:
+            # flushed on commit with the version check of an attached aggregate
+            row.issue_state = issue.issue_state
+
+
+def issue_cache_invalidator(settings: Settings) -> Callable[[str, Sequence[InboxEvent]], None]:
+    """
+    Inbox hook dropping applied issues from the read-through caches.
+
+    The handler writes issues directly, so without it an issue that 404'd before its
+    opened event stays missing, and a closed one stays open, until their entries expire.
+    Other worker processes keep their own caches and still wait for the TTLs.
+    """
+
+    def invalidate(aggregate_id: str, events: Sequence[InboxEvent]) -> None:
+        invalidate_cached_issues([int(aggregate_id)], settings)
+
+    return invalidate
+
+
+def get_issue_inbox(settings: Settings) -> Inbox | None:
+    """The per-process inbox for GitHub issue events, None when it is disabled."""
+    global _issue_inbox
+
+    if not settings.inbox_enabled:
+        return None
+    if _issue_inbox is None:
+        _issue_inbox = Inbox(
+            get_async_sessionmaker(settings),
+            GithubIssueEventHandler(),
+            workers=settings.inbox_workers,
+            max_batch=settings.inbox_max_batch,
+            max_delay_seconds=settings.inbox_max_delay_seconds,
+            process_batch_size=settings.inbox_process_batch_size,
+            sweep_interval_seconds=settings.inbox_sweep_interval_seconds,
+            max_attempts=settings.inbox_max_attempts,
+            on_applied=issue_cache_invalidator(settings),
+        )
+    return _issue_inbox
+
+
+def inbox_dependency(
+    settings: Annotated[Settings, Depends(get_settings)],
+) -> Inbox | None:
+    return get_issue_inbox(settings)
+
+
+def _verify_signature(secret: str, body: bytes, signature: Optional[str]) -> None:
+    expected = "sha256=" + hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+    if signature is None or not hmac.compare_digest(signature, expected):
+        raise UnauthorizedException(
+            message="Invalid signature",
+            detail="X-Hub-Signature-256 does not match the request body",
+        )
+
+
+def _occurred_at(payload: Dict[str, Any]) -> datetime.datetime:
+    issue = payload.get("issue") or {}
+    moment = payload.get("created_at") or issue.get("updated_at")
+    if not moment:
+        return datetime.datetime.now(datetime.timezone.utc)
+    return datetime.datetime.fromisoformat(moment)
+
+
+def github_inbox_event(
+    body: bytes, delivery_id: Optional[str], event_name: Optional[str]
+) -> Dict[str, Any]:
+    """The inbox row for a GitHub delivery; only the fields needed to route it are read."""
+    try:
+        payload = json.loads(body)
+        issue_number = int(payload["issue"]["number"])
+        event_id = payload.get("id")
+        if event_id is None:
+            event_id = delivery_id
+        event_type = payload.get("event") or payload.get("action") or event_name
+        occurred_at = _occurred_at(payload)
+    except (ValueError, KeyError, TypeError) as err:
+        raise BadRequestException(
+            message="Invalid event", detail=f"Not a GitHub issue event: {err}"
+        ) from err
+    if event_id in (None, "") or not event_type:
+        raise BadRequestException(
+            message="Invalid event", detail="The event has no id or no event type"
+        )
+    if issue_number < 1:
+        # 0 is the repositories' not-found marker, GitHub numbers issues from 1
+        raise BadRequestException(
+            message="Invalid event", detail=f"Invalid issue number {issue_number}"
+        )
+    return {
+        "event_id": str(event_id),
+        "event_type": str(event_type),
+        "aggregate_id": str(issue_number),
+        "payload": body.decode("utf-8"),
+        "occurred_at": occurred_at,
+    }
+
+
+@router.post("/inbox/github", status_code=202, response_class=Response)
+async def receive_github_issue_event(
+    request: Request,
+    inbox: Annotated[Inbox | None, Depends(inbox_dependency)],
+    settings: Annotated[Settings, Depends(get_settings)],
+) -> Response:
+    # stored as received and applied by the inbox workers, duplicates are acknowledged too
+    if inbox is None:
+        raise UnsupportedOperationException(
+            message="Inbox disabled", detail="Set APP_INBOX_ENABLED to receive events"
+        )
+    body = await request.body()
+    if settings.inbox_github_secret:
+        _verify_signature(
+            settings.inbox_github_secret, body, request.headers.get("x-hub-signature-256")
+        )
+    event = github_inbox_event(
+        body, request.headers.get("x-github-delivery"), request.headers.get("x-github-event")
+    )
+    await inbox.write(event)
+    logger.debug("inbox accepted {} for issue {}", event["event_id"], event["aggregate_id"])
+    return Response(status_code=202)
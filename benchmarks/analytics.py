@@ -0,0 +1,204 @@
+"""
+Fleet-wide issue analytics: the vectorized engine against a naive ORM loop.
+
+Each size seeds that many issues with a random open/close/reopen history of up to
+MAX_STATE_EVENTS state changes plus label events, about six events per issue. The
+naive baseline streams Issue and StoredEvent objects and counts in Python loops; the
+engine reads column tuples in chunks into NumPy arrays. Both compute the same
+IssueAnalytics, which run() checks before reporting.
+"""
+
+import asyncio
+import os
+import random
+from collections import Counter, defaultdict
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, SQLModel, create_engine, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.resource_adapters.persistence.sqlmodel.event_store import (
+    EventStore,
+    StoredEvent,
+    utcnow,
+)
+from app.domain.issue import Issue, IssueEventType, IssueState
+from app.features.issues.analytics import (
+    EventsPerIssue,
+    IssueAnalytics,
+    analyze_issues,
+    compute_issue_analytics,
+    load_event_columns,
+    load_issue_columns,
+)
+from app.features.issues.event_sourced_repository import ISSUE_AGGREGATE
+from app.features.issues.repository import AsyncSQLModelIssueRepository, SQLModelIssueRepository
+from benchmarks.harness import BenchmarkResult, measure_async, summarize
+
+CHUNK_SIZE = 10_000
+MAX_STATE_EVENTS = 6
+# the naive loop is O(rows) in Python objects; scale its rounds so large sizes finish
+NAIVE_ROWS_BUDGET = 2_000_000
+
+
+def naive_issue_analytics(issues: Iterable[Issue], events: Iterable[StoredEvent]) -> IssueAnalytics:
+    """The same metrics as compute_issue_analytics, one Python object at a time."""
+    states: Counter[str] = Counter(issue.issue_state.value for issue in issues)
+    event_types: Counter[str] = Counter()
+    by_issue: Dict[int, List[StoredEvent]] = defaultdict(list)
+    for event in events:
+        event_types[event.event_type] += 1
+        by_issue[int(event.aggregate_id)].append(event)
+
+    transitions: Counter[str] = Counter()
+    closed, reopened = set(), set()
+    for number, history in by_issue.items():
+        state = "NEW"
+        for event in sorted(history, key=lambda event: event.version):
+            if event.event_type == IssueEventType.CLOSED.value:
+                closed.add(number)
+                new_state = IssueState.CLOSED.value
+            elif event.event_type in (IssueEventType.OPENED.value, IssueEventType.REOPENED.value):
+                if event.event_type == IssueEventType.REOPENED.value:
+                    reopened.add(number)
+                new_state = IssueState.OPEN.value
+            else:
+                continue
+            if new_state != state:
+                transitions[f"{state}->{new_state}"] += 1
+                state = new_state
+
+    events_per_issue: Optional[EventsPerIssue] = None
+    if by_issue:
+        counts = sorted(len(history) for history in by_issue.values())
+        events_per_issue = EventsPerIssue(
+            p50=_percentile(counts, 0.5), p95=_percentile(counts, 0.95), max=counts[-1]
+        )
+    return IssueAnalytics(
+        issues=sum(states.values()),
+        events=sum(event_types.values()),
+        state_distribution=dict(sorted(states.items())),
+        event_type_counts=dict(sorted(event_types.items())),
+        transitions=dict(transitions),
+        issues_closed=len(closed),
+        issues_reopened=len(reopened),
+        reopen_rate=len(reopened & closed) / len(closed) if closed else None,
+        events_per_issue=events_per_issue,
+    )
+
+
+def _percentile(ordered: List[int], fraction: float) -> float:
+    # linear interpolation, as numpy.percentile does by default
+    position = (len(ordered) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def seed_database(path: str, size: int, seed: int) -> None:
+    rng = random.Random(seed)
+    engine = create_engine(f"sqlite:///{path}")
+    SQLModel.metadata.create_all(engine)
+    recorded_at = utcnow()
+    issues: List[Dict[str, Any]] = []
+    events: List[Dict[str, Any]] = []
+    for number in range(1, size + 1):
+        history = [IssueEventType.OPENED]
+        for _ in range(rng.randint(0, MAX_STATE_EVENTS - 1)):
+            closing = history.count(IssueEventType.CLOSED) == history.count(
+                IssueEventType.REOPENED
+            )
+            history.append(IssueEventType.CLOSED if closing else IssueEventType.REOPENED)
+        for _ in range(rng.randint(0, 4)):
+            history.insert(rng.randint(1, len(history)), IssueEventType.LABLED)
+        state = IssueState.OPEN
+        for version, event_type in enumerate(history, start=1):
+            if event_type == IssueEventType.CLOSED:
+                state = IssueState.CLOSED
+            elif event_type == IssueEventType.REOPENED:
+                state = IssueState.OPEN
+            events.append(
+                {
+                    "aggregate_type": ISSUE_AGGREGATE,
+                    "aggregate_id": str(number),
+                    "version": version,
+                    "event_id": f"{number}-{version}",
+                    "event_type": event_type.value,
+                    "payload": {},
+                    "recorded_at": recorded_at,
+                }
+            )
+        issues.append({"issue_number": number, "issue_state": state, "version": len(history)})
+
+    with SQLModelIssueRepository(Session(engine)) as repo:
+        repo.upsert_many(issues)
+    with engine.begin() as connection:
+        connection.execute(StoredEvent.__table__.insert(), events)
+    engine.dispose()
+
+
+async def run_size(path: str, size: int, rounds: int, warmup: int) -> List[BenchmarkResult]:
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{path}",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+
+    def new_session() -> AsyncSession:
+        return AsyncSession(engine, expire_on_commit=False)
+
+    async def naive() -> IssueAnalytics:
+        async with new_session() as session:
+            issues = [issue async for issue in AsyncSQLModelIssueRepository(session).stream()]
+            statement = select(StoredEvent).where(StoredEvent.aggregate_type == ISSUE_AGGREGATE)
+            events = (await session.exec(statement.execution_options(yield_per=CHUNK_SIZE))).all()
+            return naive_issue_analytics(issues, events)
+
+    async def vectorized() -> IssueAnalytics:
+        async with new_session() as session:
+            return await analyze_issues(
+                AsyncSQLModelIssueRepository(session),
+                EventStore(session, ISSUE_AGGREGATE),
+                CHUNK_SIZE,
+            )
+
+    async with new_session() as session:
+        issue_columns = await load_issue_columns(AsyncSQLModelIssueRepository(session), CHUNK_SIZE)
+        event_columns = await load_event_columns(EventStore(session, ISSUE_AGGREGATE), CHUNK_SIZE)
+
+    async def compute_only() -> IssueAnalytics:
+        return compute_issue_analytics(issue_columns, event_columns)
+
+    expected = await naive()
+    assert await vectorized() == expected, "vectorized analytics disagree with the naive loop"
+
+    params: Dict[str, Any] = {"issues": size, "events": expected.events}
+    naive_rounds = max(1, min(rounds, NAIVE_ROWS_BUDGET // (size + expected.events)))
+    results = [
+        summarize("analytics.naive_orm", params, await measure_async(naive, naive_rounds, 0)),
+        summarize(
+            "analytics.vectorized",
+            params,
+            await measure_async(vectorized, naive_rounds, min(warmup, 1)),
+        ),
+        summarize(
+            "analytics.vectorized_compute",
+            params,
+            await measure_async(compute_only, rounds, warmup),
+        ),
+    ]
+    await engine.dispose()
+    return results
+
+
+def run(
+    directory: str, sizes: List[int], rounds: int, warmup: int, seed: int
+) -> List[BenchmarkResult]:
+    results: List[BenchmarkResult] = []
+    for size in sizes:
+        path = os.path.join(directory, f"analytics-{size}.db")
+        seed_database(path, size, seed)
+        results.extend(asyncio.run(run_size(path, size, rounds, warmup)))
+    return results
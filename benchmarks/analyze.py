@@ -0,0 +1,93 @@
+"""
+End-to-end latency of the issue endpoints through the full main:app stack: POST
+/v1/issues/{n}/analyze, and GET /v1/issues/{n} with and without a matching If-None-Match.
+
+Requests go through httpx's in-process ASGI transport, so middleware, dependency
+injection, the async repository and serialization are included but no server or socket.
+The app's database is whatever APP_DATABASE_URL_TEMPLATE points at when main is imported
+(benchmarks.run points it at a SQLite file).
+"""
+
+import asyncio
+import random
+from typing import Any, Dict, List
+
+import httpx
+from sqlmodel import Session, delete
+
+from benchmarks.harness import BenchmarkResult, measure_async, summarize
+
+
+def _seed(size: int) -> None:
+    from app.core.database import get_engine
+    from app.domain.issue import Issue, IssueState
+    from app.features.issues.repository import SQLModelIssueRepository
+
+    # creates the tables when APP_CREATE_TABLES is set, as the app's lifespan would
+    with SQLModelIssueRepository(Session(get_engine())) as repo:
+        repo.session.exec(delete(Issue))
+        repo.upsert_many(
+            {"issue_number": number, "issue_state": IssueState.OPEN, "version": 0}
+            for number in range(1, size + 1)
+        )
+
+
+async def run_size(size: int, rounds: int, warmup: int, seed: int) -> List[BenchmarkResult]:
+    from main import app
+
+    _seed(size)
+    rng = random.Random(seed)
+    params: Dict[str, Any] = {"size": size}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+
+        async def analyze() -> None:
+            response = await client.post(f"/v1/issues/{rng.randint(1, size)}/analyze")
+            assert response.status_code == 200, response.text
+
+        async def analyze_missing() -> None:
+            response = await client.post(f"/v1/issues/{size + rng.randint(1, size)}/analyze")
+            assert response.status_code == 404, response.text
+
+        async def get() -> None:
+            response = await client.get(f"/v1/issues/{rng.randint(1, size)}")
+            assert response.status_code == 200, response.text
+
+        async def get_not_modified() -> None:
+            number = rng.randint(1, size)
+            # every seeded issue is at version 0
+            headers = {"If-None-Match": f'W/"issue-{number}-0"'}
+            response = await client.get(f"/v1/issues/{number}", headers=headers)
+            assert response.status_code == 304, response.text
+
+        return [
+            summarize("http.analyze", params, await measure_async(analyze, rounds, warmup)),
+            summarize(
+                "http.analyze_missing",
+                params,
+                await measure_async(analyze_missing, rounds, warmup),
+            ),
+            summarize("http.get", params, await measure_async(get, rounds, warmup)),
+            summarize(
+                "http.get_not_modified",
+                params,
+                await measure_async(get_not_modified, rounds, warmup),
+            ),
+        ]
+
+
+async def run_all(sizes: List[int], rounds: int, warmup: int, seed: int) -> List[BenchmarkResult]:
+    from app.core.database import get_async_engine
+
+    results: List[BenchmarkResult] = []
+    try:
+        for size in sizes:
+            results.extend(await run_size(size, rounds, warmup, seed))
+    finally:
+        # aiosqlite connections own a non-daemon thread, close them or the process hangs
+        await get_async_engine().dispose()
+    return results
+
+
+def run(sizes: List[int], rounds: int, warmup: int, seed: int) -> List[BenchmarkResult]:
+    return asyncio.run(run_all(sizes, rounds, warmup, seed))
@@ -0,0 +1,68 @@
+"""
+Compare two benchmark result files and flag regressions.
+
+    uv run python -m benchmarks.compare baseline.json candidate.json --threshold 10
+
+Benchmarks are matched by name and parameters and compared on the median. The exit code
+is 1 when any median got slower by more than the threshold percentage.
+"""
+
+import argparse
+import json
+import sys
+from typing import Any, Dict
+
+
+def _load(path: str) -> Dict[str, Any]:
+    with open(path, encoding="utf-8") as file:
+        return json.load(file)
+
+
+def _key(result: Dict[str, Any]) -> str:
+    params = ",".join(f"{k}={v}" for k, v in sorted(result["params"].items()))
+    return f"{result['name']}[{params}]"
+
+
+def compare(baseline: Dict[str, Any], candidate: Dict[str, Any], threshold: float) -> int:
+    before = {_key(result): result for result in baseline["results"]}
+    after = {_key(result): result for result in candidate["results"]}
+    print(
+        f"baseline  {baseline['environment'].get('commit')} "
+        f"({baseline['environment'].get('timestamp')})"
+    )
+    print(
+        f"candidate {candidate['environment'].get('commit')} "
+        f"({candidate['environment'].get('timestamp')})"
+    )
+    print(f"{'benchmark':<48} {'before us':>10} {'after us':>10} {'change':>8}")
+
+    regressions = 0
+    for key in sorted(before.keys() | after.keys()):
+        if key not in before or key not in after:
+            print(f"{key:<48} {'only in ' + ('candidate' if key in after else 'baseline'):>30}")
+            continue
+        old, new = before[key]["median_us"], after[key]["median_us"]
+        change = (new - old) / old * 100 if old else 0.0
+        flag = ""
+        if change > threshold:
+            flag = "  REGRESSION"
+            regressions += 1
+        elif change < -threshold:
+            flag = "  faster"
+        print(f"{key:<48} {old:>10.1f} {new:>10.1f} {change:>+7.1f}%{flag}")
+
+    print(f"{regressions} regression(s) above {threshold}%")
+    return 1 if regressions else 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--threshold", type=float, default=10.0, help="percent")
+    args = parser.parse_args()
+    sys.exit(compare(_load(args.baseline), _load(args.candidate), args.threshold))
+
+
+if __name__ == "__main__":
+    main()
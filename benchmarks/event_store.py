@@ -0,0 +1,108 @@
+"""
+Rehydration latency of event sourced issues with and without snapshots.
+
+For each size one issue gets that many events appended with snapshots every
+SNAPSHOT_INTERVAL events, and another gets the same events with snapshots disabled.
+Loading the first replays at most SNAPSHOT_INTERVAL events whatever the size; loading
+the second replays all of them.
+"""
+
+import asyncio
+import os
+import random
+from datetime import datetime, timezone
+from typing import Any, Dict, List
+
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import StaticPool
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.domain.issue import Issue, IssueEvent, IssueEventType, IssueState
+from app.features.issues.event_sourced_repository import EventSourcedIssueRepository
+from benchmarks.harness import BenchmarkResult, measure_async, summarize
+
+SNAPSHOT_INTERVAL = 100
+# events appended per unit of work while seeding
+SEED_BATCH = 1_000
+# full replays are O(events); scale their rounds so large histories don't dominate the run
+REPLAY_EVENTS_BUDGET = 2_000_000
+SNAPSHOTTED, REPLAYED = 1, 2
+
+
+def _events(issue_number: int, start: int, count: int, rng: random.Random) -> List[IssueEvent]:
+    events = []
+    for n in range(start, start + count):
+        event_type = rng.choice(
+            [IssueEventType.EDITED, IssueEventType.LABLED, IssueEventType.UNLABLED]
+        )
+        events.append(
+            IssueEvent(
+                event_id=f"{issue_number}-{n}",
+                timestamp=datetime.now(timezone.utc),
+                issue_number=issue_number,
+                issue_state=IssueState.OPEN,
+                issue_state_transition=None,
+                issue_event_type=event_type,
+                changes={"title": f"title {n}"},
+                previous_title="",
+                previous_body="",
+                label=f"label-{rng.randrange(20)}",
+            )
+        )
+    return events
+
+
+async def _seed(engine: AsyncEngine, issue_number: int, size: int, interval: int, seed: int) -> None:
+    rng = random.Random(seed)
+    issue = Issue(issue_number=issue_number, version=0)
+    for start in range(0, size, SEED_BATCH):
+        session = AsyncSession(engine, expire_on_commit=False)
+        async with EventSourcedIssueRepository(session, interval) as repo:
+            count = min(SEED_BATCH, size - start)
+            await repo.append(issue, _events(issue_number, start, count, rng))
+
+
+async def run_size(
+    path: str, size: int, rounds: int, warmup: int, seed: int
+) -> List[BenchmarkResult]:
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{path}",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    async with engine.begin() as connection:
+        await connection.run_sync(SQLModel.metadata.create_all)
+    await _seed(engine, SNAPSHOTTED, size, SNAPSHOT_INTERVAL, seed)
+    await _seed(engine, REPLAYED, size, 0, seed)
+
+    async def load(issue_number: int) -> None:
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            await EventSourcedIssueRepository(session).get(issue_number)
+
+    replay_rounds = max(3, min(rounds, REPLAY_EVENTS_BUDGET // size))
+    params: Dict[str, Any] = {"events": size}
+    results = [
+        summarize(
+            "event_store.load_snapshot",
+            {**params, "snapshot_interval": SNAPSHOT_INTERVAL},
+            await measure_async(lambda: load(SNAPSHOTTED), rounds, warmup),
+        ),
+        summarize(
+            "event_store.load_replay",
+            {**params, "snapshot_interval": 0},
+            await measure_async(lambda: load(REPLAYED), replay_rounds, 1),
+        ),
+    ]
+    await engine.dispose()
+    return results
+
+
+def run(
+    directory: str, sizes: List[int], rounds: int, warmup: int, seed: int
+) -> List[BenchmarkResult]:
+    results: List[BenchmarkResult] = []
+    for size in sizes:
+        path = os.path.join(directory, f"event-store-{size}.db")
+        results.extend(asyncio.run(run_size(path, size, rounds, warmup, seed)))
+    return results
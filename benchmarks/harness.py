@@ -0,0 +1,126 @@
+"""Timing, summary statistics and JSON output shared by the benchmark modules."""
+
+import gc
+import json
+import platform
+import statistics
+import subprocess
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import sqlalchemy
+
+
+@dataclass
+class BenchmarkResult:
+    """Latency summary of one benchmark at one set of parameters, times in microseconds."""
+
+    name: str
+    params: Dict[str, Any]
+    rounds: int
+    min_us: float
+    median_us: float
+    mean_us: float
+    p95_us: float
+    p99_us: float
+    stdev_us: float
+    ops_per_second: float
+    extra: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def key(self) -> str:
+        params = ",".join(f"{k}={v}" for k, v in sorted(self.params.items()))
+        return f"{self.name}[{params}]"
+
+
+def _percentile(ordered: List[float], fraction: float) -> float:
+    index = min(len(ordered) - 1, max(0, round(fraction * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize(name: str, params: Dict[str, Any], samples: List[float]) -> BenchmarkResult:
+    ordered = sorted(samples)
+    mean = statistics.fmean(ordered)
+    return BenchmarkResult(
+        name=name,
+        params=params,
+        rounds=len(ordered),
+        min_us=round(ordered[0] * 1e6, 2),
+        median_us=round(statistics.median(ordered) * 1e6, 2),
+        mean_us=round(mean * 1e6, 2),
+        p95_us=round(_percentile(ordered, 0.95) * 1e6, 2),
+        p99_us=round(_percentile(ordered, 0.99) * 1e6, 2),
+        stdev_us=round(statistics.pstdev(ordered) * 1e6, 2),
+        ops_per_second=round(1 / mean, 1) if mean else 0.0,
+    )
+
+
+def measure(operation: Callable[[], Any], rounds: int, warmup: int) -> List[float]:
+    """Seconds per call of operation, after warmup calls that are not recorded."""
+    for _ in range(warmup):
+        operation()
+    gc.collect()
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        operation()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+async def measure_async(
+    operation: Callable[[], Awaitable[Any]], rounds: int, warmup: int
+) -> List[float]:
+    for _ in range(warmup):
+        await operation()
+    gc.collect()
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        await operation()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def _git(*args: str) -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", *args], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def environment() -> Dict[str, Any]:
+    """What the numbers depend on besides the code: recorded next to every result set."""
+    return {
+        "commit": _git("rev-parse", "HEAD"),
+        "dirty": bool(_git("status", "--porcelain", "--untracked-files=no")),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "sqlalchemy": sqlalchemy.__version__,
+    }
+
+
+def write_json(path: str, results: List[BenchmarkResult], config: Dict[str, Any]) -> None:
+    document = {
+        "environment": environment(),
+        "config": config,
+        "results": [asdict(result) for result in results],
+    }
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(document, file, indent=2)
+        file.write("\n")
+
+
+def print_table(results: List[BenchmarkResult]) -> None:
+    print(f"{'benchmark':<56} {'median us':>10} {'p95 us':>10} {'p99 us':>10} {'ops/s':>10}")
+    for result in results:
+        print(
+            f"{result.key:<56} {result.median_us:>10.1f} {result.p95_us:>10.1f} "
+            f"{result.p99_us:>10.1f} {result.ops_per_second:>10.1f}"
+        )
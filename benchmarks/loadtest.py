@@ -0,0 +1,371 @@
+r"""
+HTTP load generator for main:app with HdrHistogram-style latency reports.
+
+    uv run python manage.py loadtest --concurrency 64 --duration 30
+    uv run python manage.py loadtest --rate 500 --mix analyze=1 \\
+        --database-url "postgresql+asyncpg://postgres@localhost/postgres" \\
+        --server-env APP_DATABASE_POOL_SIZE=5 --server-env APP_DATABASE_POOL_TIMEOUT=1
+
+Starts uvicorn on a free local port (unless --url points at a running server), seeds the
+issues table, then drives the endpoints in --mix from --concurrency async httpx workers.
+Without --rate the workers send back to back, which finds throughput at saturation. With
+--rate requests are scheduled open loop at fixed intervals and latency is measured from
+each request's scheduled start, so a stalled server shows up as queueing latency instead
+of silently lowering the offered load (coordinated omission).
+"""
+
+import asyncio
+import itertools
+import math
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, Optional, Tuple
+
+import httpx
+
+ENDPOINTS = {
+    "analyze": ("POST", "/v1/issues/{issue_number}/analyze"),
+    "health": ("GET", "/health"),
+    "liveness": ("GET", "/liveness"),
+    "readiness": ("GET", "/readiness"),
+}
+
+
+class LatencyHistogram:
+    """
+    Latency counts at a fixed number of significant figures, like HdrHistogram.
+
+    Values are recorded in microseconds and bucketed so every reported value is within
+    10**-significant_figures of the true one, whatever its magnitude.
+    """
+
+    def __init__(self, significant_figures: int = 3) -> None:
+        self.significant_figures = significant_figures
+        self.counts: Counter[int] = Counter()
+        self.total_count = 0
+        self.max_us = 0
+        self._sum = 0.0
+        self._sum_squares = 0.0
+
+    def _bucket(self, value_us: int) -> int:
+        digits = len(str(value_us))
+        if digits <= self.significant_figures:
+            return value_us
+        unit = 10 ** (digits - self.significant_figures)
+        return value_us // unit * unit
+
+    def record(self, seconds: float) -> None:
+        value_us = max(0, int(seconds * 1_000_000))
+        self.counts[self._bucket(value_us)] += 1
+        self.total_count += 1
+        self.max_us = max(self.max_us, value_us)
+        self._sum += value_us
+        self._sum_squares += value_us * value_us
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        self.counts.update(other.counts)
+        self.total_count += other.total_count
+        self.max_us = max(self.max_us, other.max_us)
+        self._sum += other._sum
+        self._sum_squares += other._sum_squares
+
+    @property
+    def mean_us(self) -> float:
+        return self._sum / self.total_count if self.total_count else 0.0
+
+    @property
+    def stdev_us(self) -> float:
+        if not self.total_count:
+            return 0.0
+        variance = self._sum_squares / self.total_count - self.mean_us**2
+        return math.sqrt(max(0.0, variance))
+
+    def value_at_percentile(self, percentile: float) -> int:
+        if not self.total_count:
+            return 0
+        target = max(1, math.ceil(percentile / 100 * self.total_count))
+        seen = 0
+        for value in sorted(self.counts):
+            seen += self.counts[value]
+            if seen >= target:
+                return value
+        return self.max_us
+
+    def percentile_ticks(self, ticks_per_half_distance: int = 5) -> Iterator[float]:
+        """0, then ever finer steps towards 100, as HdrHistogram's percentile output."""
+        percentile = 0.0
+        while True:
+            yield percentile
+            remaining = 100 - percentile
+            # stop once a step would resolve less than one recorded value
+            if remaining * self.total_count / 100 < 1:
+                break
+            ticks = ticks_per_half_distance * 2 ** (math.floor(math.log2(100 / remaining)) + 1)
+            percentile += 100 / ticks
+        yield 100.0
+
+    def report(self, scale_us: float = 1000.0) -> str:
+        """Percentile distribution in HdrHistogram's text layout, values in milliseconds."""
+        lines = [f"{'Value':>12} {'Percentile':>14} {'TotalCount':>10} {'1/(1-Percentile)':>16}", ""]
+        for percentile in self.percentile_ticks():
+            value = self.value_at_percentile(percentile)
+            count = sum(count for bucket, count in self.counts.items() if bucket <= value)
+            inverse = "inf" if percentile >= 100 else f"{1 / (1 - percentile / 100):.2f}"
+            lines.append(
+                f"{value / scale_us:>12.3f} {percentile / 100:>14.12f} {count:>10} {inverse:>16}"
+            )
+        lines.append(
+            f"#[Mean    = {self.mean_us / scale_us:>12.3f}, "
+            f"StdDeviation   = {self.stdev_us / scale_us:>12.3f}]"
+        )
+        lines.append(
+            f"#[Max     = {self.max_us / scale_us:>12.3f}, Total count    = {self.total_count:>12}]"
+        )
+        lines.append(f"#[Buckets = {len(self.counts):>12}]")
+        return "\n".join(lines)
+
+
+@dataclass
+class EndpointStats:
+    latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+    statuses: Counter[str] = field(default_factory=Counter)
+
+    @property
+    def errors(self) -> int:
+        return sum(count for status, count in self.statuses.items() if not status.startswith("2"))
+
+
+@dataclass
+class LoadTestConfig:
+    url: str
+    mix: Dict[str, int]
+    concurrency: int
+    duration_seconds: float
+    warmup_seconds: float
+    rate: Optional[float]
+    timeout_seconds: float
+    issues: int
+    seed: int
+
+
+def parse_mix(value: str) -> Dict[str, int]:
+    """'analyze=9,health=1' -> {'analyze': 9, 'health': 1}"""
+    mix: Dict[str, int] = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in ENDPOINTS:
+            raise ValueError(f"unknown endpoint {name!r}, choose from {', '.join(ENDPOINTS)}")
+        mix[name] = int(weight or 1)
+    return mix
+
+
+async def _worker(
+    client: httpx.AsyncClient,
+    config: LoadTestConfig,
+    schedule: Iterator[int],
+    start: float,
+    stats: Dict[str, EndpointStats],
+    rng: random.Random,
+) -> None:
+    names = list(config.mix)
+    weights = [config.mix[name] for name in names]
+    end = start + config.warmup_seconds + config.duration_seconds
+    measure_from = start + config.warmup_seconds
+    while True:
+        if config.rate:
+            intended = start + next(schedule) / config.rate
+            delay = intended - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+        else:
+            intended = time.perf_counter()
+        if intended >= end:
+            return
+
+        name = rng.choices(names, weights)[0]
+        method, path = ENDPOINTS[name]
+        url = path.format(issue_number=rng.randint(1, config.issues))
+        try:
+            response = await client.request(method, url)
+            status = str(response.status_code)
+        except httpx.HTTPError as exc:
+            status = type(exc).__name__
+        if intended >= measure_from:
+            endpoint = stats[name]
+            endpoint.latency.record(time.perf_counter() - intended)
+            endpoint.statuses[status] += 1
+
+
+async def run_load(config: LoadTestConfig) -> Tuple[Dict[str, EndpointStats], float]:
+    """Drive the server; returns per-endpoint stats and the measured duration in seconds."""
+    stats = {name: EndpointStats() for name in config.mix}
+    limits = httpx.Limits(
+        max_connections=config.concurrency, max_keepalive_connections=config.concurrency
+    )
+    schedule = itertools.count()
+    async with httpx.AsyncClient(
+        base_url=config.url, limits=limits, timeout=config.timeout_seconds
+    ) as client:
+        start = time.perf_counter()
+        await asyncio.gather(
+            *(
+                _worker(client, config, schedule, start, stats, random.Random(config.seed + index))
+                for index in range(config.concurrency)
+            )
+        )
+        elapsed = time.perf_counter() - start - config.warmup_seconds
+    return stats, elapsed
+
+
+def format_report(stats: Dict[str, EndpointStats], elapsed: float, config: LoadTestConfig) -> str:
+    overall = LatencyHistogram()
+    statuses: Counter[str] = Counter()
+    for endpoint in stats.values():
+        overall.merge(endpoint.latency)
+        statuses.update(endpoint.statuses)
+
+    mode = f"open loop at {config.rate:g} req/s" if config.rate else "closed loop"
+    lines = [
+        f"{config.url}  concurrency={config.concurrency}  {mode}  duration={elapsed:.1f}s",
+        "",
+    ]
+    for name, endpoint in stats.items():
+        latency = endpoint.latency
+        if not latency.total_count:
+            continue
+        lines.append(
+            f"{name:<10} requests={latency.total_count:<8} "
+            f"errors={endpoint.errors:<6} "
+            f"p50={latency.value_at_percentile(50) / 1000:.2f}ms "
+            f"p95={latency.value_at_percentile(95) / 1000:.2f}ms "
+            f"p99={latency.value_at_percentile(99) / 1000:.2f}ms "
+            f"max={latency.max_us / 1000:.2f}ms"
+        )
+    errors = sum(count for status, count in statuses.items() if not status.startswith("2"))
+    total = overall.total_count
+    lines += [
+        "",
+        f"throughput {total / elapsed if elapsed > 0 else 0:,.1f} req/s, "
+        f"error rate {errors / total * 100 if total else 0:.2f}%",
+        "responses  " + ", ".join(f"{status}: {count}" for status, count in sorted(statuses.items())),
+        "",
+        "overall latency (ms)",
+        overall.report(),
+    ]
+    return "\n".join(lines)
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _sync_url(url: str) -> str:
+    return url.replace("+asyncpg", "+psycopg").replace("+aiosqlite", "")
+
+
+def default_database_url(directory: str) -> str:
+    return f"sqlite:///{os.path.join(directory, 'loadtest.db')}"
+
+
+def seed_issues(database_url: str, schema: Optional[str], issues: int) -> None:
+    """Create the tables and upsert issues 1..issues, in this process, before the server starts."""
+    from sqlmodel import Session, SQLModel, create_engine
+
+    from app.domain.issue import IssueState
+    from app.features.issues.repository import SQLModelIssueRepository
+
+    engine = create_engine(_sync_url(database_url))
+    SQLModel.metadata.schema = schema if not database_url.startswith("sqlite") else None
+    SQLModel.metadata.create_all(engine)
+    with SQLModelIssueRepository(Session(engine)) as repo:
+        repo.upsert_many(
+            {"issue_number": number, "issue_state": IssueState.OPEN, "version": 0}
+            for number in range(1, issues + 1)
+        )
+    engine.dispose()
+
+
+class UvicornServer:
+    """main:app in a uvicorn subprocess on a free local port."""
+
+    def __init__(self, env: Dict[str, str], workers: int = 1) -> None:
+        self.port = _free_port()
+        self.url = f"http://127.0.0.1:{self.port}"
+        self.env = {**os.environ, **env}
+        self.workers = workers
+        self.process: Optional[subprocess.Popen[bytes]] = None
+
+    def __enter__(self) -> "UvicornServer":
+        self.process = subprocess.Popen(
+            [
+                sys.executable, "-m", "uvicorn", "main:app",
+                "--host", "127.0.0.1",
+                "--port", str(self.port),
+                "--workers", str(self.workers),
+                "--log-level", "warning",
+                "--no-access-log",
+            ],
+            env=self.env,
+        )
+        self._wait_ready()
+        return self
+
+    def _wait_ready(self, timeout_seconds: float = 30.0) -> None:
+        deadline = time.monotonic() + timeout_seconds
+        while time.monotonic() < deadline:
+            assert self.process is not None
+            if self.process.poll() is not None:
+                raise RuntimeError(f"uvicorn exited with code {self.process.returncode}")
+            try:
+                if httpx.get(f"{self.url}/liveness", timeout=1).status_code == 200:
+                    return
+            except httpx.HTTPError:
+                pass
+            time.sleep(0.2)
+        raise RuntimeError(f"uvicorn did not become ready within {timeout_seconds}s")
+
+    def __exit__(self, *exc_info: object) -> None:
+        if self.process is not None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+
+
+def run(
+    config: LoadTestConfig,
+    database_url: Optional[str],
+    schema: Optional[str],
+    server_env: Dict[str, str],
+    workers: int,
+) -> str:
+    """Start a server unless config.url is set, run the load and return the report."""
+    if config.url:
+        stats, elapsed = asyncio.run(run_load(config))
+        return format_report(stats, elapsed, config)
+
+    with tempfile.TemporaryDirectory(prefix="loadtest-") as directory:
+        url = database_url or default_database_url(directory)
+        seed_issues(url, schema, config.issues)
+        env = {
+            "APP_DATABASE_URL_TEMPLATE": url,
+            "APP_CREATE_TABLES": "false",
+            "APP_LOG_LEVEL": "WARNING",
+            **({"APP_DATABASE_SCHEMA": schema} if schema else {}),
+            **server_env,
+        }
+        with UvicornServer(env, workers) as server:
+            config.url = server.url
+            stats, elapsed = asyncio.run(run_load(config))
+    return format_report(stats, elapsed, config)
@@ -0,0 +1,143 @@
+"""
+Per-request overhead of the request id / timing middleware.
+
+    uv run python -m benchmarks.middleware_overhead --requests 20000
+
+Compares the former pair of @app.middleware("http") functions (BaseHTTPMiddleware)
+with RequestContextMiddleware, alone and together with MetricsMiddleware, on a trivial
+endpoint. The ASGI app is called directly,
+so no server or HTTP client cost is included, and loguru sinks are removed so the
+numbers isolate the middleware machinery.
+"""
+
+import argparse
+import asyncio
+import time
+import uuid
+from typing import Any, Callable, Dict
+
+from fastapi import FastAPI
+from loguru import logger
+
+from app.core.middleware import MetricsMiddleware, RequestContextMiddleware
+
+
+def _endpoint_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping() -> Dict[str, str]:
+        return {"status": "ok"}
+
+    return app
+
+
+def baseline_app() -> FastAPI:
+    return _endpoint_app()
+
+
+def base_http_middleware_app() -> FastAPI:
+    """The two decorator middlewares main.py used before RequestContextMiddleware."""
+    app = _endpoint_app()
+
+    @app.middleware("http")
+    async def add_request_id(request, call_next):
+        request_id = str(uuid.uuid4())
+        request.state.request_id = request_id
+        response = await call_next(request)
+        response.headers["X-Request-ID"] = request_id
+        logger.info(f"Request {request_id} to {request.url.path}")
+        return response
+
+    @app.middleware("http")
+    async def add_process_time_header(request, call_next):
+        import time
+
+        start_time = time.perf_counter()
+        response = await call_next(request)
+        process_time = time.perf_counter() - start_time
+        response.headers["X-Process-Time"] = str(process_time)
+        logger.info(f"Request to {request.url.path} took {process_time:.4f} seconds")
+        return response
+
+    return app
+
+
+def asgi_middleware_app() -> FastAPI:
+    app = _endpoint_app()
+    app.add_middleware(RequestContextMiddleware)
+    return app
+
+
+def asgi_middleware_with_metrics_app() -> FastAPI:
+    app = asgi_middleware_app()
+    app.add_middleware(MetricsMiddleware)
+    return app
+
+
+VARIANTS: Dict[str, Callable[[], FastAPI]] = {
+    "baseline": baseline_app,
+    "base_http_middleware": base_http_middleware_app,
+    "asgi_middleware": asgi_middleware_app,
+    "asgi_with_metrics": asgi_middleware_with_metrics_app,
+}
+
+
+def _scope() -> Dict[str, Any]:
+    return {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/ping",
+        "raw_path": b"/ping",
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"bench")],
+        "client": ("127.0.0.1", 1234),
+        "server": ("bench", 80),
+    }
+
+
+async def _receive() -> Dict[str, Any]:
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+async def _send(message: Dict[str, Any]) -> None:
+    pass
+
+
+async def measure(app: FastAPI, requests: int, warmup: int) -> float:
+    """Mean seconds per request."""
+    for _ in range(warmup):
+        await app(_scope(), _receive, _send)
+    start = time.perf_counter()
+    for _ in range(requests):
+        await app(_scope(), _receive, _send)
+    return (time.perf_counter() - start) / requests
+
+
+async def run(requests: int, warmup: int) -> Dict[str, float]:
+    return {
+        name: await measure(factory(), requests, warmup)
+        for name, factory in VARIANTS.items()
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=20_000)
+    parser.add_argument("--warmup", type=int, default=1_000)
+    args = parser.parse_args()
+
+    logger.remove()
+    results = asyncio.run(run(args.requests, args.warmup))
+    baseline = results["baseline"]
+    print(f"{'variant':<22} {'us/request':>11} {'overhead us':>12}")
+    for name, seconds in results.items():
+        print(f"{name:<22} {seconds * 1e6:>11.1f} {(seconds - baseline) * 1e6:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
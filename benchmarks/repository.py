@@ -0,0 +1,151 @@
+"""
+Latency of the issue repositories against a SQLite file at several table sizes.
+
+Each operation runs the way a request does: a fresh session (and unit of work for writes)
+per call, on engines configured like app.core.database configures SQLite.
+"""
+
+import asyncio
+import os
+import random
+from typing import Any, Dict, List
+
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, SQLModel, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.domain.issue import Issue, IssueState
+from app.features.issues.repository import (
+    AsyncSQLModelIssueRepository,
+    SQLModelIssueRepository,
+)
+from benchmarks.harness import BenchmarkResult, measure, measure_async, summarize
+
+PAGE_SIZE = 100
+# full-table list() is O(size); scale its rounds so large tables don't dominate the run
+LIST_ROWS_BUDGET = 2_000_000
+
+
+def _flip(issue: Issue) -> None:
+    issue.issue_state = IssueState.CLOSED if issue.issue_state.is_open else IssueState.OPEN
+
+
+def seed_database(path: str, size: int) -> None:
+    engine = create_engine(f"sqlite:///{path}")
+    SQLModel.metadata.create_all(engine)
+    with SQLModelIssueRepository(Session(engine)) as repo:
+        repo.upsert_many(
+            {"issue_number": number, "issue_state": IssueState.OPEN, "version": 0}
+            for number in range(1, size + 1)
+        )
+    engine.dispose()
+
+
+def run_sync(path: str, size: int, rounds: int, warmup: int, seed: int) -> List[BenchmarkResult]:
+    engine = create_engine(
+        f"sqlite:///{path}",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    rng = random.Random(seed)
+    next_number = iter(range(size + 1, size + 1_000_000))
+    params: Dict[str, Any] = {"size": size, "engine": "sync"}
+
+    def get_by_id() -> None:
+        with Session(engine) as session:
+            SQLModelIssueRepository(session).get_by_id(rng.randint(1, size))
+
+    def list_page() -> None:
+        with Session(engine) as session:
+            SQLModelIssueRepository(session).list_page(rng.randint(0, size), PAGE_SIZE)
+
+    def list_all() -> None:
+        with Session(engine) as session:
+            SQLModelIssueRepository(session).list()
+
+    def add() -> None:
+        with SQLModelIssueRepository(Session(engine)) as repo:
+            repo.add(Issue(issue_number=next(next_number), issue_state=IssueState.OPEN))
+
+    def get_update() -> None:
+        with SQLModelIssueRepository(Session(engine)) as repo:
+            issue = repo.get_by_id(rng.randint(1, size))
+            _flip(issue)
+            repo.update(issue)
+
+    list_rounds = max(3, min(rounds, LIST_ROWS_BUDGET // size))
+    results = [
+        summarize("repository.get_by_id", params, measure(get_by_id, rounds, warmup)),
+        summarize("repository.list_page", params, measure(list_page, rounds, warmup)),
+        summarize("repository.list", params, measure(list_all, list_rounds, 1)),
+        summarize("repository.add", params, measure(add, rounds, warmup)),
+        summarize("repository.get_update", params, measure(get_update, rounds, warmup)),
+    ]
+    engine.dispose()
+    return results
+
+
+async def run_async(
+    path: str, size: int, rounds: int, warmup: int, seed: int
+) -> List[BenchmarkResult]:
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{path}",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    rng = random.Random(seed)
+    next_number = iter(range(size + 1_000_001, size + 2_000_000))
+    params: Dict[str, Any] = {"size": size, "engine": "async"}
+
+    def new_session() -> AsyncSession:
+        return AsyncSession(engine, expire_on_commit=False)
+
+    async def get_by_id() -> None:
+        async with new_session() as session:
+            await AsyncSQLModelIssueRepository(session).get_by_id(rng.randint(1, size))
+
+    async def list_page() -> None:
+        async with new_session() as session:
+            await AsyncSQLModelIssueRepository(session).list_page(
+                rng.randint(0, size), PAGE_SIZE
+            )
+
+    async def list_all() -> None:
+        async with new_session() as session:
+            await AsyncSQLModelIssueRepository(session).list()
+
+    async def add() -> None:
+        async with AsyncSQLModelIssueRepository(new_session()) as repo:
+            await repo.add(Issue(issue_number=next(next_number), issue_state=IssueState.OPEN))
+
+    async def get_update() -> None:
+        async with AsyncSQLModelIssueRepository(new_session()) as repo:
+            issue = await repo.get_by_id(rng.randint(1, size))
+            _flip(issue)
+            await repo.update(issue)
+
+    list_rounds = max(3, min(rounds, LIST_ROWS_BUDGET // size))
+    results = [
+        summarize("repository.get_by_id", params, await measure_async(get_by_id, rounds, warmup)),
+        summarize("repository.list_page", params, await measure_async(list_page, rounds, warmup)),
+        summarize("repository.list", params, await measure_async(list_all, list_rounds, 1)),
+        summarize("repository.add", params, await measure_async(add, rounds, warmup)),
+        summarize(
+            "repository.get_update", params, await measure_async(get_update, rounds, warmup)
+        ),
+    ]
+    await engine.dispose()
+    return results
+
+
+def run(
+    directory: str, sizes: List[int], rounds: int, warmup: int, seed: int
+) -> List[BenchmarkResult]:
+    results: List[BenchmarkResult] = []
+    for size in sizes:
+        path = os.path.join(directory, f"repository-{size}.db")
+        seed_database(path, size)
+        results.extend(run_sync(path, size, rounds, warmup, seed))
+        results.extend(asyncio.run(run_async(path, size, rounds, warmup, seed)))
+    return results
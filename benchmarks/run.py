@@ -0,0 +1,76 @@
+"""
+Run the repository, analyze, event store and analytics benchmarks and write the results as JSON.
+
+    uv run python -m benchmarks.run --sizes 1000 10000 100000 --output bench.json
+    uv run python -m benchmarks.compare baseline.json bench.json
+
+Every run uses fresh SQLite files in a temporary directory, a fixed random seed and the
+same round counts, so results from two commits on the same machine are comparable. The
+JSON records the commit, Python and platform next to the numbers. Log sinks are removed
+so the numbers isolate the code paths, not stderr.
+"""
+
+import argparse
+import os
+import tempfile
+from typing import List
+
+from benchmarks.harness import BenchmarkResult, print_table, write_json
+
+SUITES = ("repository", "analyze", "event_store", "analytics")
+
+
+def _configure_app(directory: str) -> None:
+    # must happen before anything calls config.get_settings()
+    os.environ.setdefault("APP_PROJECT_NAME", "benchmarks")
+    os.environ.setdefault("APP_CURRENT_ENV", "default")
+    os.environ["APP_DATABASE_URL_TEMPLATE"] = f"sqlite:///{os.path.join(directory, 'app.db')}"
+    os.environ["APP_CREATE_TABLES"] = "true"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--rounds", type=int, default=500)
+    parser.add_argument("--warmup", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--suite", choices=SUITES, nargs="+", default=list(SUITES))
+    parser.add_argument("--output", default="benchmark-results.json")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="benchmarks-") as directory:
+        _configure_app(directory)
+
+        from loguru import logger
+
+        from benchmarks import analytics, analyze, event_store, repository
+
+        results: List[BenchmarkResult] = []
+        if "repository" in args.suite:
+            logger.remove()
+            results.extend(
+                repository.run(directory, args.sizes, args.rounds, args.warmup, args.seed)
+            )
+        if "analyze" in args.suite:
+            import main  # noqa: F401  configures logging on import, remove it afterwards
+
+            logger.remove()
+            results.extend(analyze.run(args.sizes, args.rounds, args.warmup, args.seed))
+        if "event_store" in args.suite:
+            logger.remove()
+            results.extend(
+                event_store.run(directory, args.sizes, args.rounds, args.warmup, args.seed)
+            )
+        if "analytics" in args.suite:
+            logger.remove()
+            results.extend(
+                analytics.run(directory, args.sizes, args.rounds, args.warmup, args.seed)
+            )
+
+    print_table(results)
+    write_json(args.output, results, vars(args))
+    print(f"wrote {len(results)} results to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
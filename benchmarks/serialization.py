@@ -0,0 +1,117 @@
+"""
+Serialization cost per response for the JSON response classes.
+
+    uv run python -m benchmarks.serialization --rounds 5000 --output serialization.json
+
+Each case renders the body of a typical response the way the app used to (FastAPI's
+JSONResponse after model_dump() or jsonable_encoder) and the way it does now
+(model_dump_json() for health responses, DefaultJSONResponse or ORJSONResponse for the
+rest). Only the encode is timed, no request handling.
+"""
+
+import argparse
+import datetime
+import os
+from typing import Any, Callable, Dict, List
+
+os.environ.setdefault("APP_PROJECT_NAME", "benchmarks")
+os.environ.setdefault("APP_CURRENT_ENV", "default")
+os.environ.setdefault("APP_DATABASE_URL_TEMPLATE", "sqlite://")
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from fastapi.responses import JSONResponse  # noqa: E402
+from pydantic import TypeAdapter  # noqa: E402
+
+from app.core.responses import DefaultJSONResponse, ORJSONResponse, orjson  # noqa: E402
+from app.domain.issue import Issue, IssueState  # noqa: E402
+from benchmarks.harness import BenchmarkResult, measure, print_table, summarize, write_json  # noqa: E402
+from config import get_settings  # noqa: E402
+from main import HealthCheck  # noqa: E402
+
+
+def health_payload() -> HealthCheck:
+    return HealthCheck(
+        status="pass",
+        version="python-template",
+        env="default",
+        description="Service pass",
+        checks={
+            "database": {"status": "pass", "responseTime": "1.20ms", "time": "2026-01-01T00:00:00"},
+            "eventLoop:lag": {"status": "pass", "observedValue": 0.4, "observedUnit": "ms"},
+        },
+    )
+
+
+def info_payload() -> Dict[str, Any]:
+    settings = get_settings()
+    return {
+        "app_name": settings.project_name,
+        "system_time": datetime.datetime.now(),
+        "database_type": settings.database_type,
+        "env": settings.current_env,
+        "settings": settings.model_dump(),
+        "pool": {"sync": {"pool_class": "QueuePool", "size": 5, "checked_out": 1}},
+        "issue_cache": {"hits": 10, "misses": 2, "hit_ratio": 0.8333},
+    }
+
+
+def issue_page_payload(count: int = 100) -> Any:
+    issues = [
+        Issue(issue_number=number, issue_state=IssueState.OPEN, version=3)
+        for number in range(count)
+    ]
+    # what FastAPI hands the response class for a response_model=IssuePage route
+    return TypeAdapter(List[Issue]).dump_python(issues, mode="json")
+
+
+def cases() -> Dict[str, Dict[str, Callable[[], Any]]]:
+    health = health_payload()
+    info = info_payload()
+    page = issue_page_payload()
+    result: Dict[str, Dict[str, Callable[[], Any]]] = {
+        "health": {
+            "model_dump+JSONResponse": lambda: JSONResponse(health.model_dump()),
+            "model_dump_json": lambda: health.model_dump_json().encode("utf-8"),
+        },
+        "info": {
+            "jsonable_encoder+JSONResponse": lambda: JSONResponse(jsonable_encoder(info)),
+            "DefaultJSONResponse": lambda: DefaultJSONResponse(info),
+        },
+        "issue_page_100": {
+            "JSONResponse": lambda: JSONResponse(page),
+            "DefaultJSONResponse": lambda: DefaultJSONResponse(page),
+        },
+    }
+    if orjson is not None:
+        result["health"]["ORJSONResponse"] = lambda: ORJSONResponse(health.model_dump())
+        result["info"]["ORJSONResponse"] = lambda: ORJSONResponse(info)
+        result["issue_page_100"]["ORJSONResponse"] = lambda: ORJSONResponse(page)
+    return result
+
+
+def run(rounds: int, warmup: int) -> List[BenchmarkResult]:
+    return [
+        summarize(f"serialize.{payload}", {"encoder": name}, measure(render, rounds, warmup))
+        for payload, encoders in cases().items()
+        for name, render in encoders.items()
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=5_000)
+    parser.add_argument("--warmup", type=int, default=500)
+    parser.add_argument("--output", help="also write the results as JSON")
+    args = parser.parse_args()
+
+    from loguru import logger
+
+    logger.remove()
+    results = run(args.rounds, args.warmup)
+    print_table(results)
+    if args.output:
+        write_json(args.output, results, vars(args))
+
+
+if __name__ == "__main__":
+    main()
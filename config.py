@@ -1,4 +1,4 @@
-from typing import List, Literal
+from typing import Dict, List, Literal
 
 from pydantic import AnyHttpUrl
 from pydantic_settings import (
@@ -22,6 +22,105 @@ class Settings(BaseSettings):
     current_env: Literal["testing", "default"]
     # Database credentials removed - now included directly in database_url_template
 
+    # Connection pool settings (server databases only, SQLite always uses StaticPool)
+    database_pool_size: int = 5
+    database_max_overflow: int = 10
+    database_pool_timeout: float = 30.0
+    database_pool_recycle: int = -1
+    database_pool_pre_ping: bool = False
+    database_pool_use_lifo: bool = False
+
+    # SQL logging: echo writes every statement, prefer the slow query log outside development
+    database_echo: bool = False
+    database_slow_query_ms: float | None = None
+    database_query_sample_rate: float = 0.0
+
+    # Optimistic concurrency: retries of a conflicting read-modify-write (see retry_on_conflict)
+    optimistic_lock_max_attempts: int = 3
+    optimistic_lock_backoff_seconds: float = 0.01
+
+    # Read-through issue cache, per worker process
+    issue_cache_enabled: bool = False
+    issue_cache_max_size: int = 10_000
+    issue_cache_ttl_seconds: float = 5.0
+    issue_negative_cache_enabled: bool = False
+    issue_negative_cache_max_size: int = 100_000
+    issue_negative_cache_ttl_seconds: float = 30.0
+
+    # Logging settings, see app/core/logging.py
+    log_level: str = "INFO"
+    log_format: Literal["text", "logfmt", "json"] = "text"
+    log_enqueue: bool = True
+    log_module_levels: Dict[str, str] = {}
+
+    # /readiness probes: each check is bounded by the timeout and its result cached for the ttl
+    readiness_probe_timeout_seconds: float = 1.0
+    readiness_cache_ttl_seconds: float = 2.0
+    readiness_pool_saturation_warn: float = 0.9
+    readiness_loop_lag_warn_ms: float = 100.0
+    readiness_loop_lag_fail_ms: float = 1000.0
+
+    # Event loop lag sampling and slow callback records, see app/core/loop_monitor.py
+    loop_monitor_enabled: bool = False
+    loop_monitor_slow_callback_ms: float = 100.0
+    loop_monitor_sample_interval_seconds: float = 0.5
+    loop_monitor_max_records: int = 100
+
+    # Background relay publishing the transactional outbox, see
+    # app/core/resource_adapters/outbox; the webhook sink POSTs each batch as JSON
+    outbox_relay_enabled: bool = False
+    outbox_batch_size: int = 100
+    outbox_poll_interval_seconds: float = 1.0
+    outbox_max_attempts: int = 10
+    outbox_sink: Literal["log", "webhook"] = "log"
+    outbox_webhook_url: str | None = None
+    outbox_webhook_timeout_seconds: float = 10.0
+    # how long a claimed batch is reserved for its relay, must outlast the webhook timeout
+    outbox_claim_lease_seconds: float = 60.0
+
+    # Event sourced issues snapshot their state every this many events, 0 never snapshots
+    event_snapshot_interval: int = 100
+
+    # Background runner keeping the issue metrics read model up to date with the event
+    # store, see app/core/resource_adapters/projections; a batch waits for a missing event
+    # id up to projection_gap_timeout_seconds before treating it as rolled back
+    projections_enabled: bool = False
+    projection_batch_size: int = 500
+    projection_poll_interval_seconds: float = 1.0
+    projection_gap_timeout_seconds: float = 5.0
+
+    # /v1/issues/analytics: rows per chunk read, and how long a result is reused (0 disables)
+    analytics_chunk_size: int = 10_000
+    analytics_cache_ttl_seconds: float = 60.0
+
+    # Inbox for GitHub issue events posted to /v1/inbox/github, see
+    # app/core/interface_adapters/inbox; requests wait at most inbox_max_delay_seconds for
+    # their batch insert, inbox_workers apply the stored events per issue
+    inbox_enabled: bool = False
+    inbox_github_secret: str | None = None
+    inbox_workers: int = 8
+    inbox_max_batch: int = 500
+    inbox_max_delay_seconds: float = 0.005
+    inbox_process_batch_size: int = 100
+    inbox_sweep_interval_seconds: float = 5.0
+    inbox_max_attempts: int = 5
+
+    # Per-request profiling, triggered by profiling_header carrying profiling_secret or by
+    # profiling_sample_rate; sampling writes collapsed stacks, cprofile writes .prof files
+    profiling_enabled: bool = False
+    profiling_secret: str | None = None
+    profiling_header: str = "X-Profile"
+    profiling_sample_rate: float = 0.0
+    profiling_mode: Literal["sampling", "cprofile"] = "sampling"
+    profiling_interval_ms: float = 1.0
+    profiling_output_dir: str = "profiles"
+
+    # Default response encoder: "auto" is orjson, see app/core/responses.py
+    json_response_class: Literal["auto", "orjson", "json"] = "auto"
+
+    # Prometheus metrics on /metrics, see app/core/metrics.py
+    metrics_enabled: bool = True
+
     # CORS settings
     backend_cors_origins: List[str] = ["http://localhost:8000", "http://localhost:3000"]
     cors_allow_credentials: bool = False
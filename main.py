@@ -1,9 +1,8 @@
 import datetime
-import uuid
-from typing import Annotated, Any, Dict, Optional
+from typing import Annotated, Any, Dict, Iterable, Optional
 
 from fastapi import Depends
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from loguru import logger
 from pydantic import BaseModel, Field
 
@@ -12,7 +11,28 @@ from config import Settings, get_settings
 # don't change ordering here, settings must be called prior to initialization of app.core.factory
 _settings = get_settings()
 
+from app.core.logging import configure_logging  # noqa: E402
+
+configure_logging(_settings)
+
 from app.core.factory import create_app  # noqa: E402
+from app.core.database import get_pool_status  # noqa: E402
+from app.core.health import FAIL, get_readiness_probes  # noqa: E402
+from app.core.loop_monitor import get_loop_monitor  # noqa: E402
+from app.core.resource_adapters.outbox import get_outbox_relay  # noqa: E402
+from app.core.metrics import CONTENT_TYPE, REGISTRY, MetricFamily  # noqa: E402
+from app.core.responses import get_response_class  # noqa: E402
+from app.core.middleware import (  # noqa: E402
+    MetricsMiddleware,
+    ProfilingMiddleware,
+    RequestContextMiddleware,
+)
+from app.features.issues.caching_repository import (  # noqa: E402
+    get_issue_cache,
+    get_missing_issue_cache,
+)
+from app.features.issues.metrics_projection import get_issue_metrics_runner  # noqa: E402
+from app.features.issues.webhooks import get_issue_inbox  # noqa: E402
 
 # https://brandur.org/logfmt
 # https://github.com/Delgan/loguru
@@ -22,8 +42,8 @@ from app.core.factory import create_app  # noqa: E402
 def isRunning(settings: Settings) -> bool:
     # logger.info(f"App state: {dict(app.state.__dict__)}")
     running = getattr(app.state, "running", False)
-    logger.info(f"Running state: {running}")
-    logger.info(f"Environment: {settings.current_env}")
+    logger.info("Running state: {}", running)
+    logger.info("Environment: {}", settings.current_env)
     return running
 
 
@@ -64,7 +84,7 @@ class HealthCheck(BaseModel):
     )
 
 
-def create_health_response(is_healthy: bool, check_name: str) -> JSONResponse:
+def create_health_response(is_healthy: bool, check_name: str) -> Response:
     """Create a standardized health check response."""
     status = "pass" if is_healthy else "fail"
     response = HealthCheck(
@@ -80,9 +100,27 @@ def create_health_response(is_healthy: bool, check_name: str) -> JSONResponse:
         },
     )
 
-    return JSONResponse(
+    # serialized once by pydantic-core, rather than model_dump() and a second JSON encode
+    return Response(
         status_code=200 if is_healthy else 503,
-        content=response.model_dump(),
+        content=response.model_dump_json(),
+        media_type="application/health+json",
+    )
+
+
+def create_checks_response(status: str, checks: Dict[str, Dict[str, Any]]) -> Response:
+    """Health response for probes that report their own status per check."""
+    response = HealthCheck(
+        status=status,
+        version=get_settings().project_name,
+        env=get_settings().current_env,
+        description=f"Service {status}",
+        checks=checks,
+    )
+
+    return Response(
+        status_code=503 if status == FAIL else 200,
+        content=response.model_dump_json(),
         media_type="application/health+json",
     )
 
@@ -109,26 +147,13 @@ app = create_app(_settings)
 # request IDs
 
 
-@app.middleware("http")
-async def add_request_id(request, call_next):
-    request_id = str(uuid.uuid4())
-    request.state.request_id = request_id
-    response = await call_next(request)
-    response.headers["X-Request-ID"] = request_id
-    logger.info(f"Request {request_id} to {request.url.path}")
-    return response
-
-
-@app.middleware("http")
-async def add_process_time_header(request, call_next):
-    import time
-
-    start_time = time.perf_counter()
-    response = await call_next(request)
-    process_time = time.perf_counter() - start_time
-    response.headers["X-Process-Time"] = str(process_time)
-    logger.info(f"Request to {request.url.path} took {process_time:.4f} seconds")
-    return response
+# innermost, so profiles are named after the request id set below
+if _settings.profiling_enabled:
+    app.add_middleware(ProfilingMiddleware, settings=_settings)
+# request ids and X-Process-Time, as a single pure ASGI middleware
+app.add_middleware(RequestContextMiddleware)
+if _settings.metrics_enabled:
+    app.add_middleware(MetricsMiddleware)
 
 
 @app.get("/")
@@ -140,14 +165,108 @@ async def root(settings: Annotated[Settings, Depends(get_settings)]) -> Dict[str
 
 
 @app.get("/info")
-async def info(settings: Annotated[Settings, Depends(get_settings)]) -> Dict[str, Any]:
-    return {
+async def info(settings: Annotated[Settings, Depends(get_settings)]) -> Response:
+    issue_cache = get_issue_cache(settings)
+    missing_issue_cache = get_missing_issue_cache(settings)
+    loop_monitor = get_loop_monitor(settings)
+    outbox_relay = get_outbox_relay(settings)
+    inbox = get_issue_inbox(settings)
+    metrics_projection = get_issue_metrics_runner(settings)
+    content = {
         "app_name": settings.project_name,
         "system_time": datetime.datetime.now(),
         "database_type": settings.database_type,
         "env": settings.current_env,
-        "settings": settings.model_dump(),
+        # webhook urls often embed a token
+        "settings": settings.model_dump(
+            exclude={"profiling_secret", "outbox_webhook_url", "inbox_github_secret"}
+        ),
+        "pool": get_pool_status(),
+        "issue_cache": issue_cache.stats.as_dict() if issue_cache else None,
+        "missing_issue_cache": (
+            missing_issue_cache.stats.as_dict() if missing_issue_cache else None
+        ),
+        "event_loop": loop_monitor.as_dict() if loop_monitor else None,
+        "outbox_relay": outbox_relay.as_dict() if outbox_relay else None,
+        "inbox": inbox.as_dict() if inbox else None,
+        "issue_metrics_projection": metrics_projection.as_dict() if metrics_projection else None,
     }
+    # returned as a response, so FastAPI skips its validation and jsonable_encoder passes
+    return get_response_class(settings)(content=content)
+
+
+_POOL_GAUGES = {
+    "size": ("db_pool_size", "Connections kept in the pool."),
+    "checked_out": ("db_pool_checked_out", "Connections currently checked out."),
+    "overflow": ("db_pool_overflow", "Overflow connections above pool_size."),
+    "saturation": ("db_pool_saturation", "Checked out share of pool_size + max_overflow."),
+}
+_POOL_COUNTERS = {
+    "checkouts": ("db_pool_checkouts_total", "Connection checkouts."),
+    "checkout_timeouts": ("db_pool_checkout_timeouts_total", "Checkouts that timed out."),
+}
+_CACHE_COUNTERS = ("hits", "misses", "evictions", "expirations")
+
+
+def runtime_metrics() -> Iterable[MetricFamily]:
+    """Pool and cache state, read on each scrape from the same sources as /info."""
+    settings = get_settings()
+    families: Dict[str, MetricFamily] = {}
+
+    def add(name: str, type_: str, documentation: str, labels: Any, value: float) -> None:
+        family = families.setdefault(name, MetricFamily(name, type_, documentation))
+        family.samples.append((name, labels, value))
+
+    for engine, status in get_pool_status().items():
+        for key, (name, documentation) in _POOL_GAUGES.items():
+            if status.get(key) is not None:
+                add(name, "gauge", documentation, (("engine", engine),), status[key])
+        for key, (name, documentation) in _POOL_COUNTERS.items():
+            if key in status:
+                add(name, "counter", documentation, (("engine", engine),), status[key])
+
+    caches = {
+        "issue": get_issue_cache(settings),
+        "missing_issue": get_missing_issue_cache(settings),
+    }
+    for cache_name, cache in caches.items():
+        if cache is None:
+            continue
+        labels = (("cache", cache_name),)
+        for key in _CACHE_COUNTERS:
+            add(f"cache_{key}_total", "counter", f"Cache {key}.", labels, getattr(cache.stats, key))
+        add("cache_hit_ratio", "gauge", "Hits over lookups.", labels, cache.stats.hit_ratio)
+
+    outbox_relay = get_outbox_relay(settings)
+    if outbox_relay is not None:
+        add(
+            "outbox_oldest_pending_age_seconds",
+            "gauge",
+            "Age of the oldest outbox message the relay last claimed, 0 when none was pending.",
+            (),
+            outbox_relay.oldest_pending_age_seconds,
+        )
+    metrics_projection = get_issue_metrics_runner(settings)
+    if metrics_projection is not None:
+        add(
+            "projection_lag_events",
+            "gauge",
+            "Event store events not yet applied, as of the projection's last batch.",
+            (("projection", metrics_projection.projection.name),),
+            metrics_projection.lag_events,
+        )
+    return families.values()
+
+
+REGISTRY.register_collector(runtime_metrics)
+
+
+if _settings.metrics_enabled:
+
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics() -> Response:
+        """Prometheus text format metrics."""
+        return Response(REGISTRY.render(), media_type=CONTENT_TYPE)
 
 
 # Health check endpoints
@@ -162,7 +281,7 @@ async def info(settings: Annotated[Settings, Depends(get_settings)]) -> Dict[str
 @app.get("/health", response_class=JSONResponse)
 async def health_check(
     settings: Annotated[Settings, Depends(get_settings)],
-) -> JSONResponse:
+) -> Response:
     """Overall service health check."""
     return create_health_response(isRunning(settings), "service")
 
@@ -170,7 +289,7 @@ async def health_check(
 @app.get("/liveness", response_class=JSONResponse)
 async def liveness_check(
     settings: Annotated[Settings, Depends(get_settings)],
-) -> JSONResponse:
+) -> Response:
     """Service liveness check."""
     return create_health_response(isRunning(settings), "liveness")
 
@@ -178,7 +297,7 @@ async def liveness_check(
 @app.get("/startup", response_class=JSONResponse)
 async def startup_check(
     settings: Annotated[Settings, Depends(get_settings)],
-) -> JSONResponse:
+) -> Response:
     """Startup health check."""
     return create_health_response(isRunning(settings), "startup")
 
@@ -186,15 +305,23 @@ async def startup_check(
 @app.get("/readiness", response_class=JSONResponse)
 async def readiness_check(
     settings: Annotated[Settings, Depends(get_settings)],
-) -> JSONResponse:
-    """Service readiness check."""
-    return create_health_response(isRunning(settings), "readiness")
+) -> Response:
+    """
+    Service readiness check.
+
+    Runs the database, pool saturation and event loop lag probes; each result is cached
+    for readiness_cache_ttl_seconds so frequent probing doesn't compete with traffic.
+    """
+    if not isRunning(settings):
+        return create_health_response(False, "readiness")
+    status, checks = await get_readiness_probes(settings).run()
+    return create_checks_response(status, checks)
 
 
 @app.get("/smoke", response_class=JSONResponse)
 async def smoke_check(
     settings: Annotated[Settings, Depends(get_settings)],
-) -> JSONResponse:
+) -> Response:
     """Configuration smoke test."""
     return create_health_response(is_configured(settings), "configuration")
 
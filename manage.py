@@ -0,0 +1,218 @@
+"""
+Management commands.
+
+    uv run python manage.py import-issues issues.ndjson --batch-size 5000
+    uv run python manage.py loadtest --concurrency 64 --duration 30
+    uv run python manage.py rebuild-projections --batch-size 10000
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List
+
+from config import Settings, get_settings
+
+# don't change ordering here, settings must be called prior to initialization of app modules
+_settings = get_settings()
+
+from app.core.resource_adapters.persistence.sqlmodel.bulk import batched  # noqa: E402
+from app.features.issues.github_import import read_github_issues  # noqa: E402
+from app.features.issues.metrics_projection import REBUILD_BATCH_SIZE  # noqa: E402
+from app.features.issues.repository import (  # noqa: E402
+    COPY_MIN_ROWS,
+    UPSERT_BATCH_SIZE,
+)
+
+
+def _import_sync(
+    settings: Settings, batches: Iterable[List[Dict[str, Any]]], args: argparse.Namespace
+) -> int:
+    from sqlmodel import Session
+
+    from app.core.database import get_engine
+    from app.features.issues.repository import SQLModelIssueRepository
+
+    count = 0
+    repo = SQLModelIssueRepository(Session(get_engine(settings)))
+    for batch in batches:
+        # one transaction per batch keeps locks and WAL growth bounded on large imports
+        with repo:
+            count += repo.upsert_many(
+                batch, batch_size=args.batch_size, copy_min_rows=args.copy_min_rows
+            )
+    return count
+
+
+async def _import_async(
+    settings: Settings, batches: Iterable[List[Dict[str, Any]]], args: argparse.Namespace
+) -> int:
+    from app.core.database import (
+        dispose_engines,
+        get_async_sessionmaker,
+        init_async_database,
+    )
+    from app.features.issues.repository import AsyncSQLModelIssueRepository
+
+    count = 0
+    try:
+        await init_async_database(settings)
+        sessionmaker = get_async_sessionmaker(settings)
+        for batch in batches:
+            async with AsyncSQLModelIssueRepository(sessionmaker()) as repo:
+                count += await repo.upsert_many(
+                    batch, batch_size=args.batch_size, copy_min_rows=args.copy_min_rows
+                )
+    finally:
+        # pooled aiosqlite connections would keep the process alive after asyncio.run
+        await dispose_engines()
+    return count
+
+
+def import_issues(args: argparse.Namespace) -> int:
+    batches = batched(read_github_issues(args.path), args.batch_size)
+    start = time.perf_counter()
+    if _settings.is_async_database:
+        count = asyncio.run(_import_async(_settings, batches, args))
+    else:
+        count = _import_sync(_settings, batches, args)
+    elapsed = time.perf_counter() - start
+    rate = count / elapsed if elapsed > 0 else 0.0
+    print(f"imported {count} issues in {elapsed:.2f}s ({rate:,.0f} rows/sec)")
+    return 0
+
+
+def loadtest(args: argparse.Namespace) -> int:
+    from benchmarks.loadtest import LoadTestConfig, parse_mix, run
+
+    server_env = dict(item.split("=", 1) for item in args.server_env)
+    config = LoadTestConfig(
+        url=args.url or "",
+        mix=parse_mix(args.mix),
+        concurrency=args.concurrency,
+        duration_seconds=args.duration,
+        warmup_seconds=args.warmup,
+        rate=args.rate,
+        timeout_seconds=args.timeout,
+        issues=args.issues,
+        seed=args.seed,
+    )
+    schema = args.schema or _settings.database_schema
+    print(run(config, args.database_url, schema, server_env, args.workers))
+    return 0
+
+
+async def _rebuild_async(settings: Settings, args: argparse.Namespace) -> int:
+    from app.core.database import (
+        dispose_engines,
+        get_async_sessionmaker,
+        init_async_database,
+    )
+    from app.core.resource_adapters.projections import ProjectionRunner
+    from app.features.issues.metrics_projection import IssueMetricsProjection
+
+    try:
+        await init_async_database(settings)
+        runner = ProjectionRunner(
+            get_async_sessionmaker(settings),
+            IssueMetricsProjection(),
+            gap_timeout_seconds=settings.projection_gap_timeout_seconds,
+        )
+        return await runner.rebuild(args.batch_size)
+    finally:
+        # pooled aiosqlite connections would keep the process alive after asyncio.run
+        await dispose_engines()
+
+
+def rebuild_projections(args: argparse.Namespace) -> int:
+    from app.features.issues.metrics_projection import PROJECTION_NAME
+
+    start = time.perf_counter()
+    count = asyncio.run(_rebuild_async(_settings, args))
+    elapsed = time.perf_counter() - start
+    rate = count / elapsed if elapsed > 0 else 0.0
+    print(
+        f"rebuilt {PROJECTION_NAME} from {count} events in {elapsed:.2f}s "
+        f"({rate:,.0f} events/sec)"
+    )
+    return 0
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="python-template management commands")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    import_parser = commands.add_parser(
+        "import-issues", help="bulk insert/update issues from a GitHub issues export"
+    )
+    import_parser.add_argument(
+        "path", type=Path, help="export file: .ndjson/.jsonl, a JSON array or one issue"
+    )
+    import_parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=UPSERT_BATCH_SIZE,
+        help="rows per upsert batch and transaction",
+    )
+    import_parser.add_argument(
+        "--copy-min-rows",
+        type=int,
+        default=COPY_MIN_ROWS,
+        help="Postgres batches at least this large are loaded with COPY",
+    )
+    import_parser.set_defaults(handler=import_issues)
+
+    load_parser = commands.add_parser(
+        "loadtest", help="drive a local uvicorn server and report latency percentiles"
+    )
+    load_parser.add_argument(
+        "--url", help="target a running server instead of starting one (no seeding)"
+    )
+    load_parser.add_argument(
+        "--database-url",
+        help="database for the started server, defaults to a temporary SQLite file",
+    )
+    load_parser.add_argument("--schema", help="database schema for server databases")
+    load_parser.add_argument(
+        "--server-env",
+        action="append",
+        default=[],
+        metavar="KEY=VALUE",
+        help="extra environment for the server, e.g. APP_DATABASE_POOL_SIZE=5",
+    )
+    load_parser.add_argument("--workers", type=int, default=1, help="uvicorn workers")
+    load_parser.add_argument(
+        "--mix", default="analyze=9,health=1", help="endpoint weights, e.g. analyze=9,health=1"
+    )
+    load_parser.add_argument("--concurrency", type=int, default=32)
+    load_parser.add_argument("--duration", type=float, default=10.0, help="seconds")
+    load_parser.add_argument(
+        "--warmup", type=float, default=2.0, help="seconds excluded from the report"
+    )
+    load_parser.add_argument(
+        "--rate", type=float, help="requests/sec, open loop; omit to saturate the server"
+    )
+    load_parser.add_argument("--timeout", type=float, default=10.0, help="request timeout")
+    load_parser.add_argument("--issues", type=int, default=10_000, help="issues to seed")
+    load_parser.add_argument("--seed", type=int, default=1234)
+    load_parser.set_defaults(handler=loadtest)
+
+    rebuild_parser = commands.add_parser(
+        "rebuild-projections", help="reset the issue metrics read model and replay all events"
+    )
+    rebuild_parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=REBUILD_BATCH_SIZE,
+        help="events read, applied and committed per batch",
+    )
+    rebuild_parser.set_defaults(handler=rebuild_projections)
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -9,3 +9,101 @@ CREATE TABLE "issue_analysis"."issue" (
     PRIMARY KEY ("issue_number")
 );
 
+-- Create "outbox" table in the issue_analysis schema
+CREATE TABLE "issue_analysis"."outbox" (
+    "id" serial NOT NULL,
+    "event_id" varchar NOT NULL,
+    "event_type" varchar NOT NULL,
+    "aggregate_type" varchar NOT NULL,
+    "aggregate_id" varchar NOT NULL,
+    "payload" json NOT NULL,
+    "created_at" timestamptz NOT NULL,
+    "published_at" timestamptz NULL,
+    "claimed_until" timestamptz NULL,
+    "attempts" integer NOT NULL,
+    "last_error" varchar NULL,
+    PRIMARY KEY ("id"),
+    CONSTRAINT "outbox_event_id_key" UNIQUE ("event_id")
+);
+
+-- Pending messages only, scanned by the outbox relay's claim query
+CREATE INDEX "ix_outbox_pending" ON "issue_analysis"."outbox" ("id") WHERE ("published_at" IS NULL);
+
+-- Create "inbox" table in the issue_analysis schema
+CREATE TABLE "issue_analysis"."inbox" (
+    "id" serial NOT NULL,
+    "event_id" varchar NOT NULL,
+    "event_type" varchar NOT NULL,
+    "aggregate_id" varchar NOT NULL,
+    "payload" text NOT NULL,
+    "occurred_at" timestamptz NOT NULL,
+    "received_at" timestamptz NOT NULL,
+    "processed_at" timestamptz NULL,
+    "attempts" integer NOT NULL,
+    "last_error" varchar NULL,
+    PRIMARY KEY ("id"),
+    CONSTRAINT "inbox_event_id_key" UNIQUE ("event_id")
+);
+
+-- Pending events per aggregate in processing order, scanned by the inbox workers
+CREATE INDEX "ix_inbox_pending" ON "issue_analysis"."inbox" ("aggregate_id", "occurred_at", "id") WHERE ("processed_at" IS NULL);
+
+
+-- Create "event_store" table in the issue_analysis schema
+CREATE TABLE "issue_analysis"."event_store" (
+    "id" serial NOT NULL,
+    "aggregate_type" varchar NOT NULL,
+    "aggregate_id" varchar NOT NULL,
+    "version" integer NOT NULL,
+    "event_id" varchar NOT NULL,
+    "event_type" varchar NOT NULL,
+    "payload" json NOT NULL,
+    "recorded_at" timestamptz NOT NULL,
+    PRIMARY KEY ("id"),
+    CONSTRAINT "event_store_event_id_key" UNIQUE ("event_id"),
+    -- the optimistic lock: one event per aggregate version, also the rehydration index
+    CONSTRAINT "uq_event_store_aggregate_version" UNIQUE ("aggregate_type", "aggregate_id", "version")
+);
+
+-- Create "event_snapshot" table in the issue_analysis schema
+CREATE TABLE "issue_analysis"."event_snapshot" (
+    "aggregate_type" varchar NOT NULL,
+    "aggregate_id" varchar NOT NULL,
+    "version" integer NOT NULL,
+    "state" json NOT NULL,
+    "created_at" timestamptz NOT NULL,
+    PRIMARY KEY ("aggregate_type", "aggregate_id", "version")
+);
+
+-- Create "projection_checkpoint" table in the issue_analysis schema
+CREATE TABLE "issue_analysis"."projection_checkpoint" (
+    "name" varchar NOT NULL,
+    "position" integer NOT NULL,
+    "updated_at" timestamptz NOT NULL,
+    PRIMARY KEY ("name")
+);
+
+-- Create "issue_metrics_lifecycle" table in the issue_analysis schema
+CREATE TABLE "issue_analysis"."issue_metrics_lifecycle" (
+    "issue_number" integer NOT NULL,
+    "issue_state" varchar NULL,
+    "opened_at" timestamptz NULL,
+    PRIMARY KEY ("issue_number")
+);
+
+-- Create "issue_metrics_count" table in the issue_analysis schema
+CREATE TABLE "issue_analysis"."issue_metrics_count" (
+    "metric" varchar NOT NULL,
+    "key" varchar NOT NULL,
+    "value" integer NOT NULL,
+    PRIMARY KEY ("metric", "key")
+);
+
+-- Create "issue_metrics_close_daily" table in the issue_analysis schema
+CREATE TABLE "issue_analysis"."issue_metrics_close_daily" (
+    "day" date NOT NULL,
+    "closed_count" integer NOT NULL,
+    "timed_count" integer NOT NULL,
+    "time_to_close_seconds" double precision NOT NULL,
+    PRIMARY KEY ("day")
+);
@@ -1,3 +1,4 @@
+import asyncio
 import os
 import sys
 from contextlib import asynccontextmanager
@@ -9,7 +10,10 @@ from dotenv import load_dotenv
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
 from loguru import logger
-from sqlmodel import Session, delete
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+from sqlmodel import Session, SQLModel, delete
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 # Add the project root to the Python path to ensure imports work correctly
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))) 
@@ -28,8 +32,7 @@ settings = get_settings()
 
 # Import these after settings are loaded
 from app.core.factory import create_app
-from app.core.database import get_engine
-from app.domain.issue import Issue
+from app.core.database import async_database_url, get_engine
 
 
 def pytest_unconfigure(config: Config) -> None:
@@ -63,14 +66,50 @@ def test_app():
     return create_app(settings)
 
 
+def _clean_database(session: Session) -> None:
+    for table in reversed(SQLModel.metadata.sorted_tables):
+        session.exec(delete(table))
+    session.commit()
+
+
 @pytest.fixture(name="session")
 def test_session():
-    """Session fixture for testing environment using test database."""
+    """Session on the test database, whose tables are emptied before and after the test."""
     with Session(get_engine(settings)) as session:
+        _clean_database(session)
         yield session
-        statement = delete(Issue)
-        session.exec(statement)
-        session.commit()
+        _clean_database(session)
+
+
+@pytest.fixture(name="async_session_factory")
+def async_session_factory_fixture(session: Session):
+    """
+    AsyncSession factory on the test database, for code that takes a session factory.
+
+    Depends on the session fixture, so the tables start and end empty; a test asserting
+    on what the async code wrote requests session too.
+
+    NullPool opens a connection per session, so every asyncio.run of a test can use it.
+    """
+    url, _ = async_database_url(settings.database_url)
+    engine = create_async_engine(url, poolclass=NullPool)
+    yield lambda: AsyncSession(engine, expire_on_commit=False)
+    asyncio.run(engine.dispose())
+
+
+class FakeClock:
+    """A monotonic clock for TTL tests, set now to move it."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture(name="clock")
+def clock_fixture() -> FakeClock:
+    return FakeClock()
 
 
 @pytest.fixture(name="client")
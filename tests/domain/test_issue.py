@@ -1,6 +1,31 @@
+from datetime import datetime, timezone
+
 import pytest
 
-from app.domain.issue import IssueState, IssueTransitionType
+from app.domain.issue import (
+    Issue,
+    IssueEvent,
+    IssueEventType,
+    IssueState,
+    IssueTransitionState,
+    IssueTransitionType,
+)
+
+
+def make_event(event_type: IssueEventType, **kwargs) -> IssueEvent:
+    fields = dict(
+        event_id=f"{event_type.value}-1",
+        timestamp=datetime(2025, 1, 1, tzinfo=timezone.utc),
+        issue_number=1,
+        issue_state=IssueState.OPEN,
+        issue_state_transition=None,
+        issue_event_type=event_type,
+        changes={},
+        previous_title="",
+        previous_body="",
+    )
+    fields.update(kwargs)
+    return IssueEvent(**fields)
 
 
 def test_initial_state():
@@ -68,3 +93,66 @@ def test_transitions_immutability():
             "from": IssueState.OPEN.value,
             "to": IssueState.CLOSED.value,
         }
+
+
+def test_apply_handles_every_event_type():
+    """Test that replaying one event of each type builds the expected state"""
+    issue = Issue(issue_number=1, version=0)
+    events = [
+        make_event(IssueEventType.OPENED, changes={"title": "Crash", "body": "on start"}),
+        make_event(IssueEventType.EDITED, changes={"title": "Crash on start"}),
+        make_event(IssueEventType.ASSIGNED, assignee="octocat"),
+        make_event(IssueEventType.ASSIGNED, assignee="hubot"),
+        make_event(IssueEventType.UNASSIGNED, assignee="hubot"),
+        make_event(IssueEventType.LABLED, label="bug"),
+        make_event(IssueEventType.LABLED, label="wontfix"),
+        make_event(IssueEventType.UNLABLED, label="wontfix"),
+        make_event(
+            IssueEventType.CLOSED,
+            issue_state=IssueState.CLOSED,
+            issue_state_transition=IssueTransitionState.COMPLETED,
+        ),
+    ]
+    assert {event.issue_event_type for event in events} == set(IssueEventType) - {
+        IssueEventType.REOPENED
+    }
+    for event in events:
+        issue.apply(event)
+
+    assert issue.issue_state == IssueState.CLOSED
+    assert (issue.title, issue.body) == ("Crash on start", "on start")
+    assert issue.assignees == {"octocat"}
+    assert issue.labels == {"bug"}
+    # the event store numbers events, apply leaves the version alone
+    assert issue.version == 0
+
+    issue.apply(make_event(IssueEventType.REOPENED))
+    assert issue.issue_state == IssueState.OPEN
+
+
+def test_snapshot_restore_round_trip():
+    """Test that a restored snapshot has the state it was taken from"""
+    issue = Issue(issue_number=7, version=0)
+    issue.apply(make_event(IssueEventType.OPENED, changes={"title": "t", "body": "b"}))
+    issue.apply(make_event(IssueEventType.LABLED, label="bug"))
+
+    restored = Issue.restore(7, 2, issue.snapshot())
+
+    assert restored.version == 2
+    assert restored.snapshot() == issue.snapshot()
+    # private state stays out of the API representation
+    assert restored.model_dump() == {
+        "issue_number": 7,
+        "issue_state": IssueState.OPEN,
+        "version": 2,
+    }
+
+
+def test_event_dict_round_trip():
+    """Test that events survive the JSON form they are stored in"""
+    event = make_event(IssueEventType.ASSIGNED, assignee="octocat")
+
+    restored = IssueEvent.from_dict(event.to_dict())
+
+    assert restored.to_dict() == event.to_dict()
+    assert restored.timestamp == event.timestamp
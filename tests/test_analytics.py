@@ -0,0 +1,123 @@
+import asyncio
+
+import numpy as np
+from fastapi.testclient import TestClient
+from sqlmodel import Session, select
+
+from app.core.resource_adapters.persistence.sqlmodel.event_store import StoredEvent
+from app.domain.issue import Issue, IssueEventType, IssueState
+from app.features.issues import EventSourcedIssueRepository, analytics
+from app.features.issues.analytics import (
+    EventColumns,
+    IssueColumns,
+    compute_issue_analytics,
+    encode_event_types,
+    encode_issue_states,
+)
+from benchmarks.analytics import naive_issue_analytics
+from conftest import settings
+from tests.domain.test_issue import make_event
+
+CLOSED, OPENED, REOPENED, LABLED = (
+    IssueEventType.CLOSED.value,
+    IssueEventType.OPENED.value,
+    IssueEventType.REOPENED.value,
+    IssueEventType.LABLED.value,
+)
+
+
+def _events(*rows):
+    numbers, versions, event_types = zip(*rows, strict=True)
+    return EventColumns(
+        issue_number=np.array(numbers, dtype=np.int64),
+        version=np.array(versions, dtype=np.int64),
+        event_type=encode_event_types(event_types),
+    )
+
+
+def test_transitions_follow_each_issue_in_version_order():
+    issues = IssueColumns(
+        issue_number=np.array([1, 2, 3]),
+        issue_state=encode_issue_states(["OPEN", "CLOSED", "OPEN"]),
+        version=np.array([5, 2, 1]),
+    )
+    # deliberately out of order, and issue 3 was first seen being reopened
+    events = _events(
+        (2, 2, CLOSED),
+        (1, 3, CLOSED),
+        (1, 1, OPENED),
+        (3, 1, REOPENED),
+        (1, 2, LABLED),
+        (1, 5, REOPENED),
+        (2, 1, OPENED),
+        (1, 4, LABLED),
+    )
+
+    result = compute_issue_analytics(issues, events)
+
+    assert result.state_distribution == {"CLOSED": 1, "OPEN": 2}
+    assert result.event_type_counts == {"CLOSED": 2, "LABLED": 2, "OPENED": 2, "REOPENED": 2}
+    assert result.transitions == {"NEW->OPEN": 3, "OPEN->CLOSED": 2, "CLOSED->OPEN": 1}
+    assert (result.issues_closed, result.issues_reopened) == (2, 2)
+    # issue 3 was reopened but never seen closed, only issue 1 counts towards the rate
+    assert result.reopen_rate == 0.5
+    assert result.events_per_issue.max == 5
+
+
+def test_empty_fleet():
+    empty = np.array([], dtype=np.int64)
+    issues = IssueColumns(empty, encode_issue_states([]), empty)
+    events = EventColumns(empty, empty, encode_event_types([]))
+
+    result = compute_issue_analytics(issues, events)
+
+    assert (result.issues, result.events, result.transitions) == (0, 0, {})
+    assert result.reopen_rate is None
+    assert result.events_per_issue is None
+
+
+def test_analytics_endpoint_matches_the_naive_loop(
+    client: TestClient, session: Session, async_session_factory, monkeypatch
+):
+    monkeypatch.setattr(analytics, "_analytics_cache", None)
+
+    async def scenario():
+        for number in range(1, 6):
+            history = [IssueEventType.OPENED, IssueEventType.CLOSED] + [
+                IssueEventType.REOPENED,
+                IssueEventType.CLOSED,
+            ] * (number % 3)
+            async with EventSourcedIssueRepository(async_session_factory()) as repo:
+                await repo.append(
+                    Issue(issue_number=number, version=0),
+                    [
+                        make_event(event_type, event_id=f"{number}-{index}", issue_number=number)
+                        for index, event_type in enumerate(history)
+                    ],
+                )
+
+    asyncio.run(scenario())
+    for number in range(1, 6):
+        state = IssueState.CLOSED if number % 2 else IssueState.OPEN
+        session.add(Issue(issue_number=number, issue_state=state))
+    session.commit()
+
+    response = client.get("/v1/issues/analytics")
+
+    assert response.status_code == 200
+    expected = naive_issue_analytics(
+        session.exec(select(Issue)).all(),
+        session.exec(select(StoredEvent)).all(),
+    )
+    assert response.json() == expected.model_dump()
+    assert response.json()["transitions"] == {
+        "NEW->OPEN": 5,
+        "OPEN->CLOSED": 11,
+        "CLOSED->OPEN": 6,
+    }
+
+    # reused until the TTL expires, however the issues change meanwhile
+    session.add(Issue(issue_number=6))
+    session.commit()
+    assert client.get("/v1/issues/analytics").json() == expected.model_dump()
+    assert analytics.get_analytics_cache(settings).stats.hits == 1
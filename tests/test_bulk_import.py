@@ -0,0 +1,63 @@
+import json
+
+from sqlmodel import Session
+
+from app.core.resource_adapters.persistence.sqlmodel.bulk import last_per_key
+from app.domain.issue import Issue, IssueState
+from app.features.issues.github_import import read_github_issues
+from app.features.issues.repository import SQLModelIssueRepository
+
+
+def test_upsert_many_inserts_and_updates(session: Session):
+    uow = SQLModelIssueRepository(session)
+    with uow:
+        uow.add(Issue(issue_number=1, issue_state=IssueState.OPEN))
+        uow.add(Issue(issue_number=2, issue_state=IssueState.OPEN))
+
+    rows = [
+        {"issue_number": 1, "issue_state": IssueState.CLOSED, "version": 0},
+        {"issue_number": 2, "issue_state": IssueState.OPEN, "version": 0},
+        Issue(issue_number=3, issue_state=IssueState.OPEN),
+    ]
+    with uow:
+        assert uow.upsert_many(rows, batch_size=2) == 3
+
+    with uow:
+        issues = {issue.issue_number: issue for issue in uow.list()}
+        assert sorted(issues) == [1, 2, 3]
+        # changed rows are updated and their version bumped, unchanged rows are left alone
+        assert issues[1].issue_state == IssueState.CLOSED
+        assert issues[1].version == 1
+        assert issues[2].version == 0
+
+
+def test_copy_batches_keep_the_last_row_per_key():
+    rows = [
+        {"issue_number": 1, "issue_state": IssueState.OPEN},
+        {"issue_number": 2, "issue_state": IssueState.OPEN},
+        {"issue_number": 1, "issue_state": IssueState.CLOSED},
+    ]
+    # a staged batch is merged by one INSERT ... SELECT, which cannot touch a row twice
+    assert last_per_key(rows, ["issue_number"]) == [
+        {"issue_number": 1, "issue_state": IssueState.CLOSED},
+        {"issue_number": 2, "issue_state": IssueState.OPEN},
+    ]
+
+
+def test_read_github_issues(tmp_path):
+    with open("app/domain/issue.json", encoding="utf-8") as file:
+        sample = json.load(file)
+
+    single = tmp_path / "issue.json"
+    single.write_text(json.dumps(sample))
+    assert list(read_github_issues(single)) == [
+        {"issue_number": 1347, "issue_state": IssueState.OPEN, "version": 0}
+    ]
+
+    lines = tmp_path / "issues.ndjson"
+    lines.write_text(
+        "\n".join(json.dumps({**sample, "number": n, "state": "closed"}) for n in (1, 2))
+        + "\n"
+    )
+    assert [row["issue_number"] for row in read_github_issues(lines)] == [1, 2]
+    assert all(row["issue_state"] == IssueState.CLOSED for row in read_github_issues(lines))
@@ -0,0 +1,108 @@
+import asyncio
+
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core import health
+from app.core.health import FAIL, PASS, CachedProbe, database_check
+from conftest import settings
+from main import app
+
+
+def test_probe_result_is_cached_for_ttl(clock):
+    calls = []
+
+    async def check():
+        calls.append(1)
+        return PASS, None
+
+    probe = CachedProbe("db", check, timeout_seconds=1, ttl_seconds=5, clock=clock)
+
+    async def scenario():
+        _, cached = await probe.run()
+        assert not cached
+        _, cached = await probe.run()
+        assert cached
+        clock.now = 6
+        _, cached = await probe.run()
+        assert not cached
+
+    asyncio.run(scenario())
+    assert len(calls) == 2
+
+
+def test_concurrent_probes_share_one_check():
+    calls = []
+
+    async def check():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return PASS, None
+
+    probe = CachedProbe("db", check, timeout_seconds=1, ttl_seconds=5)
+
+    async def scenario():
+        return await asyncio.gather(*(probe.run() for _ in range(10)))
+
+    results = asyncio.run(scenario())
+    assert len(calls) == 1
+    assert {result.status for result, _ in results} == {PASS}
+
+
+def test_probe_timeout_fails():
+    async def check():
+        await asyncio.sleep(1)
+        return PASS, None
+
+    probe = CachedProbe("db", check, timeout_seconds=0.01, ttl_seconds=5)
+    result, _ = asyncio.run(probe.run())
+
+    assert result.status == FAIL
+    assert "timed out" in result.output
+    assert result.response_time_seconds < 0.5
+
+
+def test_probe_exception_fails():
+    async def check():
+        raise ConnectionError("refused")
+
+    probe = CachedProbe("db", check, timeout_seconds=1, ttl_seconds=5)
+    result, _ = asyncio.run(probe.run())
+
+    assert result.status == FAIL
+    assert result.output == "ConnectionError: refused"
+
+
+def test_database_check_probes_the_engine_serving_requests(monkeypatch):
+    # the sync engine is fine, but requests go through the async one
+    assert not settings.is_async_database
+    async def refuse():
+        raise ConnectionRefusedError("async pool down")
+
+    broken = create_async_engine("sqlite+aiosqlite://", async_creator=refuse)
+    monkeypatch.setattr(health, "get_async_engine", lambda _settings: broken)
+
+    probe = CachedProbe("database", database_check(settings), timeout_seconds=1, ttl_seconds=5)
+
+    async def scenario():
+        try:
+            return await probe.run()
+        finally:
+            await broken.dispose()
+
+    result, _ = asyncio.run(scenario())
+
+    assert result.status == FAIL
+    assert "async pool down" in result.output
+
+
+def test_readiness_runs_dependency_checks():
+    with TestClient(app) as client:
+        response = client.get("/readiness")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["status"] == PASS
+    assert set(data["checks"]) == {"database", "pool:saturation", "eventLoop:lag"}
+    assert data["checks"]["database"]["responseTime"].endswith("ms")
+    assert data["checks"]["eventLoop:lag"]["observedUnit"] == "ms"
@@ -0,0 +1,285 @@
+import asyncio
+import hashlib
+import hmac
+import json
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session, select
+
+from app.core.exceptions import ConflictException
+from app.core.interface_adapters.inbox import Inbox, InboxEvent, InboxWriter
+from app.core.interface_adapters.inbox.processor import InboxProcessor
+from app.core.resource_adapters.outbox import OutboxMessage
+from app.core.resource_adapters.persistence.sqlmodel.event_store import Snapshot, StoredEvent
+from app.domain.issue import Issue, IssueState
+from app.features.issues import EventSourcedIssueRepository, caching_repository
+from app.features.issues.webhooks import (
+    GithubIssueEventHandler,
+    github_inbox_event,
+    inbox_dependency,
+    issue_cache_invalidator,
+)
+from config import get_settings
+from conftest import settings
+
+EXAMPLE = json.loads(Path("app/domain/issue_event.json").read_text())
+
+
+def _event_body(event_id: int, event: str, created_at: str, number: int = 1347) -> bytes:
+    payload = {**EXAMPLE, "id": event_id, "event": event, "created_at": created_at}
+    payload["issue"] = {**EXAMPLE["issue"], "number": number}
+    return json.dumps(payload).encode()
+
+
+def test_github_inbox_event_reads_routing_fields_only():
+    row = github_inbox_event(json.dumps(EXAMPLE).encode(), None, None)
+    assert (row["event_id"], row["event_type"], row["aggregate_id"]) == ("1", "closed", "1347")
+    assert row["occurred_at"].isoformat() == "2011-04-14T16:00:49+00:00"
+    assert json.loads(row["payload"]) == EXAMPLE
+
+    webhook = {"action": "reopened", "issue": EXAMPLE["issue"]}
+    row = github_inbox_event(json.dumps(webhook).encode(), "delivery-1", "issues")
+    assert (row["event_id"], row["event_type"]) == ("delivery-1", "reopened")
+
+
+def test_writer_batches_concurrent_writes_and_drops_duplicates(
+    session: Session, async_session_factory
+):
+    flushed = []
+
+    async def scenario():
+        writer = InboxWriter(async_session_factory, flushed.append, max_delay_seconds=0.05)
+        bodies = [
+            _event_body(n % 20, "closed", "2025-01-01T00:00:00Z", n % 3 + 1) for n in range(60)
+        ]
+        events = [github_inbox_event(body, None, None) for body in bodies]
+        await asyncio.gather(*(writer.write(event) for event in events))
+
+    asyncio.run(scenario())
+    # 60 requests, one insert; each event id stored once
+    assert flushed == [{"1", "2", "3"}]
+    rows = session.exec(select(InboxEvent)).all()
+    assert sorted(int(row.event_id) for row in rows) == list(range(20))
+
+
+def test_processor_applies_events_in_order_exactly_once(session: Session, async_session_factory):
+    session.add(Issue(issue_number=1347, issue_state=IssueState.CLOSED))
+    session.commit()
+    # received out of order: applied by arrival the issue would end up closed again
+    bodies = [
+        _event_body(3, "reopened", "2025-01-03T00:00:00Z"),
+        _event_body(2, "closed", "2025-01-02T00:00:00Z"),
+        _event_body(2, "closed", "2025-01-02T00:00:00Z"),
+        _event_body(4, "opened", "2025-01-01T00:00:00Z", number=7),
+    ]
+
+    async def scenario():
+        processor = InboxProcessor(async_session_factory, GithubIssueEventHandler())
+        writer = InboxWriter(async_session_factory, lambda ids: None)
+        for body in bodies:
+            await writer.write(github_inbox_event(body, None, None))
+        applied = [await processor.process("1347"), await processor.process("7")]
+        # a redelivery is dropped by the insert and applies nothing
+        await writer.write(github_inbox_event(bodies[0], None, None))
+        applied.append(await processor.process("1347"))
+        return applied
+
+    assert asyncio.run(scenario()) == [2, 1, 0]
+    issues = session.exec(select(Issue).order_by(Issue.issue_number)).all()
+    assert [(i.issue_number, i.issue_state, i.version) for i in issues] == [
+        (7, IssueState.OPEN, 0),
+        (1347, IssueState.OPEN, 1),
+    ]
+    processed = session.exec(select(InboxEvent.processed_at)).all()
+    assert len(processed) == 3 and all(processed)
+    # recorded in the issues' event streams, 1347's starting from its imported row
+    stored = session.exec(
+        select(StoredEvent).order_by(StoredEvent.aggregate_id, StoredEvent.version)
+    ).all()
+    assert [(e.aggregate_id, e.version, e.event_type, e.event_id) for e in stored] == [
+        ("1347", 1, "CLOSED", "2"),
+        ("1347", 2, "REOPENED", "3"),
+        ("7", 1, "OPENED", "4"),
+    ]
+    snapshots = session.exec(select(Snapshot)).all()
+    assert [(s.aggregate_id, s.version, s.state["issue_state"]) for s in snapshots] == [
+        ("1347", 0, "CLOSED")
+    ]
+    assert len(session.exec(select(OutboxMessage)).all()) == 3
+
+
+def test_handler_maps_webhook_actions_to_issue_events(session: Session, async_session_factory):
+    def webhook(action: str, **fields) -> bytes:
+        issue = {**EXAMPLE["issue"], "number": 9, "title": "Renamed"}
+        return json.dumps({"action": action, "issue": issue, **fields}).encode()
+
+    bodies = [
+        webhook("opened"),
+        webhook("labeled", label={"name": "bug"}),
+        webhook("edited", changes={"title": {"from": "Found a bug"}}),
+        webhook("milestoned", milestone={"title": "v1"}),
+        webhook("assigned", assignee={"login": "octocat"}),
+    ]
+
+    async def scenario():
+        writer = InboxWriter(async_session_factory, lambda ids: None)
+        for minute, body in enumerate(bodies):
+            event = github_inbox_event(body, f"d{minute}", "issues")
+            event["occurred_at"] = event["occurred_at"].replace(minute=minute)
+            await writer.write(event)
+        applied = await InboxProcessor(async_session_factory, GithubIssueEventHandler()).process(
+            "9"
+        )
+        async with EventSourcedIssueRepository(async_session_factory()) as repo:
+            return applied, await repo.get(9)
+
+    applied, issue = asyncio.run(scenario())
+
+    assert applied == 5
+    assert (issue.version, issue.title, issue.issue_state) == (4, "Renamed", IssueState.OPEN)
+    assert (issue.labels, issue.assignees) == ({"bug"}, {"octocat"})
+    stored = session.exec(select(StoredEvent).order_by(StoredEvent.version)).all()
+    assert [e.event_type for e in stored] == ["OPENED", "LABLED", "EDITED", "ASSIGNED"]
+    assert stored[2].payload["previous_title"] == "Renamed"
+
+
+class ConflictingOnceHandler(GithubIssueEventHandler):
+    def __init__(self):
+        self.calls = 0
+
+    async def handle(self, session, aggregate_id, events):
+        self.calls += 1
+        if self.calls == 1:
+            raise ConflictException(message="Aggregate was modified concurrently")
+        await super().handle(session, aggregate_id, events)
+
+
+def test_processor_retries_a_conflicting_batch_at_once(session: Session, async_session_factory):
+    handler = ConflictingOnceHandler()
+
+    async def scenario():
+        processor = InboxProcessor(async_session_factory, handler)
+        writer = InboxWriter(async_session_factory, lambda ids: None)
+        await writer.write(
+            github_inbox_event(_event_body(5, "opened", "2025-01-01T00:00:00Z"), None, None)
+        )
+        applied = await processor.process("1347")
+        return applied, processor.failed_count
+
+    assert asyncio.run(scenario()) == (1, 0)
+    assert handler.calls == 2
+    # the conflicting attempt was rolled back and is not counted against max_attempts
+    assert session.exec(select(InboxEvent.attempts)).all() == [1]
+
+
+class FailingEventHandler(GithubIssueEventHandler):
+    def __init__(self, event_id: str):
+        self.event_id = event_id
+
+    async def handle(self, session, aggregate_id, events):
+        if any(event.event_id == self.event_id for event in events):
+            raise ValueError(f"cannot apply {self.event_id}")
+        await super().handle(session, aggregate_id, events)
+
+
+def test_processor_isolates_a_failing_event_from_its_batch(
+    session: Session, async_session_factory
+):
+    bodies = [
+        _event_body(1, "opened", "2025-01-01T00:00:00Z"),
+        _event_body(2, "closed", "2025-01-02T00:00:00Z"),
+        _event_body(3, "reopened", "2025-01-03T00:00:00Z"),
+        _event_body(4, "reopened", "2025-01-04T00:00:00Z"),
+    ]
+
+    async def scenario():
+        processor = InboxProcessor(
+            async_session_factory, FailingEventHandler("3"), max_attempts=2
+        )
+        writer = InboxWriter(async_session_factory, lambda ids: None)
+        for body in bodies:
+            await writer.write(github_inbox_event(body, None, None))
+        return [await processor.process("1347") for _ in range(4)]
+
+    # the events before the failing one are applied at once, the one after it once the
+    # failing event has used up its attempts
+    assert asyncio.run(scenario()) == [2, 0, 1, 0]
+    events = session.exec(select(InboxEvent).order_by(InboxEvent.event_id)).all()
+    assert [(e.event_id, e.attempts, e.processed_at is not None) for e in events] == [
+        ("1", 1, True),
+        ("2", 1, True),
+        ("3", 2, False),
+        ("4", 1, True),
+    ]
+    assert events[2].last_error == "ValueError('cannot apply 3')"
+    stored = session.exec(select(StoredEvent).order_by(StoredEvent.version)).all()
+    assert [e.event_id for e in stored] == ["1", "2", "4"]
+
+
+def test_applied_events_invalidate_the_issue_caches(
+    session: Session, async_session_factory, monkeypatch
+):
+    monkeypatch.setattr(caching_repository, "_issue_cache", None)
+    monkeypatch.setattr(caching_repository, "_missing_issue_cache", None)
+    cached_settings = settings.model_copy(
+        update={"issue_cache_enabled": True, "issue_negative_cache_enabled": True}
+    )
+    cache = caching_repository.get_issue_cache(cached_settings)
+    missing_cache = caching_repository.get_missing_issue_cache(cached_settings)
+    # 1347 was looked up before its opened event arrived, 7 is cached while open
+    missing_cache.set(1347, True)
+    cache.set(7, caching_repository.CachedIssue(0, {"issue_number": 7, "version": 0}))
+
+    async def scenario():
+        processor = InboxProcessor(
+            async_session_factory,
+            GithubIssueEventHandler(),
+            on_applied=issue_cache_invalidator(cached_settings),
+        )
+        writer = InboxWriter(async_session_factory, lambda ids: None)
+        for body in (
+            _event_body(1, "opened", "2025-01-01T00:00:00Z"),
+            _event_body(2, "closed", "2025-01-02T00:00:00Z", number=7),
+        ):
+            await writer.write(github_inbox_event(body, None, None))
+        return [await processor.process("1347"), await processor.process("7")]
+
+    assert asyncio.run(scenario()) == [1, 1]
+    assert missing_cache.get(1347) is None
+    assert cache.get(7) is None
+
+
+def test_inbox_endpoint_acknowledges_and_deduplicates(
+    app, session: Session, async_session_factory
+):
+    inbox = Inbox(async_session_factory, GithubIssueEventHandler(), workers=2)
+    secret = "s3cret"
+    app.dependency_overrides[inbox_dependency] = lambda: inbox
+    app.dependency_overrides[get_settings] = lambda: settings.model_copy(
+        update={"inbox_github_secret": secret}
+    )
+    body = _event_body(42, "closed", "2025-01-01T00:00:00Z")
+
+    def sign(content: bytes) -> str:
+        return "sha256=" + hmac.new(secret.encode(), content, hashlib.sha256).hexdigest()
+
+    with TestClient(app) as client:
+        for _ in range(2):
+            response = client.post(
+                "/v1/inbox/github", content=body, headers={"X-Hub-Signature-256": sign(body)}
+            )
+            assert response.status_code == 202
+        forged = client.post("/v1/inbox/github", content=body)
+        assert forged.status_code == 401
+        invalid = client.post(
+            "/v1/inbox/github", content=b"{}", headers={"X-Hub-Signature-256": sign(b"{}")}
+        )
+        assert invalid.status_code == 400
+
+    assert [row.event_id for row in session.exec(select(InboxEvent)).all()] == ["42"]
+
+
+def test_inbox_endpoint_disabled(client: TestClient):
+    response = client.post("/v1/inbox/github", content=json.dumps(EXAMPLE))
+    assert response.status_code == 501
@@ -0,0 +1,152 @@
+import asyncio
+
+from app.core.cache import TTLLRUCache
+from app.domain.issue import Issue, IssueState
+from app.features.issues.caching_repository import CachingIssueRepository
+
+
+class FakeIssueRepository:
+    """In-memory stand-in for AsyncSQLModelIssueRepository that counts reads."""
+
+    def __init__(self, *issues: Issue) -> None:
+        self.issues = {issue.issue_number: issue for issue in issues}
+        self.reads = 0
+
+    async def get_by_id(self, id: int) -> Issue:
+        self.reads += 1
+        issue = self.issues.get(id)
+        if issue is None:
+            return Issue(issue_number=0, version=0)
+        return Issue(**issue.model_dump())
+
+    async def get_many(self, ids):
+        self.reads += 1
+        return {id: Issue(**self.issues[id].model_dump()) for id in ids if id in self.issues}
+
+    async def update(self, entity: Issue) -> None:
+        entity.version += 1
+        self.issues[entity.issue_number] = Issue(**entity.model_dump())
+
+    async def remove(self, entity: Issue) -> None:
+        self.issues.pop(entity.issue_number, None)
+
+
+def test_ttl_lru_cache_evicts_least_recently_used():
+    cache = TTLLRUCache(max_size=2, ttl_seconds=60)
+    cache.set(1, "a")
+    cache.set(2, "b")
+    assert cache.get(1) == "a"
+    cache.set(3, "c")
+
+    assert cache.get(2) is None
+    assert cache.get(1) == "a"
+    assert cache.get(3) == "c"
+    assert cache.stats.evictions == 1
+
+
+def test_ttl_lru_cache_expires_entries(clock):
+    cache = TTLLRUCache(max_size=10, ttl_seconds=5, clock=clock)
+    cache.set(1, "a")
+    clock.now = 4.9
+    assert cache.get(1) == "a"
+    clock.now = 5.0
+    assert cache.get(1) is None
+    assert cache.stats.expirations == 1
+    assert len(cache) == 0
+
+
+def test_caching_repository_read_through():
+    inner = FakeIssueRepository(Issue(issue_number=1, issue_state=IssueState.OPEN))
+    cache = TTLLRUCache(max_size=10, ttl_seconds=60)
+    repo = CachingIssueRepository(inner, cache)
+
+    async def scenario():
+        first = await repo.get_by_id(1)
+        second = await repo.get_by_id(1)
+        assert first.issue_number == second.issue_number == 1
+        assert first is not second
+
+        missing = await repo.get_by_id(2)
+        assert missing.issue_number == 0
+
+        found = await repo.get_many([1, 2])
+        assert list(found) == [1]
+
+    asyncio.run(scenario())
+    # get_by_id(1), get_by_id(2) and get_many([2]) reach the database, the rest is cached
+    assert inner.reads == 3
+    assert cache.stats.hits == 2
+    assert cache.stats.misses == 3
+
+
+def test_caching_repository_update_invalidates_and_rejects_stale_reads():
+    inner = FakeIssueRepository(Issue(issue_number=1, issue_state=IssueState.OPEN))
+    cache = TTLLRUCache(max_size=10, ttl_seconds=60)
+    repo = CachingIssueRepository(inner, cache)
+
+    async def scenario():
+        stale = await repo.get_by_id(1)
+        updated = await repo.get_by_id(1)
+        updated.issue_state = IssueState.CLOSED
+        await repo.update(updated)
+
+        # a reader that loaded the old row before the update must not repopulate the cache
+        repo._populate(stale)
+        assert (await repo.get_by_id(1)).issue_state == IssueState.CLOSED
+
+        removed = await repo.get_by_id(1)
+        await repo.remove(removed)
+        repo._populate(removed)
+        assert (await repo.get_by_id(1)).issue_number == 0
+
+    asyncio.run(scenario())
+
+
+def test_missing_issue_cache_short_circuits_until_added():
+    inner = FakeIssueRepository()
+    missing_cache = TTLLRUCache(max_size=10, ttl_seconds=60)
+    repo = CachingIssueRepository(inner, None, missing_cache)
+
+    async def add(issue: Issue) -> None:
+        inner.issues[issue.issue_number] = issue
+
+    inner.add = add
+
+    async def scenario():
+        assert (await repo.get_by_id(7)).issue_number == 0
+        assert (await repo.get_by_id(7)).issue_number == 0
+        assert await repo.get_many([7]) == {}
+        assert inner.reads == 1
+
+        await repo.add(Issue(issue_number=7, issue_state=IssueState.OPEN))
+        assert (await repo.get_by_id(7)).issue_number == 7
+        assert inner.reads == 2
+
+    asyncio.run(scenario())
+    assert missing_cache.stats.hits == 2
+
+
+def test_caching_repository_get_version_uses_filled_entries_only():
+    inner = FakeIssueRepository(Issue(issue_number=1, issue_state=IssueState.OPEN))
+
+    async def get_version(id):
+        inner.reads += 1
+        issue = inner.issues.get(id)
+        return None if issue is None else issue.version
+
+    inner.get_version = get_version
+    repo = CachingIssueRepository(inner, TTLLRUCache(max_size=10, ttl_seconds=60))
+
+    async def scenario():
+        assert await repo.get_version(1) == 0
+        assert inner.reads == 1
+        issue = await repo.get_by_id(1)
+        assert await repo.get_version(1) == 0
+        assert inner.reads == 2
+
+        await repo.update(issue)
+        # the invalidation marker is not trusted, the version is read again
+        assert await repo.get_version(1) == 1
+        assert inner.reads == 3
+
+    asyncio.run(scenario())
@@ -1,3 +1,5 @@
+import json
+
 import pytest
 from fastapi.testclient import TestClient
 from sqlmodel import Session
@@ -92,3 +94,98 @@ def test_analyze_issue_success(client: TestClient, session: Session):
     assert response.json() == {"issue_state": "OPEN", "version": 0, "issue_number": 456}
     # assert response.status_code == 401
     # assert response.json() == {"detail": "Unauthorized"}
+
+
+def test_analyze_issues_batch(client: TestClient, session: Session):
+    uow = SQLModelIssueRepository(session)
+
+    with uow:
+        uow.add(Issue(issue_number=1, issue_state=IssueState.OPEN))
+        uow.add(Issue(issue_number=2, issue_state=IssueState.CLOSED))
+
+    response = client.post(
+        "/v1/issues/analyze:batch", json={"issue_numbers": [2, 3, 1]}
+    )
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [r["issue_number"] for r in results] == [2, 3, 1]
+    assert [r["status_code"] for r in results] == [200, 404, 200]
+    assert results[0]["issue"] == {"issue_state": "CLOSED", "version": 0, "issue_number": 2}
+    assert results[1]["issue"] is None
+    assert results[1]["detail"] == "Issue with number 3 does not exist"
+
+
+def test_analyze_issues_batch_empty(client: TestClient):
+    response = client.post("/v1/issues/analyze:batch", json={"issue_numbers": []})
+    assert response.status_code == 422
+
+
+def test_list_issues_keyset_pagination(client: TestClient, session: Session):
+    uow = SQLModelIssueRepository(session)
+    with uow:
+        for issue_number in (5, 1, 3, 2, 4):
+            uow.add(Issue(issue_number=issue_number, issue_state=IssueState.OPEN))
+
+    seen = []
+    params = {"limit": 2}
+    while True:
+        response = client.get("/v1/issues", params=params)
+        assert response.status_code == 200
+        page = response.json()
+        seen.extend(issue["issue_number"] for issue in page["items"])
+        if page["next_cursor"] is None:
+            break
+        params["cursor"] = page["next_cursor"]
+
+    assert seen == [1, 2, 3, 4, 5]
+
+
+def test_list_issues_invalid_cursor(client: TestClient):
+    response = client.get("/v1/issues", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
+    assert response.json()["message"] == "Invalid cursor"
+
+
+def test_list_issues_stream_ndjson(client: TestClient, session: Session):
+    uow = SQLModelIssueRepository(session)
+    with uow:
+        for issue_number in (2, 1):
+            uow.add(Issue(issue_number=issue_number, issue_state=IssueState.OPEN))
+
+    response = client.get("/v1/issues", params={"stream": True})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = response.text.splitlines()
+    assert [json.loads(line)["issue_number"] for line in lines] == [1, 2]
+
+
+def test_get_issue_etag_and_not_modified(client: TestClient, session: Session):
+    uow = SQLModelIssueRepository(session)
+    with uow:
+        uow.add(Issue(issue_number=5, issue_state=IssueState.OPEN))
+
+    response = client.get("/v1/issues/5")
+    assert response.status_code == 200
+    assert response.json() == {"issue_state": "OPEN", "version": 0, "issue_number": 5}
+    etag = response.headers["etag"]
+    assert etag == 'W/"issue-5-0"'
+
+    revalidated = client.get("/v1/issues/5", headers={"If-None-Match": f'"x", {etag}'})
+    assert revalidated.status_code == 304
+    assert revalidated.content == b""
+    assert revalidated.headers["etag"] == etag
+
+    with uow:
+        issue = uow.get_by_id(5)
+        issue.issue_state = IssueState.CLOSED
+        uow.update(issue)
+
+    changed = client.get("/v1/issues/5", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.json()["issue_state"] == "CLOSED"
+    assert changed.headers["etag"] == 'W/"issue-5-1"'
+
+
+def test_get_issue_not_found_with_if_none_match(client: TestClient):
+    response = client.get("/v1/issues/404", headers={"If-None-Match": "*"})
+    assert response.status_code == 404
@@ -0,0 +1,42 @@
+import pytest
+
+from benchmarks.loadtest import LatencyHistogram, parse_mix
+
+
+def test_histogram_percentiles_keep_significant_figures():
+    histogram = LatencyHistogram(significant_figures=3)
+    for millis in range(1, 101):
+        histogram.record(millis / 1000)
+
+    assert histogram.total_count == 100
+    assert histogram.value_at_percentile(50) == 50_000
+    assert histogram.value_at_percentile(99) == 99_000
+    assert histogram.value_at_percentile(100) == 100_000
+    assert histogram.max_us == 100_000
+    assert histogram.mean_us == pytest.approx(50_500)
+
+
+def test_histogram_buckets_large_values():
+    histogram = LatencyHistogram(significant_figures=2)
+    histogram.record(0.012345)
+
+    assert list(histogram.counts) == [12_000]
+    assert histogram.max_us == 12_345
+
+
+def test_report_ends_at_full_percentile():
+    histogram = LatencyHistogram()
+    for millis in range(1, 11):
+        histogram.record(millis / 1000)
+
+    report = histogram.report()
+
+    assert "1.000000000000" in report.splitlines()[-4]
+    assert "Total count    =           10" in report
+
+
+def test_parse_mix():
+    assert parse_mix("analyze=9,health=1") == {"analyze": 9, "health": 1}
+    assert parse_mix("readiness") == {"readiness": 1}
+    with pytest.raises(ValueError):
+        parse_mix("nope=1")
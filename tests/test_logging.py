@@ -0,0 +1,69 @@
+import io
+import json
+import sys
+
+from loguru import logger
+
+from app.core.logging import _logfmt_value, configure_logging
+from config import Settings
+
+
+def _capture(monkeypatch, **overrides) -> io.StringIO:
+    stream = io.StringIO()
+    monkeypatch.setattr(sys, "stderr", stream)
+    configure_logging(Settings().model_copy(update={"log_enqueue": False, **overrides}))
+    return stream
+
+
+def _restore() -> None:
+    configure_logging(Settings().model_copy(update={"log_enqueue": False}))
+
+
+def test_logfmt_output_includes_request_id(monkeypatch):
+    stream = _capture(monkeypatch, log_format="logfmt")
+    try:
+        with logger.contextualize(request_id="abc-123"):
+            logger.info("issue {} analyzed", 42)
+    finally:
+        _restore()
+
+    line = stream.getvalue().strip()
+    assert "level=info" in line
+    assert 'msg="issue 42 analyzed"' in line
+    assert "request_id=abc-123" in line
+
+
+def test_json_output_is_serialized(monkeypatch):
+    stream = _capture(monkeypatch, log_format="json")
+    try:
+        logger.bind(issue_number=7).warning("slow")
+    finally:
+        _restore()
+
+    record = json.loads(stream.getvalue().splitlines()[0])["record"]
+    assert record["message"] == "slow"
+    assert record["level"]["name"] == "WARNING"
+    assert record["extra"]["issue_number"] == 7
+
+
+def test_module_levels_filter_per_module(monkeypatch):
+    stream = _capture(
+        monkeypatch,
+        log_level="WARNING",
+        log_module_levels={"tests.test_logging": "DEBUG"},
+    )
+    try:
+        logger.debug("visible")
+        logger.patch(lambda record: record.update(name="app.other")).info("hidden")
+    finally:
+        _restore()
+
+    output = stream.getvalue()
+    assert "visible" in output
+    assert "hidden" not in output
+
+
+def test_logfmt_value_quotes_when_needed():
+    assert _logfmt_value("plain") == "plain"
+    assert _logfmt_value('a "b" c') == '"a \\"b\\" c"'
+    assert _logfmt_value(3) == "3"
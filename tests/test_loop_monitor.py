@@ -0,0 +1,80 @@
+import asyncio
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.loop_monitor import LoopMonitor
+from app.core.request_context import request_id_ctx, request_scope_ctx
+from main import app
+
+
+def test_slow_callback_is_attributed_to_request():
+    original_run = asyncio.Handle._run
+    monitor = LoopMonitor(slow_callback_ms=20, sample_interval_seconds=0.01)
+
+    async def handler() -> None:
+        request_id_ctx.set("req-1")
+        request_scope_ctx.set({"path": "/v1/issues/7"})
+        await asyncio.sleep(0)
+        time.sleep(0.05)  # blocks the loop
+
+    async def scenario() -> None:
+        monitor.start()
+        try:
+            await asyncio.create_task(handler())
+            await asyncio.sleep(0.03)
+        finally:
+            await monitor.stop()
+
+    asyncio.run(scenario())
+
+    assert asyncio.Handle._run is original_run
+    assert monitor.slow_callback_tracking
+    assert monitor.slow_callback_count >= 1
+    slow = next(s for s in monitor.slow_callbacks if s.request_id == "req-1")
+    assert slow.route == "/v1/issues/7"
+    assert slow.duration_ms >= 20
+    assert "handler" in slow.callback
+    # the blocked sleep also shows up as lag
+    assert monitor.max_lag_seconds > 0
+
+
+def test_fast_callbacks_are_not_recorded():
+    monitor = LoopMonitor(slow_callback_ms=1000, sample_interval_seconds=0.01)
+
+    async def scenario() -> None:
+        monitor.start()
+        await asyncio.sleep(0.03)
+        await monitor.stop()
+
+    asyncio.run(scenario())
+
+    assert monitor.slow_callback_count == 0
+    assert monitor.last_lag_seconds is not None
+
+
+def test_uvloop_only_samples_lag():
+    uvloop = pytest.importorskip("uvloop")
+    original_run = asyncio.Handle._run
+    monitor = LoopMonitor(slow_callback_ms=20, sample_interval_seconds=0.01)
+
+    async def scenario() -> None:
+        monitor.start()
+        await asyncio.sleep(0.03)
+        await monitor.stop()
+
+    with asyncio.Runner(loop_factory=uvloop.new_event_loop) as runner:
+        runner.run(scenario())
+
+    assert asyncio.Handle._run is original_run
+    # reported as off rather than as a loop that never blocks
+    assert monitor.as_dict()["slow_callback_tracking"] is False
+    assert monitor.last_lag_seconds is not None
+
+
+def test_info_reports_disabled_monitor():
+    with TestClient(app) as client:
+        response = client.get("/info")
+
+    assert response.json()["event_loop"] is None
@@ -60,3 +60,24 @@ def test_is_configured():
     assert (
         is_configured(settings) is True
     )  # Should be True since project_name is set to "python-template"
+
+
+def test_info_pool_status(client: TestClient):
+    response = client.get("/info")
+    assert response.status_code == 200
+    pool = response.json()["pool"]
+    # the test database is SQLite, which always runs on a StaticPool
+    assert all(status["pool_class"] == "StaticPool" for status in pool.values())
+
+
+def test_request_id_and_process_time_headers(client: TestClient):
+    response = client.get("/")
+    assert len(response.headers["X-Request-ID"]) == 36
+    assert float(response.headers["X-Process-Time"]) >= 0
+
+    response = client.get("/", headers={"X-Request-ID": "upstream-id-1"})
+    assert response.headers["X-Request-ID"] == "upstream-id-1"
+
+    # malformed ids are replaced rather than echoed into headers and logs
+    response = client.get("/", headers={"X-Request-ID": "bad id\tvalue"})
+    assert response.headers["X-Request-ID"] != "bad id\tvalue"
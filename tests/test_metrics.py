@@ -0,0 +1,81 @@
+import threading
+
+from fastapi.testclient import TestClient
+
+from app.core.metrics import MetricsRegistry
+from main import app
+
+
+def test_counter_merges_thread_shards():
+    registry = MetricsRegistry()
+    counter = registry.counter("jobs_total", "Jobs.", ("kind",))
+
+    def work() -> None:
+        for _ in range(1000):
+            counter.inc(("a",))
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    counter.inc(("b",), 2.5)
+
+    assert counter.value(("a",)) == 4000
+    assert counter.value(("b",)) == 2.5
+
+
+def test_gauge_dec_from_another_thread():
+    registry = MetricsRegistry()
+    gauge = registry.gauge("in_flight", "In flight.")
+    gauge.inc()
+    thread = threading.Thread(target=gauge.dec)
+    thread.start()
+    thread.join()
+
+    assert gauge.value() == 0
+
+
+def test_histogram_renders_cumulative_buckets():
+    registry = MetricsRegistry()
+    histogram = registry.histogram("latency_seconds", "Latency.", ("route",), (0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 2.0):
+        histogram.observe(value, ("/x",))
+
+    text = registry.render()
+
+    assert "# TYPE latency_seconds histogram" in text
+    assert 'latency_seconds_bucket{route="/x",le="0.1"} 2' in text
+    assert 'latency_seconds_bucket{route="/x",le="1"} 3' in text
+    assert 'latency_seconds_bucket{route="/x",le="+Inf"} 4' in text
+    assert 'latency_seconds_sum{route="/x"} 2.65' in text
+    assert 'latency_seconds_count{route="/x"} 4' in text
+
+
+def test_registry_returns_existing_metric():
+    registry = MetricsRegistry()
+    assert registry.counter("c_total", "C.") is registry.counter("c_total", "C.")
+
+
+def test_label_values_are_escaped():
+    registry = MetricsRegistry()
+    registry.counter("c_total", "C.", ("path",)).inc(('a"b\\c',))
+
+    assert 'c_total{path="a\\"b\\\\c"} 1' in registry.render()
+
+
+def test_metrics_endpoint_reports_routes_and_queries():
+    with TestClient(app) as client:
+        client.get("/v1/issues")
+        client.get("/no-such-route")
+        response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    text = response.text
+    assert 'http_requests_total{method="GET",route="/v1/issues",status="200"}' in text
+    assert 'route="unmatched",status="404"' in text
+    assert 'http_request_duration_seconds_bucket{method="GET",route="/v1/issues",le="+Inf"}' in text
+    assert 'http_request_db_queries_count{method="GET",route="/v1/issues"}' in text
+    assert "db_queries_total" in text
+    assert 'http_requests_in_progress{method="GET"} 1' in text
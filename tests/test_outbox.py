@@ -0,0 +1,142 @@
+import asyncio
+import datetime
+from dataclasses import dataclass
+
+import pytest
+from sqlmodel import Session, select
+
+from app.core.database import get_engine
+from app.core.resource_adapters.outbox import InMemorySink, OutboxMessage, OutboxRelay
+from app.core.resource_adapters.outbox.relay import claim_statement
+from app.domain.issue import Issue, IssueState
+from app.features.issues.repository import SQLModelIssueRepository
+from conftest import settings
+
+
+@dataclass
+class IssueOpened:
+    event_id: str
+    issue_number: int
+    issue_state: IssueState
+    timestamp: datetime.datetime
+
+
+class FailingSink(InMemorySink):
+    async def publish(self, messages):
+        raise RuntimeError("broker unavailable")
+
+
+def _opened(number: int) -> IssueOpened:
+    return IssueOpened(
+        event_id=f"opened-{number}",
+        issue_number=number,
+        issue_state=IssueState.OPEN,
+        timestamp=datetime.datetime(2025, 1, 1, tzinfo=datetime.timezone.utc),
+    )
+
+
+def _add_issues(numbers) -> None:
+    for number in numbers:
+        with SQLModelIssueRepository(Session(get_engine(settings))) as repo:
+            repo.add(Issue(issue_number=number, issue_state=IssueState.OPEN))
+            repo.add_events("issue", number, [_opened(number)])
+
+
+def _relay(sessions, sink, **kwargs):
+    async def scenario():
+        relay = OutboxRelay(sessions, sink, **kwargs)
+        return relay, [await relay.relay_once() for _ in range(3)]
+
+    return asyncio.run(scenario())
+
+
+def test_events_commit_and_roll_back_with_the_aggregate(session: Session):
+    _add_issues([1])
+    with pytest.raises(RuntimeError):
+        with SQLModelIssueRepository(Session(get_engine(settings))) as repo:
+            repo.add(Issue(issue_number=2, issue_state=IssueState.OPEN))
+            repo.add_events("issue", 2, [_opened(2)])
+            raise RuntimeError("use case failed")
+
+    messages = session.exec(select(OutboxMessage)).all()
+    assert [(m.event_id, m.aggregate_id, m.event_type) for m in messages] == [
+        ("opened-1", "1", "IssueOpened")
+    ]
+    assert messages[0].payload == {
+        "event_id": "opened-1",
+        "issue_number": 1,
+        "issue_state": "OPEN",
+        "timestamp": "2025-01-01T00:00:00Z",
+    }
+    assert messages[0].published_at is None
+
+
+def test_relay_publishes_in_batches_and_marks_done(session: Session, async_session_factory):
+    _add_issues(range(1, 6))
+    sink = InMemorySink()
+    relay, published = _relay(async_session_factory, sink, batch_size=2)
+
+    assert published == [2, 2, 1]
+    assert [m.event_id for m in sink.messages] == [f"opened-{n}" for n in range(1, 6)]
+    assert relay.published_count == 5
+    session.expire_all()
+    rows = session.exec(select(OutboxMessage)).all()
+    assert all(row.published_at is not None and row.attempts == 1 for row in rows)
+
+
+def test_relay_keeps_rejected_batches_pending_until_max_attempts(
+    session: Session, async_session_factory
+):
+    _add_issues([1])
+    relay, published = _relay(async_session_factory, FailingSink(), max_attempts=2)
+
+    assert published == [0, 0, 0]
+    assert relay.failed_count == 2
+    row = session.exec(select(OutboxMessage)).one()
+    assert row.published_at is None
+    assert row.attempts == 2
+    assert "broker unavailable" in row.last_error
+
+
+class ReentrantSink(InMemorySink):
+    """Runs a second relay while publishing, as another worker process would."""
+
+    def __init__(self, sessions):
+        super().__init__()
+        self.sessions = sessions
+        self.claimed_meanwhile = None
+
+    async def publish(self, messages):
+        self.claimed_meanwhile = await OutboxRelay(self.sessions, InMemorySink()).relay_once()
+        await super().publish(messages)
+
+
+def test_relay_publishes_leased_batches_outside_the_claim(session: Session, async_session_factory):
+    _add_issues([1, 2])
+    sink = ReentrantSink(async_session_factory)
+    relay, published = _relay(async_session_factory, sink, claim_lease_seconds=30)
+
+    # the claim committed before publishing, and its lease kept the batch from the other relay
+    assert published == [2, 0, 0]
+    assert sink.claimed_meanwhile == 0
+    session.expire_all()
+    rows = session.exec(select(OutboxMessage)).all()
+    assert all(row.published_at and row.claimed_until is None for row in rows)
+
+    # an expired lease, e.g. of a relay that died mid-batch, is claimed again
+    for row in rows:
+        row.published_at = None
+        row.claimed_until = datetime.datetime(2025, 1, 1, tzinfo=datetime.timezone.utc)
+    session.commit()
+    _, published = _relay(async_session_factory, InMemorySink())
+    assert published == [2, 0, 0]
+
+
+def test_claim_statement_skips_locked_rows_on_postgres():
+    from sqlalchemy.dialects import postgresql, sqlite
+
+    now = datetime.datetime.now(datetime.timezone.utc)
+    pg = str(claim_statement("postgresql", 10, 3, now).compile(dialect=postgresql.dialect()))
+    lite = str(claim_statement("sqlite", 10, 3, now).compile(dialect=sqlite.dialect()))
+    assert pg.endswith("FOR UPDATE SKIP LOCKED")
+    assert "FOR UPDATE" not in lite
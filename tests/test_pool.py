@@ -0,0 +1,25 @@
+from sqlalchemy import create_engine, text
+
+from app.core.pool import InstrumentedQueuePool, pool_status
+
+
+def test_pool_status_reports_checkouts_and_saturation(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedQueuePool,
+        pool_size=2,
+        max_overflow=2,
+    )
+    with engine.connect() as conn:
+        conn.execute(text("select 1"))
+        status = pool_status(engine)
+        assert status["pool_class"] == "InstrumentedQueuePool"
+        assert status["checked_out"] == 1
+        assert status["saturation"] == 0.25
+
+    status = pool_status(engine)
+    assert status["checked_out"] == 0
+    assert status["checkouts"] == 1
+    assert status["checkout_timeouts"] == 0
+    assert status["checkout_wait_max_ms"] >= status["checkout_wait_avg_ms"] >= 0
+    engine.dispose()
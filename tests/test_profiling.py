@@ -0,0 +1,99 @@
+import os
+import time
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.middleware import (
+    PLACEHOLDER_PROFILING_SECRET,
+    ProfilingMiddleware,
+    RequestContextMiddleware,
+)
+from conftest import settings
+
+
+def busy_wait(seconds: float) -> None:
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def profiled_app(**overrides) -> FastAPI:
+    profiling_settings = settings.model_copy(
+        update={"profiling_secret": "s3cret", "profiling_interval_ms": 0.5, **overrides}
+    )
+    app = FastAPI()
+
+    @app.get("/slow")
+    async def slow() -> dict:
+        busy_wait(0.03)
+        return {"status": "ok"}
+
+    app.add_middleware(ProfilingMiddleware, settings=profiling_settings)
+    app.add_middleware(RequestContextMiddleware)
+    return app
+
+
+def test_unprofiled_request_passes_through(tmp_path):
+    client = TestClient(profiled_app(profiling_output_dir=str(tmp_path)))
+
+    response = client.get("/slow", headers={"X-Profile": "wrong"})
+
+    assert response.json() == {"status": "ok"}
+    assert os.listdir(tmp_path) == []
+
+
+def test_header_returns_collapsed_stacks():
+    client = TestClient(profiled_app())
+
+    response = client.get("/slow", headers={"X-Profile": "s3cret", "X-Profile-Output": "response"})
+
+    assert response.status_code == 200
+    assert response.headers["x-profiled-status"] == "200"
+    lines = response.text.splitlines()
+    assert lines
+    stack, count = lines[0].rsplit(" ", 1)
+    assert int(count) > 0
+    assert any("test_profiling:busy_wait" in line for line in lines)
+
+
+def test_sampled_request_is_written_to_directory(tmp_path):
+    client = TestClient(
+        profiled_app(profiling_sample_rate=1.0, profiling_output_dir=str(tmp_path))
+    )
+
+    response = client.get("/slow", headers={"X-Request-ID": "req-42"})
+
+    assert response.json() == {"status": "ok"}
+    (name,) = os.listdir(tmp_path)
+    assert name.endswith("-req-42.collapsed")
+
+
+def test_cprofile_mode_writes_stats(tmp_path):
+    client = TestClient(
+        profiled_app(profiling_mode="cprofile", profiling_output_dir=str(tmp_path))
+    )
+
+    client.get("/slow", headers={"X-Profile": "s3cret"})
+
+    (name,) = os.listdir(tmp_path)
+    assert name.endswith(".prof")
+
+
+def test_placeholder_or_missing_secret_disables_profiling(tmp_path):
+    for secret in (None, "", PLACEHOLDER_PROFILING_SECRET):
+        client = TestClient(
+            profiled_app(
+                profiling_secret=secret,
+                profiling_sample_rate=1.0,
+                profiling_output_dir=str(tmp_path),
+            )
+        )
+
+        response = client.get(
+            "/slow", headers={"X-Profile": "change-me", "X-Profile-Output": "response"}
+        )
+
+        assert response.json() == {"status": "ok"}
+        assert "x-profiled-status" not in response.headers
+    assert os.listdir(tmp_path) == []
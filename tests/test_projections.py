@@ -0,0 +1,187 @@
+import asyncio
+import datetime
+from types import SimpleNamespace
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session, delete
+
+from app.core.resource_adapters.projections import ProjectionRunner
+from app.domain.issue import Issue, IssueEventType, IssueState, IssueTransitionState
+from app.features.issues import EventSourcedIssueRepository
+from app.features.issues.metrics_projection import (
+    IssueMetricCount,
+    IssueMetricsProjection,
+    read_issue_metrics,
+)
+from config import get_settings
+from conftest import settings
+from tests.domain.test_issue import make_event
+
+DAY = datetime.timedelta(days=1)
+START = datetime.datetime(2025, 3, 1, tzinfo=datetime.timezone.utc)
+TODAY = (START + 10 * DAY).date()
+
+
+def _run(scenario, sessions):
+    return asyncio.run(scenario(sessions, ProjectionRunner(sessions, IssueMetricsProjection())))
+
+
+def _event(number: int, event_type: IssueEventType, days: int, **kwargs):
+    return make_event(
+        event_type,
+        event_id=f"{number}-{event_type.value}-{days}",
+        issue_number=number,
+        timestamp=START + days * DAY,
+        **kwargs,
+    )
+
+
+async def _append(sessions, number: int, *events) -> None:
+    async with EventSourcedIssueRepository(sessions()) as repo:
+        issue = await repo.get(number) or Issue(issue_number=number, version=0)
+        await repo.append(issue, list(events))
+
+
+async def _metrics(sessions):
+    async with sessions() as session:
+        return await read_issue_metrics(session, window_days=30, today=TODAY)
+
+
+async def _history(sessions) -> None:
+    await _append(
+        sessions,
+        1,
+        _event(1, IssueEventType.OPENED, 0),
+        _event(1, IssueEventType.LABLED, 0, label="bug"),
+        _event(
+            1,
+            IssueEventType.CLOSED,
+            1,
+            issue_state=IssueState.CLOSED,
+            issue_state_transition=IssueTransitionState.COMPLETED,
+        ),
+    )
+    await _append(
+        sessions,
+        2,
+        _event(2, IssueEventType.OPENED, 0),
+        _event(
+            2,
+            IssueEventType.CLOSED,
+            3,
+            issue_state=IssueState.CLOSED,
+            issue_state_transition=IssueTransitionState.NOT_PLANNED,
+        ),
+    )
+    await _append(sessions, 3, _event(3, IssueEventType.OPENED, 5))
+
+
+def test_projection_maintains_metrics_incrementally(session: Session, async_session_factory):
+    async def scenario(sessions, runner):
+        await _history(sessions)
+        applied = await runner.catch_up(batch_size=2)
+        before = await _metrics(sessions)
+        # only the new event is applied, from the committed checkpoint
+        await _append(sessions, 2, _event(2, IssueEventType.REOPENED, 6))
+        reopen_applied, idle = await runner.run_once(), await runner.run_once()
+        return applied, before, reopen_applied, idle, await _metrics(sessions), runner
+
+    applied, before, reopen_applied, idle, after, runner = _run(scenario, async_session_factory)
+
+    assert applied == 6
+    assert (before.open, before.closed, before.reopened) == (1, 2, 0)
+    assert before.close_reasons == {"COMPLETED": 1, "NOT_PLANNED": 1}
+    assert before.time_to_close.closed == 2
+    assert before.time_to_close.mean_seconds == 2 * DAY.total_seconds()
+    assert (reopen_applied, idle) == (1, 0)
+    assert (after.open, after.closed, after.reopened) == (2, 1, 1)
+    assert after.reopen_rate == 0.5
+    assert after.position == runner.position
+    assert runner.lag_events == 0
+
+
+def test_rebuild_replays_to_the_same_read_model(session: Session, async_session_factory):
+    async def scenario(sessions, runner):
+        await _history(sessions)
+        await runner.catch_up()
+        incremental = await _metrics(sessions)
+        # a damaged read model is replaced wholesale
+        async with sessions() as session:
+            await session.exec(delete(IssueMetricCount))
+            await session.commit()
+        replayed = await runner.rebuild(batch_size=4)
+        return incremental, replayed, await _metrics(sessions)
+
+    incremental, replayed, rebuilt = _run(scenario, async_session_factory)
+
+    assert replayed == 6
+    assert rebuilt == incremental
+
+
+async def _import(sessions) -> None:
+    # 10 and 11 were imported and never changed, 12 was imported closed and then reopened
+    async with sessions() as session:
+        session.add_all([
+            Issue(issue_number=10, issue_state=IssueState.CLOSED),
+            Issue(issue_number=11, issue_state=IssueState.OPEN),
+            Issue(issue_number=12, issue_state=IssueState.OPEN),
+        ])
+        await session.commit()
+    async with EventSourcedIssueRepository(sessions()) as repo:
+        issue = Issue(issue_number=12, issue_state=IssueState.CLOSED, version=0)
+        baseline = issue.snapshot()
+        await repo.append(issue, [_event(12, IssueEventType.REOPENED, 2)])
+        repo.store.add_snapshot("12", 0, baseline)
+
+
+def test_rebuild_seeds_issues_written_without_events(session: Session, async_session_factory):
+    async def scenario(sessions, runner):
+        await _history(sessions)
+        await _import(sessions)
+        await runner.catch_up()
+        live = await _metrics(sessions)
+        await runner.rebuild()
+        return live, await _metrics(sessions)
+
+    live, rebuilt = _run(scenario, async_session_factory)
+
+    # the live projection only counts issues it has seen events for
+    assert (live.open, live.closed, live.reopened) == (2, 2, 1)
+    assert (rebuilt.open, rebuilt.closed, rebuilt.reopened) == (3, 3, 1)
+    assert rebuilt.close_reasons == live.close_reasons
+    assert rebuilt.time_to_close == live.time_to_close
+
+
+def test_metrics_endpoint_reads_the_projection(
+    client: TestClient, session: Session, async_session_factory
+):
+    async def scenario(sessions, runner):
+        await _history(sessions)
+        await runner.catch_up()
+
+    _run(scenario, async_session_factory)
+    assert client.get("/v1/issues/metrics").status_code == 501
+    client.app.dependency_overrides[get_settings] = lambda: settings.model_copy(
+        update={"projections_enabled": True}
+    )
+    response = client.get("/v1/issues/metrics", params={"window_days": 7})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["open"], body["closed"]) == (1, 2)
+    assert body["time_to_close"]["window_days"] == 7
+    assert client.get("/v1/issues/metrics", params={"window_days": 0}).status_code == 422
+
+
+def test_batches_wait_at_recent_gaps_in_event_ids():
+    runner = ProjectionRunner(lambda: None, IssueMetricsProjection(), gap_timeout_seconds=5)
+    now = datetime.datetime.now(datetime.timezone.utc)
+
+    def events(*ids, age_seconds=0):
+        recorded_at = now - datetime.timedelta(seconds=age_seconds)
+        return [SimpleNamespace(id=id, recorded_at=recorded_at) for id in ids]
+
+    assert [e.id for e in runner._contiguous(10, events(11, 12, 14))] == [11, 12]
+    assert runner._contiguous(10, events(12, 13)) == []
+    # an old gap is a rolled back append, not one still in flight
+    assert [e.id for e in runner._contiguous(10, events(12, 13, age_seconds=60))] == [12, 13]
@@ -0,0 +1,54 @@
+from loguru import logger
+from sqlalchemy import create_engine, text
+
+from app.core.metrics import DB_QUERIES, install_query_metrics
+from app.core.query_log import install_query_logging
+from conftest import settings
+
+
+def _capture(engine, **overrides):
+    records = []
+    handler_id = logger.add(lambda message: records.append(message.record))
+    try:
+        install_query_logging(engine, settings.model_copy(update=overrides))
+        # as the request id middleware does for every request
+        with logger.contextualize(request_id="req-123"):
+            with engine.connect() as conn:
+                conn.execute(text("select 1"))
+    finally:
+        logger.remove(handler_id)
+    return [record for record in records if "query" in record["message"]]
+
+
+def test_slow_query_logged_with_request_id():
+    engine = create_engine("sqlite://")
+    records = _capture(engine, database_slow_query_ms=0.0)
+    assert len(records) == 1
+    assert records[0]["message"].startswith("slow query")
+    assert "select 1" in records[0]["message"]
+    # a structured field, not part of the message text
+    assert records[0]["extra"]["request_id"] == "req-123"
+    assert "req-123" not in records[0]["message"]
+
+
+def test_fast_queries_not_logged():
+    engine = create_engine("sqlite://")
+    assert _capture(engine, database_slow_query_ms=60_000.0) == []
+
+
+def test_sampled_query_logged():
+    engine = create_engine("sqlite://")
+    records = _capture(engine, database_query_sample_rate=1.0)
+    assert len(records) == 1
+    assert records[0]["message"].startswith("sampled query")
+
+
+def test_query_log_and_metrics_share_one_timer():
+    engine = create_engine("sqlite://")
+    install_query_metrics(engine, "shared")
+    before = DB_QUERIES.value(("shared",))
+    records = _capture(engine, database_slow_query_ms=0.0)
+    assert len(records) == 1
+    assert DB_QUERIES.value(("shared",)) == before + 1
+    # one start time per statement, recorded once whichever of the two installed first
+    assert len(engine.dispatch.before_cursor_execute) == 1
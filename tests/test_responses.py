@@ -0,0 +1,50 @@
+import datetime
+import json
+
+from fastapi.testclient import TestClient
+
+from app.core.responses import DefaultJSONResponse, ORJSONResponse, get_response_class
+from app.domain.issue import Issue, IssueState
+from conftest import settings
+from main import app
+
+CONTENT = {
+    "state": IssueState.CLOSED,
+    "at": datetime.datetime(2025, 1, 2, 3, 4, 5),
+    "issue": Issue(issue_number=7, issue_state=IssueState.OPEN, version=2),
+}
+EXPECTED = {
+    "state": "CLOSED",
+    "at": "2025-01-02T03:04:05",
+    "issue": {"issue_number": 7, "issue_state": "OPEN", "version": 2},
+}
+
+
+def test_default_response_encodes_enums_datetimes_and_models():
+    body = DefaultJSONResponse(CONTENT).body
+    assert json.loads(body) == EXPECTED
+
+
+def test_orjson_response_matches_default():
+    body = ORJSONResponse(CONTENT).body
+    assert json.loads(body) == EXPECTED
+
+
+def test_get_response_class():
+    assert get_response_class(settings.model_copy(update={"json_response_class": "json"})) is (
+        DefaultJSONResponse
+    )
+    assert get_response_class(settings) is ORJSONResponse
+
+
+def test_health_and_info_bodies():
+    with TestClient(app) as client:
+        health = client.get("/health")
+        info = client.get("/info")
+
+    assert health.headers["content-type"] == "application/health+json"
+    assert health.json()["status"] == "pass"
+    assert info.headers["content-type"] == "application/json"
+    assert "profiling_secret" not in info.json()["settings"]
+    # datetimes are rendered as ISO strings
+    datetime.datetime.fromisoformat(info.json()["system_time"])
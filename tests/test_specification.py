@@ -0,0 +1,49 @@
+from sqlmodel import Session
+
+from app.core.specification import Eq, In, Range
+from app.domain.issue import Issue, IssueState
+from app.features.issues.repository import SQLModelIssueRepository
+from app.features.issues.specifications import (
+    issue_in_state,
+    issue_is_open,
+    issue_number_between,
+    issue_numbers_in,
+)
+
+
+def _add_issues(session: Session) -> SQLModelIssueRepository:
+    uow = SQLModelIssueRepository(session)
+    with uow:
+        for issue_number in range(1, 7):
+            state = IssueState.OPEN if issue_number % 2 else IssueState.CLOSED
+            uow.add(Issue(issue_number=issue_number, issue_state=state))
+    return uow
+
+
+def _numbers(issues) -> list[int]:
+    return sorted(issue.issue_number for issue in issues)
+
+
+def test_specifications_compile_to_sql(session: Session):
+    uow = _add_issues(session)
+    cases = [
+        (issue_is_open(), [1, 3, 5]),
+        (issue_numbers_in([2, 3, 9]), [2, 3]),
+        (issue_number_between(2, 4), [2, 3, 4]),
+        (issue_number_between(last=2), [1, 2]),
+        (issue_is_open() & issue_number_between(first=3), [3, 5]),
+        (issue_numbers_in([1]) | issue_in_state(IssueState.CLOSED), [1, 2, 4, 6]),
+        (~issue_is_open() & ~issue_numbers_in([2]), [4, 6]),
+    ]
+    with uow:
+        for spec, expected in cases:
+            assert _numbers(uow.list_with_predicate(spec)) == expected
+            # the in-memory evaluation must agree with the compiled SQL
+            assert _numbers(filter(spec, uow.list())) == expected
+
+
+def test_specification_composition_is_flat():
+    spec = Eq("issue_number", 1) & In("issue_number", [1, 2]) & Range("issue_number", gte=1)
+    assert len(spec.specs) == 3
+    assert spec(Issue(issue_number=1))
+    assert not spec(Issue(issue_number=2))
@@ -1,7 +1,16 @@
+import asyncio
+
+import pytest
 from sqlmodel import Session, and_
 
+from app.core.database import get_async_sessionmaker
+from app.core.exceptions import ConflictException, NotFoundException
 from app.domain.issue import Issue, IssueState
-from app.features.issues.repository import SQLModelIssueRepository
+from app.features.issues.repository import (
+    AsyncSQLModelIssueRepository,
+    SQLModelIssueRepository,
+)
+from conftest import settings
 
 
 def test_add_and_get_issue(session: Session):
@@ -122,3 +131,93 @@ def test_remove_issue(session: Session):
     with uow:
         remaining_issues = uow.list()
         assert len(remaining_issues) == 0
+
+
+def test_get_many_issues(session: Session):
+    """Test fetching several issues at once, across multiple IN chunks."""
+    uow = SQLModelIssueRepository(session)
+    with uow:
+        for issue_number in range(1, 6):
+            uow.add(Issue(issue_number=issue_number, issue_state=IssueState.OPEN))
+
+    with uow:
+        found = uow.get_many([5, 1, 3, 99, 1], chunk_size=2)
+        assert sorted(found) == [1, 3, 5]
+        assert found[5].issue_number == 5
+        assert 99 not in found
+
+
+def test_list_page_and_stream(session: Session):
+    """Test keyset pages and chunked streaming, both ordered by issue number."""
+    uow = SQLModelIssueRepository(session)
+    with uow:
+        for issue_number in (3, 1, 2):
+            uow.add(Issue(issue_number=issue_number, issue_state=IssueState.OPEN))
+
+    with uow:
+        assert [i.issue_number for i in uow.list_page(None, 2)] == [1, 2]
+        assert [i.issue_number for i in uow.list_page(2, 2)] == [3]
+        assert [i.issue_number for i in uow.stream(chunk_size=2)] == [1, 2, 3]
+
+
+def test_update_bumps_version_and_detects_conflicts(session: Session):
+    """Test that update is a compare-and-set on version."""
+    uow = SQLModelIssueRepository(session)
+    with uow:
+        uow.add(Issue(issue_number=1, issue_state=IssueState.OPEN))
+
+    stale = Issue(issue_number=1, issue_state=IssueState.CLOSED, version=0)
+    with uow:
+        current = uow.get_by_id(1)
+        current.issue_state = IssueState.CLOSED
+        uow.update(current)
+        assert current.version == 1
+
+    with pytest.raises(ConflictException) as exc_info:
+        with uow:
+            uow.update(stale)
+    assert exc_info.value.status_code == 409
+
+    with uow:
+        assert uow.get_by_id(1).version == 1
+
+
+def test_update_and_remove_missing_issue(session: Session):
+    """Test that writes to a missing issue are reported instead of silently ignored."""
+    uow = SQLModelIssueRepository(session)
+    missing = Issue(issue_number=42, issue_state=IssueState.OPEN)
+
+    with pytest.raises(NotFoundException):
+        with uow:
+            uow.update(missing)
+
+    with pytest.raises(NotFoundException):
+        with uow:
+            uow.remove(missing)
+
+
+def test_async_update_and_remove(session: Session):
+    """Test the single-statement writes on the async repository."""
+    uow = SQLModelIssueRepository(session)
+    with uow:
+        uow.add(Issue(issue_number=1, issue_state=IssueState.OPEN))
+
+    async def scenario():
+        sessionmaker = get_async_sessionmaker(settings)
+        async with AsyncSQLModelIssueRepository(sessionmaker()) as repo:
+            issue = await repo.get_by_id(1)
+            issue.issue_state = IssueState.CLOSED
+            await repo.update(issue)
+            assert issue.version == 1
+
+        async with AsyncSQLModelIssueRepository(sessionmaker()) as repo:
+            with pytest.raises(ConflictException):
+                await repo.update(Issue(issue_number=1, version=0))
+            issue = await repo.get_by_id(1)
+            assert (issue.issue_state, issue.version) == (IssueState.CLOSED, 1)
+            await repo.remove(issue)
+
+        async with AsyncSQLModelIssueRepository(sessionmaker()) as repo:
+            assert (await repo.get_by_id(1)).issue_number == 0
+
+    asyncio.run(scenario())
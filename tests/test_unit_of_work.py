@@ -0,0 +1,72 @@
+import asyncio
+
+import pytest
+from sqlmodel import Session
+
+from app.core.database import get_engine
+from app.core.exceptions import ConflictException
+from app.core.unit_of_work import retry_on_conflict
+from app.domain.issue import Issue, IssueState
+from app.features.issues.repository import SQLModelIssueRepository
+from conftest import settings
+
+
+def test_stale_commit_raises_conflict(session: Session):
+    uow = SQLModelIssueRepository(session)
+    with uow:
+        uow.add(Issue(issue_number=1, issue_state=IssueState.OPEN))
+
+    first = SQLModelIssueRepository(Session(get_engine(settings)))
+    second = SQLModelIssueRepository(Session(get_engine(settings)))
+    with first:
+        mine = first.get_by_id(1)
+        with second:
+            theirs = second.get_by_id(1)
+            theirs.issue_state = IssueState.CLOSED
+        # the flush compares the version loaded by this session, which is now stale
+        mine.issue_state = IssueState.CLOSED
+        with pytest.raises(ConflictException) as exc_info:
+            first.commit()
+    assert exc_info.value.status_code == 409
+
+    with uow:
+        issue = uow.get_by_id(1)
+        assert (issue.issue_state, issue.version) == (IssueState.CLOSED, 1)
+
+
+def test_insert_keeps_an_explicit_version(session: Session):
+    uow = SQLModelIssueRepository(session)
+    with uow:
+        uow.add(Issue(issue_number=1, issue_state=IssueState.OPEN))
+        # e.g. an issue restored from its events
+        uow.add(Issue(issue_number=2, issue_state=IssueState.OPEN, version=5))
+
+    with uow:
+        assert uow.get_by_id(1).version == 0
+        issue = uow.get_by_id(2)
+        assert issue.version == 5
+        issue.issue_state = IssueState.CLOSED
+
+    with uow:
+        assert uow.get_by_id(2).version == 6
+
+
+def test_retry_on_conflict_reruns_operation():
+    calls = []
+
+    async def operation() -> str:
+        calls.append(len(calls))
+        if len(calls) < 3:
+            raise ConflictException()
+        return "done"
+
+    assert asyncio.run(retry_on_conflict(operation, max_attempts=3, backoff_seconds=0)) == "done"
+    assert len(calls) == 3
+
+
+def test_retry_on_conflict_gives_up():
+    async def operation() -> None:
+        raise ConflictException()
+
+    with pytest.raises(ConflictException):
+        asyncio.run(retry_on_conflict(operation, max_attempts=2, backoff_seconds=0))